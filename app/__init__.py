@@ -18,8 +18,30 @@ def create_app(config_class=Config):
     # Enable CORS for React frontend
     CORS(app)
     
+    # Services are created lazily on first use; schema setup is `flask init-db`
+    from app import extensions
+    extensions.init_app(app)
+    
+    # orjson-backed JSON when installed (JSON_PROVIDER); metrics wraps it
+    from app import serialization
+    serialization.init_app(app)
+    
+    # Request/query latency histograms and /metrics (METRICS_ENABLED)
+    from app import metrics
+    metrics.init_app(app)
+    
+    # Keep stack samples of slow requests (PROFILE_ENABLED)
+    from app import profiling
+    profiling.init_app(app)
+    
+    from app.cli import register_commands
+    register_commands(app)
+    
     # Register API blueprint
     from app.views.api_routes import api_bp
     app.register_blueprint(api_bp)
     
+    from app.views.admin_routes import admin_bp
+    app.register_blueprint(admin_bp)
+    
     return app
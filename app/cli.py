@@ -0,0 +1,92 @@
+"""
+Management Commands
+
+Flask CLI commands for one-time and maintenance tasks, run as
+``flask --app run <command>``. Keeping schema work here means app start-up
+never has to reach a database.
+"""
+
+import click
+from flask import Flask
+
+from app.database.food_snapshot import build_snapshot
+from app.extensions import get_registry
+
+
+def register_commands(app: Flask):
+    """Attach management commands to the app's CLI"""
+
+    @app.cli.command('init-db')
+    @click.option('--skip-postgres', is_flag=True, help="Only set up the SQLite food catalog")
+    @click.option('--skip-catalog', is_flag=True, help="Only set up the PostgreSQL schema")
+    def init_db(skip_postgres, skip_catalog):
+        """Create database schemas, apply migrations and seed the food catalog"""
+        registry = get_registry(app)
+        if not skip_postgres:
+            registry.get('db_manager').init_database()
+            click.echo("PostgreSQL schema is up to date")
+        if not skip_catalog:
+            registry.get('food_db').initialize()
+            click.echo("Food catalog is ready")
+    
+    @app.cli.group('rollup')
+    def rollup():
+        """Maintain the daily_totals rollup of food_entries"""
+    
+    day_option = click.DateTime(formats=['%Y-%m-%d'])
+    
+    @rollup.command('rebuild')
+    @click.option('--start', type=day_option, help="First day to rebuild (default: all)")
+    @click.option('--end', type=day_option, help="Last day to rebuild (default: all)")
+    def rollup_rebuild(start, end):
+        """Recompute daily_totals from food_entries"""
+        written = get_registry(app).get('db_manager').rebuild_daily_totals(
+            start and start.date(), end and end.date())
+        click.echo(f"Rebuilt daily_totals: {written} rows")
+    
+    @rollup.command('check')
+    @click.option('--start', type=day_option, help="First day to check (default: all)")
+    @click.option('--end', type=day_option, help="Last day to check (default: all)")
+    def rollup_check(start, end):
+        """Compare daily_totals with food_entries; exits 1 on any mismatch"""
+        mismatches = get_registry(app).get('db_manager').check_daily_totals(
+            start and start.date(), end and end.date())
+        for mismatch in mismatches:
+            click.echo(f"{mismatch['user_id']} {mismatch['day']} {mismatch['meal_type']}: "
+                       f"rollup={mismatch['rollup']} actual={mismatch['actual']}")
+        if mismatches:
+            raise click.exceptions.Exit(1)
+        click.echo("daily_totals is consistent")
+    
+    @app.cli.group('partitions')
+    def partitions():
+        """Maintain the monthly partitions of food_entries"""
+    
+    @partitions.command('ensure')
+    @click.option('--ahead', type=int, help="Months to create past the current one "
+                                            "(default: PARTITION_MONTHS_AHEAD)")
+    def partitions_ensure(ahead):
+        """Create missing monthly partitions and drain matching rows out of DEFAULT (run monthly)"""
+        created = get_registry(app).get('db_manager').ensure_partitions(ahead)
+        for name in created:
+            click.echo(f"Created {name}")
+        click.echo(f"{len(created)} partitions created")
+    
+    @partitions.command('list')
+    def partitions_list():
+        """Show food_entries partitions with estimated row counts"""
+        for name, bounds, rows in get_registry(app).get('db_manager').list_partitions():
+            click.echo(f"{name}\t{bounds}\t~{rows} rows")
+    
+    @app.cli.group('catalog')
+    def catalog():
+        """Maintain the SQLite food catalog and its snapshot"""
+    
+    @catalog.command('snapshot')
+    @click.option('--output', help="Snapshot file to publish (default: the food_db snapshot path)")
+    def catalog_snapshot(output):
+        """Compile food_database into the mmap'd snapshot and publish it atomically"""
+        food_db = get_registry(app).get('food_db')
+        path = output or food_db.snapshot_path
+        version = build_snapshot(food_db, path)
+        click.echo(f"Published catalog version {version} to {path}")
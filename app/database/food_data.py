@@ -1,14 +1,65 @@
+import math
 import sqlite3
-from typing import List, Dict, Optional
+import string
+import threading
+import time
+from contextlib import closing, contextmanager
+from typing import List, Dict, Optional, Iterator, Tuple
+from config.settings import Config
+from ..metrics import QUERY_LATENCY, timed
+from ..services.cache import Cache, MISSING
+from .food_search import SEARCH_ENGINES
+from .food_snapshot import snapshot_path_for
+
+FOOD_COLUMNS = "id, name, calories_per_100g, category"
+# COLLATE NOCASE folds ASCII letters only; food cache keys must fold the same way
+NOCASE = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+
+
+def food_row(row) -> Dict:
+    return {"id": row[0], "name": row[1], "calories_per_100g": row[2], "category": row[3]}
+
 
 class FoodDatabase:
-    def __init__(self, db_path: str = "calorie_tracker.db"):
-        self.db_path = db_path
+    def __init__(self, db_path: str = None, search_engine: str = None,
+                 index_refresh_interval: float = None, food_cache: Optional[Cache] = None,
+                 snapshot_path: str = None):
+        """``food_cache`` memoizes lookup_food; it is cleared when the catalog version moves on
+        
+        ``snapshot_path`` is where the 'snapshot' engine publishes and maps
+        the catalog (default: next to ``db_path``).
+        """
+        self.db_path = db_path or Config.FOOD_DB_PATH
+        self.snapshot_path = snapshot_path or Config.FOOD_SNAPSHOT_PATH or snapshot_path_for(self.db_path)
+        engine_name = search_engine or Config.FOOD_SEARCH_ENGINE
+        if engine_name not in SEARCH_ENGINES:
+            raise ValueError(f"Unknown food search engine: {engine_name}")
+        self.search_engine_name = engine_name
+        self.refresh_interval = (
+            Config.FOOD_INDEX_REFRESH_INTERVAL if index_refresh_interval is None
+            else index_refresh_interval
+        )
+        self.search_engine = SEARCH_ENGINES[engine_name](self, refresh_interval=self.refresh_interval)
+        self.food_cache = food_cache
+        self._cache_version: Optional[int] = None
+        self._cache_checked_at = -math.inf
+        self._cache_lock = threading.Lock()
+    
+    def initialize(self):
+        """Create the catalog schema and seed it when empty (run once via ``flask init-db``)"""
         self.init_food_database()
         self.populate_food_data()
+        self.search_engine.publish()
+    
+    @contextmanager
+    def connect(self) -> Iterator[sqlite3.Connection]:
+        """Open a connection that commits on success and is always closed"""
+        with closing(sqlite3.connect(self.db_path)) as conn:
+            with conn:
+                yield conn
     
     def init_food_database(self):
-        with sqlite3.connect(self.db_path) as conn:
+        with self.connect() as conn:
             conn.execute("""
                 CREATE TABLE IF NOT EXISTS food_database (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -17,8 +68,45 @@ class FoodDatabase:
                     category TEXT NOT NULL
                 )
             """)
+            # Single-row counter bumped by triggers on every catalog change;
+            # search engines and caches compare it to detect staleness.
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS food_catalog_version (
+                    id INTEGER PRIMARY KEY CHECK (id = 1),
+                    version INTEGER NOT NULL
+                )
+            """)
+            conn.execute("INSERT OR IGNORE INTO food_catalog_version (id, version) VALUES (1, 0)")
+            for event in ("INSERT", "UPDATE", "DELETE"):
+                conn.execute(f"""
+                    CREATE TRIGGER IF NOT EXISTS food_database_version_{event.lower()}
+                    AFTER {event} ON food_database
+                    BEGIN
+                        UPDATE food_catalog_version SET version = version + 1 WHERE id = 1;
+                    END
+                """)
+            # Case-insensitive lookups (get_food_by_name) seek this instead of scanning
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_food_database_name_nocase
+                ON food_database (name COLLATE NOCASE)
+            """)
+            self.search_engine.init_schema(conn)
             conn.commit()
     
+    def get_catalog_version(self) -> int:
+        """Return the catalog change counter maintained by triggers"""
+        with self.connect() as conn:
+            return conn.execute("SELECT version FROM food_catalog_version WHERE id = 1").fetchone()[0]
+    
+    def search_version(self) -> int:
+        """Catalog version search results are currently served from (cheap for the index engine)"""
+        return self.search_engine.version()
+    
+    def iter_foods(self) -> Iterator[Tuple[int, str, float, str]]:
+        """Yield every ``(id, name, calories_per_100g, category)`` row in the catalog"""
+        with self.connect() as conn:
+            yield from conn.execute(f"SELECT {FOOD_COLUMNS} FROM food_database")
+    
     def populate_food_data(self):
         foods = [
             # Fruits
@@ -115,7 +203,7 @@ class FoodDatabase:
             ("Popcorn", 387, "Snacks"),
         ]
         
-        with sqlite3.connect(self.db_path) as conn:
+        with self.connect() as conn:
             # Check if data already exists
             cursor = conn.execute("SELECT COUNT(*) FROM food_database")
             if cursor.fetchone()[0] == 0:
@@ -125,30 +213,68 @@ class FoodDatabase:
                 )
                 conn.commit()
     
-    def search_food(self, query: str) -> List[Dict]:
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.execute("""
-                SELECT name, calories_per_100g, category 
-                FROM food_database 
-                WHERE name LIKE ? 
-                ORDER BY name
-                LIMIT 10
-            """, (f"%{query}%",))
-            
-            return [
-                {"name": row[0], "calories_per_100g": row[1], "category": row[2]}
-                for row in cursor.fetchall()
-            ]
+    @timed(QUERY_LATENCY, 'sqlite', 'search_food')
+    def search_food(self, query: str, limit: int = 10, category: str = None) -> List[Dict]:
+        """Ranked search using the configured engine"""
+        return self.search_engine.search(query, limit, category)
     
+    @timed(QUERY_LATENCY, 'sqlite', 'get_food_by_name')
     def get_food_by_name(self, name: str) -> Optional[Dict]:
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.execute("""
-                SELECT name, calories_per_100g, category 
+        """Case-insensitive (ASCII) exact match through idx_food_database_name_nocase"""
+        with self.connect() as conn:
+            cursor = conn.execute(f"""
+                SELECT {FOOD_COLUMNS}
                 FROM food_database 
-                WHERE LOWER(name) = LOWER(?)
+                WHERE name = ? COLLATE NOCASE
+                ORDER BY id
+                LIMIT 1
             """, (name,))
             
             row = cursor.fetchone()
-            if row:
-                return {"name": row[0], "calories_per_100g": row[1], "category": row[2]}
-            return None
+            return food_row(row) if row else None
+    
+    @timed(QUERY_LATENCY, 'sqlite', 'get_food_by_id')
+    def get_food_by_id(self, food_id: int) -> Optional[Dict]:
+        with self.connect() as conn:
+            row = conn.execute(f"SELECT {FOOD_COLUMNS} FROM food_database WHERE id = ?",
+                               (food_id,)).fetchone()
+            return food_row(row) if row else None
+    
+    def lookup_food(self, food_id: int = None, name: str = None) -> Optional[Dict]:
+        """Resolve a catalog food by id or name through the per-worker food cache
+        
+        Unknown foods are cached too. Results can trail a catalog change by up
+        to the index refresh interval, like the search index. The snapshot
+        engine answers from its mapped file and skips the cache.
+        """
+        food = self.search_engine.lookup(food_id, name)
+        if food is not MISSING:
+            return food
+        if self.food_cache is None:
+            return self.get_food_by_id(food_id) if food_id is not None else self.get_food_by_name(name)
+        self._check_cache_version()
+        key = f"id:{food_id}" if food_id is not None else f"name:{name.translate(NOCASE)}"
+        food = self.food_cache.get(key)
+        if food is MISSING:
+            food = self.get_food_by_id(food_id) if food_id is not None else self.get_food_by_name(name)
+            self.food_cache.set(key, food)
+        return food
+    
+    def _check_cache_version(self):
+        if time.monotonic() - self._cache_checked_at < self.refresh_interval:
+            return
+        with self._cache_lock:
+            if time.monotonic() - self._cache_checked_at < self.refresh_interval:
+                return
+            version = self.get_catalog_version()
+            if version != self._cache_version:
+                self.food_cache.clear()
+                self._cache_version = version
+            self._cache_checked_at = time.monotonic()
+    
+    def invalidate(self):
+        """Drop cached catalog state (search index, snapshot mapping, food cache) after a change"""
+        self.search_engine.invalidate()
+        if self.food_cache is not None:
+            with self._cache_lock:
+                self._cache_checked_at = -math.inf
@@ -0,0 +1,247 @@
+"""
+Bulk Food Catalog Importer
+
+Streams CSV or JSON Lines nutrient tables into ``food_database`` in
+bounded-memory chunks. Each chunk is upserted on the UNIQUE ``name`` in one
+transaction together with a progress checkpoint, so an interrupted import
+resumes where the last committed chunk ended.
+
+Usage:
+    python -m app.database.food_import foods.csv --db calorie_tracker.db
+    python -m app.database.food_import usda.jsonl --columns name=description,calories_per_100g=energy_kcal,category=food_group
+"""
+
+import argparse
+import csv
+import itertools
+import json
+import logging
+import math
+import os
+import sys
+import time
+from dataclasses import dataclass, asdict
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from config.settings import Config
+from .food_data import FoodDatabase
+
+logger = logging.getLogger(__name__)
+
+FIELDS = ("name", "calories_per_100g", "category")
+
+# Favour throughput over per-commit durability; WAL keeps readers unblocked
+IMPORT_PRAGMAS = (
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA cache_size = -65536",  # 64 MiB
+    "PRAGMA temp_store = MEMORY",
+)
+
+UPSERT_SQL = """
+    INSERT INTO food_database (name, calories_per_100g, category)
+    VALUES (?, ?, ?)
+    ON CONFLICT(name) DO UPDATE SET
+        calories_per_100g = excluded.calories_per_100g,
+        category = excluded.category
+    WHERE calories_per_100g != excluded.calories_per_100g
+       OR category != excluded.category
+"""
+
+
+@dataclass
+class ImportReport:
+    """Outcome of one import run"""
+    source: str
+    rows_read: int = 0
+    rows_imported: int = 0
+    rows_skipped: int = 0
+    resumed_from: int = 0
+    seconds: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return round(self.rows_read / self.seconds, 1) if self.seconds else 0.0
+
+    def to_dict(self) -> Dict:
+        return {**asdict(self), 'rows_per_second': self.rows_per_second}
+
+
+def read_records(stream, fmt: str) -> Iterator[Dict]:
+    """Yield raw records one at a time from a CSV or JSON Lines stream"""
+    if fmt == 'csv':
+        yield from csv.DictReader(stream)
+    elif fmt == 'jsonl':
+        for line in stream:
+            if line.strip():
+                yield json.loads(line)
+    else:
+        raise ValueError(f"Unsupported import format: {fmt}")
+
+
+def normalize(record: Dict, columns: Dict[str, str]) -> Tuple[str, float, str]:
+    """Map a raw record onto a validated ``(name, calories_per_100g, category)`` row"""
+    name = str(record[columns['name']]).strip()
+    calories = float(record[columns['calories_per_100g']])
+    category = str(record.get(columns['category']) or 'Uncategorized').strip()
+    if not name:
+        raise ValueError("Food name is required")
+    if not math.isfinite(calories):
+        raise ValueError("Calories per 100g must be a finite number")
+    if calories < 0:
+        raise ValueError("Calories per 100g cannot be negative")
+    return name, calories, category
+
+
+def chunked(iterable: Iterable, size: int) -> Iterator[List]:
+    """Yield lists of at most ``size`` items without materializing the input"""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def detect_format(path: str) -> str:
+    extension = os.path.splitext(path)[1].lower()
+    return 'jsonl' if extension in ('.jsonl', '.ndjson', '.json') else 'csv'
+
+
+def source_fingerprint(path: str) -> str:
+    """Identify a file version so checkpoints are never applied to a changed file"""
+    stat = os.stat(path)
+    return f"{stat.st_size}:{stat.st_mtime_ns}"
+
+
+class FoodImporter:
+    """Upserts streamed catalog rows into a FoodDatabase's SQLite file"""
+
+    def __init__(self, food_db: FoodDatabase, chunk_size: int = None,
+                 columns: Dict[str, str] = None):
+        self.food_db = food_db
+        self.chunk_size = chunk_size or Config.FOOD_IMPORT_CHUNK_SIZE
+        self.columns = {field: field for field in FIELDS}
+        self.columns.update(columns or {})
+        self._init_progress_table()
+
+    def _init_progress_table(self):
+        self.food_db.init_food_database()
+        with self.food_db.connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS food_import_progress (
+                    source TEXT PRIMARY KEY,
+                    fingerprint TEXT NOT NULL,
+                    rows_done INTEGER NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+            """)
+
+    def _checkpoint(self, source: str, fingerprint: str) -> int:
+        """Rows already committed for this exact file, or 0"""
+        with self.food_db.connect() as conn:
+            row = conn.execute(
+                "SELECT fingerprint, rows_done FROM food_import_progress WHERE source = ?",
+                (source,)
+            ).fetchone()
+        if row and row[0] == fingerprint:
+            return row[1]
+        return 0
+
+    def import_file(self, path: str, fmt: str = None, resume: bool = True,
+                    progress=None) -> ImportReport:
+        """Import a CSV/JSONL file, resuming from its last committed chunk"""
+        source = os.path.abspath(path)
+        fingerprint = source_fingerprint(path)
+        start_row = self._checkpoint(source, fingerprint) if resume else 0
+        with open(path, newline='', encoding='utf-8') as stream:
+            report = self.import_stream(
+                stream, fmt or detect_format(path), source=source,
+                fingerprint=fingerprint, start_row=start_row, progress=progress
+            )
+        with self.food_db.connect() as conn:
+            conn.execute("DELETE FROM food_import_progress WHERE source = ?", (source,))
+        return report
+
+    def import_stream(self, stream, fmt: str, source: str = '<stream>',
+                      fingerprint: str = '', start_row: int = 0,
+                      progress=None) -> ImportReport:
+        """Import records from an open stream, skipping the first ``start_row``"""
+        report = ImportReport(source=source, resumed_from=start_row)
+        records = itertools.islice(read_records(stream, fmt), start_row, None)
+        rows_done = start_row
+        started = time.perf_counter()
+
+        with self.food_db.connect() as conn:
+            for pragma in IMPORT_PRAGMAS:
+                conn.execute(pragma)
+            for chunk in chunked(records, self.chunk_size):
+                rows = []
+                for row_number, record in enumerate(chunk, start=rows_done + 1):
+                    try:
+                        rows.append(normalize(record, self.columns))
+                    except (KeyError, TypeError, ValueError) as e:
+                        report.rows_skipped += 1
+                        logger.debug("Skipping row %d: %s", row_number, e)
+                rows_done += len(chunk)
+
+                # Rows and checkpoint commit together, so a crash never double-counts
+                with conn:
+                    conn.executemany(UPSERT_SQL, rows)
+                    conn.execute("""
+                        INSERT INTO food_import_progress (source, fingerprint, rows_done, updated_at)
+                        VALUES (?, ?, ?, ?)
+                        ON CONFLICT(source) DO UPDATE SET
+                            fingerprint = excluded.fingerprint,
+                            rows_done = excluded.rows_done,
+                            updated_at = excluded.updated_at
+                    """, (source, fingerprint, rows_done, time.time()))
+
+                report.rows_read += len(chunk)
+                report.rows_imported += len(rows)
+                report.seconds = time.perf_counter() - started
+                if progress:
+                    progress(report)
+
+        report.seconds = time.perf_counter() - started
+        self.food_db.search_engine.publish()
+        self.food_db.invalidate()
+        return report
+
+
+def parse_columns(spec: Optional[str]) -> Dict[str, str]:
+    """Parse ``field=column,...`` overrides for non-standard headers"""
+    columns = {}
+    for pair in filter(None, (spec or '').split(',')):
+        field, _, column = pair.partition('=')
+        if field not in FIELDS or not column:
+            raise ValueError(f"Invalid column mapping: {pair}")
+        columns[field] = column
+    return columns
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Stream a CSV/JSONL nutrient table into the food catalog")
+    parser.add_argument('path')
+    parser.add_argument('--format', choices=('csv', 'jsonl'))
+    parser.add_argument('--db', default=Config.FOOD_DB_PATH)
+    parser.add_argument('--chunk-size', type=int, default=Config.FOOD_IMPORT_CHUNK_SIZE)
+    parser.add_argument('--columns', help="field=column overrides, e.g. name=description")
+    parser.add_argument('--no-resume', action='store_true', help="ignore any saved checkpoint")
+    args = parser.parse_args(argv)
+
+    def print_progress(report: ImportReport):
+        print(f"\r{report.rows_read + report.resumed_from} rows "
+              f"({report.rows_per_second:.0f} rows/s, {report.rows_skipped} skipped)",
+              end='', file=sys.stderr, flush=True)
+
+    importer = FoodImporter(FoodDatabase(args.db), args.chunk_size, parse_columns(args.columns))
+    report = importer.import_file(args.path, args.format, resume=not args.no_resume,
+                                  progress=print_progress)
+    print(file=sys.stderr)
+    print(json.dumps(report.to_dict()))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
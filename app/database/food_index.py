@@ -0,0 +1,155 @@
+"""
+In-Memory Food Catalog Index
+
+Immutable, per-worker index over the ``food_database`` table. Names are kept
+in a sorted array for prefix lookups with ``bisect`` and a trigram posting
+index answers substring queries without scanning the whole catalog.
+"""
+
+import bisect
+from array import array
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Characters after which a position counts as the start of a word
+WORD_BOUNDARIES = " (-,/"
+
+# Ranks, best first
+EXACT, PREFIX, WORD_PREFIX, SUBSTRING = range(4)
+
+
+def trigrams(text: str):
+    """Return the distinct 3-character substrings of ``text``"""
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class FoodCatalogIndex:
+    """Sorted name array plus trigram postings; never mutated after construction"""
+
+    def __init__(self, foods: Iterable[Tuple[int, str, float, str]], version: int = 0):
+        """Build the index from ``(id, name, calories_per_100g, category)`` rows"""
+        self.version = version
+        # Ties go to the lowest id, like the NOCASE lookup
+        rows = sorted(foods, key=lambda row: (row[1].lower(), row[0]))
+        self._keys: List[str] = [row[1].lower() for row in rows]
+        # Columnar storage; result dicts are only built for returned rows
+        categories: Dict[str, str] = {}
+        self._ids = array('I', (row[0] for row in rows))
+        self._names: List[str] = [row[1] for row in rows]
+        self._calories = array('d', (row[2] for row in rows))
+        self._categories: List[str] = [categories.setdefault(row[3], row[3]) for row in rows]
+        # Joined names let one- and two-character queries scan in C via str.find
+        self._blob = "\n".join(self._keys)
+        self._offsets = array('I')
+        offset = 0
+        for key in self._keys:
+            self._offsets.append(offset)
+            offset += len(key) + 1
+
+        # Packed uint32 postings keep memory near 4 bytes per trigram occurrence
+        self._postings: Dict[str, array] = {}
+        postings = self._postings
+        for position, key in enumerate(self._keys):
+            for gram in trigrams(key):
+                posting = postings.get(gram)
+                if posting is None:
+                    posting = postings[gram] = array('I')
+                posting.append(position)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def get(self, name: str) -> Optional[Dict]:
+        """Case-insensitive exact lookup"""
+        key = name.lower()
+        position = bisect.bisect_left(self._keys, key)
+        if position < len(self._keys) and self._keys[position] == key:
+            return self._food(position)
+        return None
+
+    def search(self, query: str, limit: int = 10, category: str = None) -> List[Dict]:
+        """Return up to ``limit`` foods ranked exact > prefix > word prefix > substring"""
+        key = query.strip().lower()
+        if not key or limit <= 0:
+            return []
+
+        ranked: List[Tuple[int, int]] = []
+        seen = set()
+        for position in self._prefix_positions(key):
+            if category and self._categories[position] != category:
+                continue
+            rank = EXACT if self._keys[position] == key else PREFIX
+            ranked.append((rank, position))
+            seen.add(position)
+            if len(ranked) >= limit:
+                break
+
+        if len(ranked) < limit:
+            word_matches, substring_matches = [], []
+            for position in self._substring_positions(key):
+                if position in seen:
+                    continue
+                if category and self._categories[position] != category:
+                    continue
+                if self._is_word_prefix(self._keys[position], key):
+                    word_matches.append(position)
+                    if len(ranked) + len(word_matches) >= limit:
+                        break
+                elif len(substring_matches) < limit:
+                    substring_matches.append(position)
+            ranked.extend((WORD_PREFIX, position) for position in word_matches)
+            ranked.extend((SUBSTRING, position) for position in substring_matches)
+
+        ranked.sort()
+        return [self._food(position) for _, position in ranked[:limit]]
+
+    def _food(self, position: int) -> Dict:
+        return {
+            "id": self._ids[position],
+            "name": self._names[position],
+            "calories_per_100g": self._calories[position],
+            "category": self._categories[position],
+        }
+
+    def _prefix_positions(self, key: str):
+        """Positions whose name starts with ``key``, in name order"""
+        position = bisect.bisect_left(self._keys, key)
+        keys = self._keys
+        while position < len(keys) and keys[position].startswith(key):
+            yield position
+            position += 1
+
+    def _substring_positions(self, key: str):
+        """Positions whose name contains ``key``, in name order"""
+        if len(key) >= 3:
+            candidates = None
+            for gram in trigrams(key):
+                posting = self._postings.get(gram)
+                if posting is None:
+                    return
+                if candidates is None or len(posting) < len(candidates):
+                    candidates = posting
+            # Verify against the rarest trigram's postings only
+            for position in candidates:
+                if key in self._keys[position]:
+                    yield position
+            return
+
+        # One- and two-character queries: scan one joined string in C
+        blob, offsets = self._blob, self._offsets
+        start = blob.find(key)
+        last = -1
+        while start != -1:
+            position = bisect.bisect_right(offsets, start) - 1
+            if position != last:
+                yield position
+                last = position
+            start = blob.find(key, start + 1)
+
+    @staticmethod
+    def _is_word_prefix(name: str, key: str) -> bool:
+        start = name.find(key, 1)
+        while start != -1:
+            if name[start - 1] in WORD_BOUNDARIES:
+                return True
+            start = name.find(key, start + 1)
+        return False
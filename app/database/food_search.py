@@ -0,0 +1,293 @@
+"""
+Food Search Engines
+
+Strategies used by FoodDatabase.search_food. Each engine answers the same
+ranked, limited query; ``SEARCH_ENGINES`` maps the ``FOOD_SEARCH_ENGINE``
+config value to an implementation.
+"""
+
+import logging
+import math
+import os
+import re
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional
+
+from ..services.cache import MISSING
+from .food_index import FoodCatalogIndex
+from .food_snapshot import CatalogSnapshot, build_snapshot
+
+logger = logging.getLogger(__name__)
+
+
+class FoodSearchEngine(ABC):
+    def __init__(self, food_db, refresh_interval: float = 5.0):
+        """``refresh_interval`` bounds how often cached state re-checks the catalog version"""
+        self.food_db = food_db
+        self.refresh_interval = refresh_interval
+
+    @abstractmethod
+    def search(self, query: str, limit: int = 10, category: str = None) -> List[Dict]:
+        pass
+
+    def version(self) -> int:
+        """Catalog version of the data the engine currently answers from"""
+        return self.food_db.get_catalog_version()
+
+    def init_schema(self, conn: sqlite3.Connection):
+        """Create any tables the engine needs alongside ``food_database``"""
+
+    def invalidate(self):
+        """Drop any cached state after the catalog changed"""
+
+    def publish(self):
+        """Rebuild any artifact derived from the catalog after it was seeded or imported"""
+
+    def lookup(self, food_id: int = None, name: str = None) -> Optional[Dict]:
+        """Catalog row by id or name without SQLite, or MISSING when the engine can't"""
+        return MISSING
+
+
+class LikeSearchEngine(FoodSearchEngine):
+    """Unindexed ``LIKE '%q%'`` scan; needs no memory beyond SQLite's"""
+
+    def search(self, query: str, limit: int = 10, category: str = None) -> List[Dict]:
+        sql = """
+            SELECT id, name, calories_per_100g, category 
+            FROM food_database 
+            WHERE name LIKE ? 
+        """
+        params = [f"%{query}%"]
+        if category:
+            sql += " AND category = ?"
+            params.append(category)
+        sql += " ORDER BY name LIMIT ?"
+        params.append(limit)
+        with self.food_db.connect() as conn:
+            cursor = conn.execute(sql, params)
+            return [
+                {"id": row[0], "name": row[1], "calories_per_100g": row[2], "category": row[3]}
+                for row in cursor.fetchall()
+            ]
+
+
+class IndexedSearchEngine(FoodSearchEngine):
+    """Serves searches from a FoodCatalogIndex loaded once per worker"""
+
+    def __init__(self, food_db, refresh_interval: float = 5.0):
+        super().__init__(food_db, refresh_interval)
+        self._index: Optional[FoodCatalogIndex] = None
+        # Not 0.0: monotonic() can itself be below refresh_interval after boot
+        self._checked_at = -math.inf
+        self._lock = threading.Lock()
+
+    @property
+    def index(self) -> FoodCatalogIndex:
+        """Current index, rebuilt when the catalog version has moved on
+        
+        One thread checks and rebuilds while the others keep serving the
+        previous index; only the very first build makes callers wait.
+        """
+        index = self._index
+        if index is not None and time.monotonic() - self._checked_at < self.refresh_interval:
+            return index
+        if not self._lock.acquire(blocking=index is None):
+            return index
+        try:
+            if self._index is not None and time.monotonic() - self._checked_at < self.refresh_interval:
+                return self._index
+            version = self.food_db.get_catalog_version()
+            if self._index is None or self._index.version != version:
+                self._index = FoodCatalogIndex(self.food_db.iter_foods(), version)
+            self._checked_at = time.monotonic()
+            return self._index
+        finally:
+            self._lock.release()
+
+    def search(self, query: str, limit: int = 10, category: str = None) -> List[Dict]:
+        return self.index.search(query, limit, category)
+
+    def version(self) -> int:
+        # The loaded index may lag the table by up to refresh_interval
+        return self.index.version
+
+    def invalidate(self):
+        with self._lock:
+            self._checked_at = -math.inf
+
+
+def fts5_available() -> bool:
+    """Whether the linked SQLite library was compiled with FTS5"""
+    try:
+        with sqlite3.connect(":memory:") as conn:
+            conn.execute("CREATE VIRTUAL TABLE fts5_probe USING fts5(x)")
+        return True
+    except sqlite3.OperationalError:
+        return False
+
+
+class FTSSearchEngine(FoodSearchEngine):
+    """Indexed SQLite FTS5 lookup ranked by bm25 (FTS5's default ``rank``); the catalog stays on disk"""
+
+    def __init__(self, food_db, refresh_interval: float = 5.0):
+        super().__init__(food_db, refresh_interval)
+        self.available = fts5_available()
+        if not self.available:
+            logger.warning("SQLite FTS5 is unavailable; food search falls back to LIKE")
+        self._fallback = LikeSearchEngine(food_db, refresh_interval)
+
+    def init_schema(self, conn: sqlite3.Connection):
+        if not self.available:
+            return
+        exists = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'food_search'"
+        ).fetchone()
+        # External-content table: stores only the index, rows live in food_database
+        conn.execute("""
+            CREATE VIRTUAL TABLE IF NOT EXISTS food_search USING fts5(
+                name, category UNINDEXED,
+                content='food_database', content_rowid='id',
+                tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+            )
+        """)
+        conn.execute("""
+            CREATE TRIGGER IF NOT EXISTS food_search_insert AFTER INSERT ON food_database BEGIN
+                INSERT INTO food_search (rowid, name, category) VALUES (new.id, new.name, new.category);
+            END
+        """)
+        conn.execute("""
+            CREATE TRIGGER IF NOT EXISTS food_search_delete AFTER DELETE ON food_database BEGIN
+                INSERT INTO food_search (food_search, rowid, name, category)
+                VALUES ('delete', old.id, old.name, old.category);
+            END
+        """)
+        conn.execute("""
+            CREATE TRIGGER IF NOT EXISTS food_search_update AFTER UPDATE ON food_database BEGIN
+                INSERT INTO food_search (food_search, rowid, name, category)
+                VALUES ('delete', old.id, old.name, old.category);
+                INSERT INTO food_search (rowid, name, category) VALUES (new.id, new.name, new.category);
+            END
+        """)
+        if not exists:
+            # Index rows that predate the FTS table
+            conn.execute("INSERT INTO food_search (food_search) VALUES ('rebuild')")
+
+    @staticmethod
+    def match_expression(query: str) -> str:
+        """Turn free text into an FTS5 query of quoted prefix tokens (implicit AND)"""
+        return " ".join(f'"{token}"*' for token in re.findall(r"\w+", query.lower()))
+
+    def search(self, query: str, limit: int = 10, category: str = None) -> List[Dict]:
+        if not self.available:
+            return self._fallback.search(query, limit, category)
+        expression = self.match_expression(query)
+        if not expression:
+            return []
+        if category:
+            sql = """
+                SELECT f.id, f.name, f.calories_per_100g, f.category
+                FROM food_search
+                JOIN food_database AS f ON f.id = food_search.rowid
+                WHERE food_search MATCH ? AND f.category = ?
+                ORDER BY food_search.rank, f.name
+                LIMIT ?
+            """
+            params = (expression, category, limit)
+        else:
+            # Rank and limit inside FTS5 so only the top rows are joined
+            sql = """
+                SELECT f.id, f.name, f.calories_per_100g, f.category
+                FROM (
+                    SELECT rowid, rank FROM food_search
+                    WHERE food_search MATCH ?
+                    ORDER BY rank
+                    LIMIT ?
+                ) AS hits
+                JOIN food_database AS f ON f.id = hits.rowid
+                ORDER BY hits.rank, f.name
+            """
+            params = (expression, limit)
+        with self.food_db.connect() as conn:
+            cursor = conn.execute(sql, params)
+            return [
+                {"id": row[0], "name": row[1], "calories_per_100g": row[2], "category": row[3]}
+                for row in cursor.fetchall()
+            ]
+
+
+class SnapshotSearchEngine(FoodSearchEngine):
+    """Serves searches and lookups from a published CatalogSnapshot mapped by every worker
+    
+    The snapshot is only as fresh as its last ``build_snapshot``
+    (``flask catalog snapshot``, init-db or an import); edits made
+    directly in SQLite wait for the next publish. Every ``refresh_interval``
+    the file is stat'ed and a newly published one is mapped in place of
+    the old. Until a snapshot exists, searches fall back to LIKE.
+    """
+
+    def __init__(self, food_db, refresh_interval: float = 5.0):
+        super().__init__(food_db, refresh_interval)
+        self._snapshot: Optional[CatalogSnapshot] = None
+        self._identity = None
+        self._checked_at = -math.inf
+        self._lock = threading.Lock()
+        self._fallback = LikeSearchEngine(food_db, refresh_interval)
+
+    @property
+    def snapshot(self) -> Optional[CatalogSnapshot]:
+        """Current snapshot, remapped when a new file has been published"""
+        if time.monotonic() - self._checked_at < self.refresh_interval:
+            return self._snapshot
+        with self._lock:
+            if time.monotonic() - self._checked_at < self.refresh_interval:
+                return self._snapshot
+            try:
+                stat = os.stat(self.food_db.snapshot_path)
+            except FileNotFoundError:
+                if self._identity is not False:
+                    logger.warning("No catalog snapshot at %s; food search falls back to LIKE",
+                                   self.food_db.snapshot_path)
+                self._snapshot, self._identity = None, False
+            else:
+                identity = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+                if identity != self._identity:
+                    # Readers holding the old snapshot keep its mapping until they finish
+                    self._snapshot = CatalogSnapshot(self.food_db.snapshot_path)
+                    self._identity = identity
+            self._checked_at = time.monotonic()
+            return self._snapshot
+
+    def search(self, query: str, limit: int = 10, category: str = None) -> List[Dict]:
+        snapshot = self.snapshot
+        if snapshot is None:
+            return self._fallback.search(query, limit, category)
+        return snapshot.search(query, limit, category)
+
+    def lookup(self, food_id: int = None, name: str = None) -> Optional[Dict]:
+        snapshot = self.snapshot
+        if snapshot is None:
+            return MISSING
+        return snapshot.get_by_id(food_id) if food_id is not None else snapshot.get_by_name(name)
+
+    def version(self) -> int:
+        snapshot = self.snapshot
+        return snapshot.version if snapshot is not None else super().version()
+
+    def publish(self):
+        build_snapshot(self.food_db, self.food_db.snapshot_path)
+        self.invalidate()
+
+    def invalidate(self):
+        with self._lock:
+            self._checked_at = -math.inf
+
+
+SEARCH_ENGINES = {
+    'like': LikeSearchEngine,
+    'index': IndexedSearchEngine,
+    'fts': FTSSearchEngine,
+    'snapshot': SnapshotSearchEngine,
+}
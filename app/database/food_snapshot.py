@@ -0,0 +1,220 @@
+"""
+Memory-Mapped Food Catalog Snapshot
+
+Compiles ``food_database`` into one read-only binary file that workers
+``mmap``. Mapped pages live in the OS page cache and are shared by every
+gunicorn worker on the host, so the catalog costs its file size once
+instead of one in-memory index per worker, and search and lookup never
+touch SQLite.
+
+``build_snapshot`` writes a new file beside the published one and renames
+it over it. A process that still maps the old file keeps reading it until it
+reopens, so publishing never tears a read. Layout, in native byte order with
+8-byte aligned sections whose offsets are listed in the header:
+
+    key_offsets       uint32[count + 1]  lower-cased names, each ending in '\\n'
+    name_offsets      uint32[count + 1]  display names
+    ids               uint32[count]      food id at each position
+    id_order          uint32[count]      positions sorted by food id
+    calories          float32[count]     calories_per_100g
+    category_ids      uint16[count]
+    category_offsets  uint32[categories + 1]
+    keys, names, categories              UTF-8 text
+
+Positions follow the lower-cased name, ties by id, like the NOCASE lookup.
+"""
+
+import bisect
+import mmap
+import os
+import sqlite3
+import struct
+import tempfile
+from array import array
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .food_index import FoodCatalogIndex
+
+MAGIC = b'FOODSNAP'
+FORMAT_VERSION = 1
+SECTIONS = ('key_offsets', 'name_offsets', 'ids', 'id_order', 'calories', 'category_ids',
+            'category_offsets', 'keys', 'names', 'categories')
+# magic, format, catalog version, food count, category count, section offsets
+HEADER = struct.Struct(f'<8sIQII{len(SECTIONS)}Q')
+ALIGNMENT = 8
+
+
+def snapshot_path_for(db_path: str) -> str:
+    """Default snapshot location next to the SQLite catalog"""
+    return os.path.splitext(db_path)[0] + '.snapshot'
+
+
+def _packed_strings(strings: Iterable[str], terminator: bytes = b'') -> Tuple[array, bytes]:
+    offsets = array('I', [0])
+    blob = bytearray()
+    for text in strings:
+        blob += text.encode() + terminator
+        offsets.append(len(blob))
+    return offsets, bytes(blob)
+
+
+def read_catalog(conn: sqlite3.Connection) -> Tuple[int, List[Tuple[int, str, float, str]]]:
+    """Catalog version and ``(id, name, calories_per_100g, category)`` rows from one read transaction"""
+    conn.execute("BEGIN")
+    version = conn.execute("SELECT version FROM food_catalog_version WHERE id = 1").fetchone()[0]
+    rows = conn.execute("SELECT id, name, calories_per_100g, category FROM food_database").fetchall()
+    return version, rows
+
+
+def build_snapshot(food_db, path: str) -> int:
+    """Write a snapshot of ``food_db`` and atomically publish it at ``path``; returns its version"""
+    with food_db.connect() as conn:
+        version, rows = read_catalog(conn)
+    rows.sort(key=lambda row: (row[1].lower(), row[0]))
+
+    category_names = sorted({row[3] for row in rows})
+    if len(category_names) > 0xFFFF:
+        raise ValueError(f"Too many categories for a snapshot: {len(category_names)}")
+    category_ids = {name: i for i, name in enumerate(category_names)}
+
+    key_offsets, keys = _packed_strings((row[1].lower() for row in rows), b'\n')
+    name_offsets, names = _packed_strings(row[1] for row in rows)
+    category_offsets, categories = _packed_strings(category_names)
+    ids = array('I', (row[0] for row in rows))
+    sections = {
+        'key_offsets': key_offsets.tobytes(),
+        'name_offsets': name_offsets.tobytes(),
+        'ids': ids.tobytes(),
+        'id_order': array('I', sorted(range(len(rows)), key=ids.__getitem__)).tobytes(),
+        'calories': array('f', (row[2] for row in rows)).tobytes(),
+        'category_ids': array('H', (category_ids[row[3]] for row in rows)).tobytes(),
+        'category_offsets': category_offsets.tobytes(),
+        'keys': keys,
+        'names': names,
+        'categories': categories,
+    }
+
+    offsets = []
+    body = bytearray()
+    start = -(-HEADER.size // ALIGNMENT) * ALIGNMENT
+    for name in SECTIONS:
+        body += b'\0' * (-(start + len(body)) % ALIGNMENT)
+        offsets.append(start + len(body))
+        body += sections[name]
+    header = HEADER.pack(MAGIC, FORMAT_VERSION, version, len(rows), len(category_names), *offsets)
+
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix='.' + os.path.basename(path), suffix='.tmp', dir=directory)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(header.ljust(start, b'\0'))
+            f.write(body)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp_path, 0o644)
+        # rename(2) swaps the directory entry in one step; mapped readers keep the old inode
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return version
+
+
+class _Strings:
+    """Read-only sequence of strings packed in a mapped blob, decoded on access"""
+
+    def __init__(self, blob: memoryview, offsets: memoryview, terminator: int = 0):
+        self._blob = blob
+        self._offsets = offsets
+        self._terminator = terminator
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, position: int) -> str:
+        return str(self._blob[self._offsets[position]:self._offsets[position + 1] - self._terminator], 'utf-8')
+
+
+class _Categories:
+    """Category name per position, from uint16 ids and a small decoded table"""
+
+    def __init__(self, ids: memoryview, names: Tuple[str, ...]):
+        self._ids = ids
+        self._names = names
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __getitem__(self, position: int) -> str:
+        return self._names[self._ids[position]]
+
+
+class CatalogSnapshot(FoodCatalogIndex):
+    """FoodCatalogIndex whose columns are views into a mapped snapshot file
+
+    Ranking (``search``/``get``) is inherited. Substring matches scan the
+    mapped keys with ``mmap.find`` instead of trigram postings, which would
+    have to be rebuilt in every worker.
+    """
+
+    def __init__(self, path: str):
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, format_version, self.version, count, category_count, *offsets = HEADER.unpack_from(self._mmap)
+        if magic != MAGIC or format_version != FORMAT_VERSION:
+            raise ValueError(f"{path} is not a format {FORMAT_VERSION} food catalog snapshot")
+        view = memoryview(self._mmap)
+        bounds = dict(zip(SECTIONS, zip(offsets, offsets[1:] + [len(self._mmap)])))
+
+        def section(name: str, typecode: str = None, length: int = None) -> memoryview:
+            start, end = bounds[name]
+            if typecode is None:
+                return view[start:end]
+            size = struct.calcsize(typecode)
+            return view[start:start + length * size].cast(typecode)
+
+        self._key_offsets = section('key_offsets', 'I', count + 1)
+        self._keys_start = bounds['keys'][0]
+        self._keys_end = self._keys_start + self._key_offsets[count]
+        self._keys = _Strings(section('keys'), self._key_offsets, terminator=1)
+        self._names = _Strings(section('names'), section('name_offsets', 'I', count + 1))
+        self._ids = section('ids', 'I', count)
+        self._id_order = section('id_order', 'I', count)
+        self._calories = section('calories', 'f', count)
+        category_names = _Strings(section('categories'), section('category_offsets', 'I', category_count + 1))
+        self._categories = _Categories(section('category_ids', 'H', count),
+                                       tuple(category_names[i] for i in range(category_count)))
+
+    def get_by_name(self, name: str) -> Optional[Dict]:
+        """Case-insensitive exact match; the lowest id wins a tie"""
+        key = name.lower()
+        position = bisect.bisect_left(self._keys, key)
+        if position < len(self._keys) and self._keys[position] == key:
+            return self._food(position)
+        return None
+
+    def get_by_id(self, food_id: int) -> Optional[Dict]:
+        i = bisect.bisect_left(self._id_order, food_id, key=self._ids.__getitem__)
+        if i < len(self._id_order) and self._ids[self._id_order[i]] == food_id:
+            return self._food(self._id_order[i])
+        return None
+
+    def _food(self, position: int) -> Dict:
+        return {
+            "id": self._ids[position],
+            "name": self._names[position],
+            # float32 keeps ~7 significant digits; drop the binary noise
+            "calories_per_100g": float(f"{self._calories[position]:.7g}"),
+            "category": self._categories[position],
+        }
+
+    def _substring_positions(self, key: str):
+        """Positions whose name contains ``key``, in name order"""
+        needle = key.encode()
+        offsets, start, end = self._key_offsets, self._keys_start, self._keys_end
+        found = self._mmap.find(needle, start, end)
+        while found != -1:
+            position = bisect.bisect_right(offsets, found - start) - 1
+            yield position
+            # Resume at the next name so each position is reported once
+            found = self._mmap.find(needle, start + offsets[position + 1], end)
@@ -0,0 +1,192 @@
+"""
+In-Memory Food Entry Store
+
+A process-local stand-in for DatabaseManager, selected with
+``DATABASE_URL=memory://``. It implements the same read and write methods
+so the API, tests and benchmarks run without PostgreSQL. Data lives only as
+long as the worker process; every gunicorn worker has its own copy.
+
+The URL can seed a deterministic synthetic log, identical in every worker:
+``memory://?entries=10000&days=30`` spreads 10,000 entries over the 30 days
+starting at SEED_START, all owned by DEFAULT_USER_ID. There are no
+partitions; the partition methods report none.
+"""
+
+import bisect
+import itertools
+import threading
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+from urllib.parse import parse_qs, urlsplit
+
+from ..models.food import DEFAULT_USER_ID, FoodEntry, FoodEntryRow, FoodItem, MealType
+
+MEMORY_SCHEME = 'memory'
+SEED_START = date(2024, 1, 1)
+
+
+def is_memory_url(db_url: str) -> bool:
+    return bool(db_url) and urlsplit(db_url).scheme == MEMORY_SCHEME
+
+
+def synthetic_entries(count: int, days: int = 1, start: date = SEED_START) -> Iterator[FoodEntry]:
+    """Deterministic entries spread evenly over ``days`` days from ``start``"""
+    meals = list(MealType)
+    per_day = max(1, -(-count // max(days, 1)))
+    first = datetime.combine(start, datetime.min.time()).replace(hour=6)
+    for i in range(count):
+        day, slot = divmod(i, per_day)
+        # Keep every entry of a day inside its 06:00-22:00 window
+        offset = timedelta(days=day, seconds=slot * 16 * 3600 // per_day)
+        yield FoodEntry(
+            meals[i % len(meals)],
+            FoodItem(f"Food {i % 100}", 50 + i % 300, 50 + i % 200),
+            first + offset
+        )
+
+
+class InMemoryDatabaseManager:
+    """DatabaseManager stand-in keeping food entries in process memory"""
+
+    # No connection pool; /api/stats reports None
+    pool = None
+
+    def __init__(self, db_url: str = 'memory://'):
+        self.db_url = db_url
+        # user_id -> day -> [(timestamp, id, entry)] kept sorted by timestamp
+        self._days: Dict[str, Dict[date, List[Tuple[datetime, int, FoodEntry]]]] = \
+            defaultdict(lambda: defaultdict(list))
+        # Mirrors the daily_totals rollup: (user_id, day) -> {meal_type: (calories, count)}
+        self._totals: Dict[Tuple[str, date], Dict[str, Tuple[float, int]]] = defaultdict(dict)
+        # Mirrors daily_versions: (user_id, day) -> last write stamp from one sequence
+        self._versions: Dict[Tuple[str, date], int] = {}
+        self._ids = itertools.count(1)
+        self._version_seq = itertools.count(1)
+        self._lock = threading.Lock()
+        self._seed(parse_qs(urlsplit(db_url).query))
+
+    def _seed(self, params: Dict[str, List[str]]):
+        count = int(params.get('entries', ['0'])[0])
+        if count:
+            days = int(params.get('days', ['1'])[0])
+            self.save_food_entries(list(synthetic_entries(count, days)))
+
+    def init_database(self):
+        """Nothing to create; present for DatabaseManager compatibility"""
+
+    def ensure_partitions(self, months_ahead: int = None, today: date = None) -> List[str]:
+        return []
+
+    def list_partitions(self) -> List[Tuple[str, str, int]]:
+        return []
+
+    @staticmethod
+    def _day(day: Union[str, date]) -> date:
+        return date.fromisoformat(day) if isinstance(day, str) else day
+
+    def _insert(self, entry: FoodEntry) -> int:
+        entry_id = next(self._ids)
+        day = entry.timestamp.date()
+        bisect.insort(self._days[entry.user_id][day], (entry.timestamp, entry_id, entry))
+        totals = self._totals[(entry.user_id, day)]
+        calories, count = totals.get(entry.meal_type.value, (0.0, 0))
+        totals[entry.meal_type.value] = (calories + entry.calculate_calories(), count + 1)
+        return entry_id
+
+    def _bump_versions(self, keys):
+        for key in sorted(set(keys)):
+            self._versions[key] = next(self._version_seq)
+
+    def save_food_entry(self, entry: FoodEntry) -> int:
+        with self._lock:
+            entry_id = self._insert(entry)
+            self._bump_versions([(entry.user_id, entry.timestamp.date())])
+            return entry_id
+
+    def save_food_entries(self, entries: List[FoodEntry], page_size: int = 1000) -> List[int]:
+        with self._lock:
+            entry_ids = [self._insert(entry) for entry in entries]
+            self._bump_versions((entry.user_id, entry.timestamp.date()) for entry in entries)
+            return entry_ids
+
+    def get_day_version(self, day: Union[str, date], user_id: str = DEFAULT_USER_ID) -> int:
+        with self._lock:
+            return self._versions.get((user_id, self._day(day)), 0)
+
+    def _rows(self, user_id: str, day: Union[str, date]) -> List[Tuple[datetime, int, FoodEntry]]:
+        with self._lock:
+            days = self._days.get(user_id)
+            return list(days.get(self._day(day), ())) if days else []
+
+    def get_daily_entries(self, date_str: str, user_id: str = DEFAULT_USER_ID) -> List[FoodEntryRow]:
+        """The user's entries for a day as read-model rows ordered by timestamp, like the SQL query"""
+        return [FoodEntryRow.from_entry(entry) for _, _, entry in self._rows(user_id, date_str)]
+
+    def get_daily_summary(self, date_str: Union[str, date],
+                          user_id: str = DEFAULT_USER_ID) -> Dict[str, Tuple[float, int]]:
+        with self._lock:
+            return dict(self._totals.get((user_id, self._day(date_str)), {}))
+
+    def get_range_summary(self, start_day: date, end_day: date,
+                          user_id: str = DEFAULT_USER_ID) -> List[Tuple[date, str, float, int]]:
+        with self._lock:
+            return [
+                (day, meal_type, calories, count)
+                for owner, day in sorted(key for key in self._totals
+                                         if key[0] == user_id and start_day <= key[1] <= end_day)
+                for meal_type, (calories, count) in self._totals[(owner, day)].items()
+            ]
+
+    def iter_food_entries(self, start_day: date = None, end_day: date = None, chunk_size: int = 2000,
+                          user_id: str = DEFAULT_USER_ID) -> Iterator[Tuple[str, float, float, str, datetime]]:
+        with self._lock:
+            days = sorted(day for day in self._days.get(user_id, ())
+                          if self._in_span(day, start_day, end_day))
+        for day in days:
+            for timestamp, _, entry in self._rows(user_id, day):
+                yield (entry.food_item.name, entry.food_item.calories_per_100g,
+                       entry.food_item.quantity_grams, entry.meal_type.value, timestamp)
+
+    @staticmethod
+    def _in_span(day: date, start_day: Optional[date], end_day: Optional[date]) -> bool:
+        return (start_day is None or day >= start_day) and (end_day is None or day <= end_day)
+
+    def _aggregate(self, start_day: Optional[date],
+                   end_day: Optional[date]) -> Dict[Tuple[str, date], Dict[str, Tuple[float, int]]]:
+        actual: Dict[Tuple[str, date], Dict[str, Tuple[float, int]]] = defaultdict(dict)
+        for user_id, days in self._days.items():
+            for day, rows in days.items():
+                if self._in_span(day, start_day, end_day):
+                    for _, _, entry in rows:
+                        meals = actual[(user_id, day)]
+                        calories, count = meals.get(entry.meal_type.value, (0.0, 0))
+                        meals[entry.meal_type.value] = (calories + entry.calculate_calories(), count + 1)
+        return actual
+
+    def rebuild_daily_totals(self, start_day: date = None, end_day: date = None) -> int:
+        with self._lock:
+            for key in [key for key in self._totals if self._in_span(key[1], start_day, end_day)]:
+                del self._totals[key]
+            actual = self._aggregate(start_day, end_day)
+            self._totals.update(actual)
+            self._bump_versions(key for key in set(self._versions) | set(self._totals)
+                                if self._in_span(key[1], start_day, end_day))
+            return sum(len(meals) for meals in actual.values())
+
+    def check_daily_totals(self, start_day: date = None, end_day: date = None) -> List[Dict]:
+        with self._lock:
+            actual = self._aggregate(start_day, end_day)
+            rollup = {key: meals for key, meals in self._totals.items()
+                      if self._in_span(key[1], start_day, end_day)}
+        mismatches = []
+        for key in sorted(set(actual) | set(rollup)):
+            for meal_type in sorted(set(actual.get(key, {})) | set(rollup.get(key, {}))):
+                stored = rollup.get(key, {}).get(meal_type)
+                expected = actual.get(key, {}).get(meal_type)
+                # Float sums can differ in the last bits with insertion order
+                if stored is None or expected is None or stored[1] != expected[1] \
+                        or abs(stored[0] - expected[0]) > 1e-6:
+                    mismatches.append({'user_id': key[0], 'day': key[1], 'meal_type': meal_type,
+                                       'rollup': stored, 'actual': expected})
+        return mismatches
@@ -3,26 +3,223 @@ Database Models for Calorie Calculator
 
 Handles PostgreSQL database connections and operations for food entries.
 Provides methods to save and retrieve food intake data with proper error handling.
+Connections are borrowed from a per-process ConnectionPool instead of being
+opened for every query.
 """
 
 import psycopg2
+import psycopg2.extras
 import os
-from datetime import datetime
-from typing import List, Dict, Optional
-from ..models.food import FoodEntry, FoodItem, MealType
+import re
+from datetime import datetime, date, time, timedelta
+from typing import Iterator, List, Dict, Optional, Tuple, Union
+from config.settings import Config
+from ..metrics import QUERY_LATENCY, timed
+from ..models.food import DEFAULT_USER_ID, FoodEntry, FoodEntryRow
+from .pool import ConnectionPool, PoolTimeoutError
+
+# Failures of the connection rather than of the rows being written; retrying
+# the same rows in smaller transactions would fail the same way
+CONNECTION_ERRORS = (PoolTimeoutError, psycopg2.OperationalError, psycopg2.InterfaceError)
+
+# Idempotent schema migrations applied in order by init_database.
+# Append new statements; never edit or reorder existing ones.
+SCHEMA_MIGRATIONS = [
+    # Supports the half-open timestamp range used by daily lookups
+    "CREATE INDEX IF NOT EXISTS idx_food_entries_timestamp ON food_entries (timestamp)",
+    # Per-day, per-meal rollup maintained by every insert path; NUMERIC keeps
+    # the sums exactly equal to aggregating food_entries
+    """
+    CREATE TABLE IF NOT EXISTS daily_totals (
+        day DATE NOT NULL,
+        meal_type VARCHAR(50) NOT NULL,
+        calories NUMERIC NOT NULL,
+        entry_count INTEGER NOT NULL,
+        PRIMARY KEY (day, meal_type)
+    )
+    """,
+    # One-time backfill of pre-rollup data; a no-op once daily_totals has rows
+    """
+    INSERT INTO daily_totals (day, meal_type, calories, entry_count)
+    SELECT CAST(timestamp AS DATE), meal_type, SUM(calories_per_100g * quantity_grams / 100), COUNT(*)
+    FROM food_entries
+    WHERE NOT EXISTS (SELECT 1 FROM daily_totals)
+    GROUP BY 1, 2
+    """,
+    # Per-day write stamp behind the entry ETags. Versions come from one
+    # sequence, so a day's stamp never repeats even across deletes.
+    "CREATE SEQUENCE IF NOT EXISTS daily_version_seq",
+    """
+    CREATE TABLE IF NOT EXISTS daily_versions (
+        day DATE PRIMARY KEY,
+        version BIGINT NOT NULL
+    )
+    """,
+    # Per-user ownership and monthly range partitions. The plain table is
+    # attached as food_entries_legacy, the range partition for all history
+    # up to next month, so no existing row is copied: adding user_id with a
+    # constant default only touches the catalog, and attaching costs one
+    # read-only scan plus the (id, timestamp) key build. Rows dated later
+    # move to the DEFAULT partition; `flask partitions ensure` creates the
+    # monthly partitions from next month on. The id sequence carries over.
+    """
+    DO $$
+    DECLARE
+        legacy_end TIMESTAMP := date_trunc('month', LOCALTIMESTAMP) + INTERVAL '1 month';
+    BEGIN
+        IF NOT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = 'food_entries'::regclass) THEN
+            ALTER TABLE food_entries RENAME TO food_entries_legacy;
+            ALTER TABLE food_entries_legacy DROP CONSTRAINT food_entries_pkey;
+            ALTER INDEX IF EXISTS idx_food_entries_timestamp RENAME TO food_entries_legacy_timestamp_idx;
+            ALTER TABLE food_entries_legacy ADD COLUMN user_id VARCHAR(64) NOT NULL DEFAULT 'default';
+            CREATE TABLE food_entries (
+                id INTEGER NOT NULL DEFAULT nextval('food_entries_id_seq'),
+                user_id VARCHAR(64) NOT NULL DEFAULT 'default',
+                food_name VARCHAR(255) NOT NULL,
+                calories_per_100g DECIMAL(8,2) NOT NULL,
+                quantity_grams DECIMAL(8,2) NOT NULL,
+                meal_type VARCHAR(50) NOT NULL,
+                timestamp TIMESTAMP NOT NULL,
+                PRIMARY KEY (id, timestamp)
+            ) PARTITION BY RANGE (timestamp);
+            ALTER SEQUENCE food_entries_id_seq OWNED BY food_entries.id;
+            CREATE TABLE food_entries_default PARTITION OF food_entries DEFAULT;
+            INSERT INTO food_entries (id, user_id, food_name, calories_per_100g, quantity_grams, meal_type, timestamp)
+            SELECT id, user_id, food_name, calories_per_100g, quantity_grams, meal_type, timestamp
+            FROM food_entries_legacy WHERE timestamp >= legacy_end;
+            DELETE FROM food_entries_legacy WHERE timestamp >= legacy_end;
+            EXECUTE format('ALTER TABLE food_entries ATTACH PARTITION food_entries_legacy '
+                           'FOR VALUES FROM (MINVALUE) TO (%L)', legacy_end);
+            -- Adopts the renamed legacy index instead of building a new one
+            CREATE INDEX idx_food_entries_timestamp ON food_entries (timestamp);
+        END IF;
+    END $$
+    """,
+    # Daily and range reads filter one user's span inside a partition
+    "CREATE INDEX IF NOT EXISTS idx_food_entries_user_timestamp ON food_entries (user_id, timestamp)",
+    # Rollup and version rows become per user; pre-existing rows belong to 'default'
+    """
+    DO $$
+    BEGIN
+        IF NOT EXISTS (
+            SELECT 1 FROM information_schema.columns
+            WHERE table_schema = current_schema() AND table_name = 'daily_totals' AND column_name = 'user_id'
+        ) THEN
+            ALTER TABLE daily_totals ADD COLUMN user_id VARCHAR(64) NOT NULL DEFAULT 'default';
+            ALTER TABLE daily_totals DROP CONSTRAINT daily_totals_pkey;
+            ALTER TABLE daily_totals ADD PRIMARY KEY (user_id, day, meal_type);
+            ALTER TABLE daily_versions ADD COLUMN user_id VARCHAR(64) NOT NULL DEFAULT 'default';
+            ALTER TABLE daily_versions DROP CONSTRAINT daily_versions_pkey;
+            ALTER TABLE daily_versions ADD PRIMARY KEY (user_id, day);
+        END IF;
+    END $$
+    """,
+]
+
+# Catch-all partition for rows outside every monthly partition
+DEFAULT_PARTITION = 'food_entries_default'
+
+# Folds newly inserted entries into daily_totals inside the inserting
+# transaction. Rows are locked in (user_id, day, meal_type) order so
+# concurrent batches can't deadlock. The timestamp bounds let Postgres prune
+# the id lookup to the partitions that were written.
+ROLLUP_INSERTED_SQL = """
+    INSERT INTO daily_totals (user_id, day, meal_type, calories, entry_count)
+    SELECT user_id, CAST(timestamp AS DATE), meal_type, SUM(calories_per_100g * quantity_grams / 100), COUNT(*)
+    FROM food_entries
+    WHERE id = ANY(%s) AND timestamp >= %s AND timestamp <= %s
+    GROUP BY 1, 2, 3
+    ORDER BY 1, 2, 3
+    ON CONFLICT (user_id, day, meal_type) DO UPDATE SET
+        calories = daily_totals.calories + EXCLUDED.calories,
+        entry_count = daily_totals.entry_count + EXCLUDED.entry_count
+"""
+
+# Gives every user-day touched by newly inserted entries a fresh version in
+# the inserting transaction, in key order like the rollup.
+VERSION_INSERTED_SQL = """
+    INSERT INTO daily_versions (user_id, day, version)
+    SELECT user_id, day, nextval('daily_version_seq')
+    FROM (
+        SELECT DISTINCT user_id, CAST(timestamp AS DATE) AS day FROM food_entries
+        WHERE id = ANY(%s) AND timestamp >= %s AND timestamp <= %s
+    ) AS days
+    ORDER BY user_id, day
+    ON CONFLICT (user_id, day) DO UPDATE SET version = EXCLUDED.version
+"""
+
+
+def inserted_params(entry_ids: List[int], entries: List[FoodEntry]) -> Tuple[List[int], datetime, datetime]:
+    """Parameters for ROLLUP_INSERTED_SQL / VERSION_INSERTED_SQL"""
+    timestamps = [entry.timestamp for entry in entries]
+    return entry_ids, min(timestamps), max(timestamps)
+
+
+def month_start(day: date) -> date:
+    return day.replace(day=1)
+
+
+def next_month(day: date) -> date:
+    return (day.replace(day=1) + timedelta(days=32)).replace(day=1)
+
+
+def partition_name(month: date) -> str:
+    return f"food_entries_p{month:%Y%m}"
+
+
+def partition_range(bounds: str) -> Optional[Tuple[Optional[date], Optional[date]]]:
+    """``[lower, upper)`` days of a range partition from ``pg_get_expr`` output
+    
+    ``None`` stands for MINVALUE/MAXVALUE; the DEFAULT partition has no range.
+    """
+    match = re.fullmatch(r"FOR VALUES FROM \((.+)\) TO \((.+)\)", bounds)
+    if match is None:
+        return None
+    lower, upper = (None if value.endswith('VALUE') else date.fromisoformat(value.strip("'")[:10])
+                    for value in match.groups())
+    return lower, upper
+
+
+def day_filter(column: str, start_day: Optional[date], end_day: Optional[date],
+               timestamps: bool = False) -> Tuple[str, list]:
+    """SQL condition and params limiting ``column`` to an inclusive day span"""
+    conditions, params = ["TRUE"], []
+    if start_day is not None:
+        conditions.append(f"{column} >= %s")
+        params.append(day_bounds(start_day)[0] if timestamps else start_day)
+    if end_day is not None:
+        conditions.append(f"{column} < %s")
+        params.append(day_bounds(end_day)[1] if timestamps else end_day + timedelta(days=1))
+    return " AND ".join(conditions), params
+
+
+def day_bounds(day: Union[str, date]) -> Tuple[datetime, datetime]:
+    """Return the half-open ``[start, end)`` timestamp range covering a day"""
+    if isinstance(day, str):
+        day = date.fromisoformat(day)
+    start = datetime.combine(day, time.min)
+    return start, start + timedelta(days=1)
+
 
 class DatabaseManager:
     """Manages PostgreSQL database connections and food entry operations"""
     
-    def __init__(self, db_url: str = None):
-        """Initialize database manager with connection URL"""
+    def __init__(self, db_url: str = None, pool: ConnectionPool = None, config=None):
+        """Initialize database manager; no connection is opened until first use
+        
+        Call init_database() (or ``flask init-db``) once to create the schema.
+        """
         self.db_url = db_url or os.getenv('DATABASE_URL', 'postgresql://localhost/calorie_tracker')
-        self.init_database()
+        self.pool = pool or ConnectionPool.from_config(self._connect, config or Config)
     
-    def get_connection(self):
-        """Create and return a new database connection"""
+    def _connect(self):
+        """Open a raw connection; only the pool should call this"""
         return psycopg2.connect(self.db_url)
     
+    def get_connection(self):
+        """Borrow a pooled connection; use as ``with db.get_connection() as conn``"""
+        return self.pool.connection()
+    
     def init_database(self):
         """Create database tables if they don't exist"""
         with self.get_connection() as conn:
@@ -37,18 +234,23 @@ class DatabaseManager:
                         timestamp TIMESTAMP NOT NULL
                     )
                 """)
+                for migration in SCHEMA_MIGRATIONS:
+                    cursor.execute(migration)
             conn.commit()
+        self.ensure_partitions()
     
+    @timed(QUERY_LATENCY, 'postgres', 'save_food_entry')
     def save_food_entry(self, entry: FoodEntry) -> int:
         """Save a food entry to the database and return the entry ID"""
         with self.get_connection() as conn:
             with conn.cursor() as cursor:
                 cursor.execute("""
                     INSERT INTO food_entries 
-                    (food_name, calories_per_100g, quantity_grams, meal_type, timestamp)
-                    VALUES (%s, %s, %s, %s, %s)
+                    (user_id, food_name, calories_per_100g, quantity_grams, meal_type, timestamp)
+                    VALUES (%s, %s, %s, %s, %s, %s)
                     RETURNING id
                 """, (
+                    entry.user_id,
                     entry.food_item.name,
                     entry.food_item.calories_per_100g,
                     entry.food_item.quantity_grams,
@@ -56,26 +258,290 @@ class DatabaseManager:
                     entry.timestamp
                 ))
                 result = cursor.fetchone()
+                params = inserted_params([result[0]], [entry])
+                cursor.execute(ROLLUP_INSERTED_SQL, params)
+                cursor.execute(VERSION_INSERTED_SQL, params)
             conn.commit()
             return result[0] if result else None
     
-    def get_daily_entries(self, date_str: str) -> List[FoodEntry]:
-        """Retrieve all food entries for a specific date"""
+    @timed(QUERY_LATENCY, 'postgres', 'save_food_entries')
+    def save_food_entries(self, entries: List[FoodEntry], page_size: int = 1000) -> List[int]:
+        """Save many food entries in one transaction and return their IDs in order"""
+        if not entries:
+            return []
+        rows = [
+            (
+                entry.user_id,
+                entry.food_item.name,
+                entry.food_item.calories_per_100g,
+                entry.food_item.quantity_grams,
+                entry.meal_type.value,
+                entry.timestamp
+            )
+            for entry in entries
+        ]
+        with self.get_connection() as conn:
+            with conn.cursor() as cursor:
+                # Multi-row VALUES: one round trip per page instead of per entry
+                results = psycopg2.extras.execute_values(cursor, """
+                    INSERT INTO food_entries 
+                    (user_id, food_name, calories_per_100g, quantity_grams, meal_type, timestamp)
+                    VALUES %s
+                    RETURNING id
+                """, rows, page_size=page_size, fetch=True)
+                entry_ids = [row[0] for row in results]
+                params = inserted_params(entry_ids, entries)
+                cursor.execute(ROLLUP_INSERTED_SQL, params)
+                cursor.execute(VERSION_INSERTED_SQL, params)
+            conn.commit()
+            return entry_ids
+    
+    @timed(QUERY_LATENCY, 'postgres', 'get_daily_entries')
+    def get_daily_entries(self, date_str: str, user_id: str = DEFAULT_USER_ID) -> List[FoodEntryRow]:
+        """Retrieve one user's food entries for a specific date as read-model rows"""
+        # A timestamp range prunes to one monthly partition and uses
+        # idx_food_entries_user_timestamp; DATE(timestamp) = ... would scan.
+        start, end = day_bounds(date_str)
         with self.get_connection() as conn:
             with conn.cursor() as cursor:
                 cursor.execute("""
                     SELECT food_name, calories_per_100g, quantity_grams, meal_type, timestamp
                     FROM food_entries
-                    WHERE DATE(timestamp) = %s
+                    WHERE user_id = %s AND timestamp >= %s AND timestamp < %s
                     ORDER BY timestamp
-                """, (date_str,))
+                """, (user_id, start, end))
                 
+                # Stored rows were validated on write; skip FoodEntry's checks
                 entries = []
-                for row in cursor.fetchall():
-                    # Reconstruct food entry objects from database data
-                    food_item = FoodItem(row[0], float(row[1]), float(row[2]))
-                    meal_type = MealType(row[3])
-                    timestamp = row[4]
-                    entries.append(FoodEntry(meal_type, food_item, timestamp))
+                for name, calories_per_100g, quantity_grams, meal_type, timestamp in cursor.fetchall():
+                    calories_per_100g = float(calories_per_100g)
+                    quantity_grams = float(quantity_grams)
+                    entries.append(FoodEntryRow(
+                        name, calories_per_100g, quantity_grams, meal_type, timestamp,
+                        calories_per_100g * quantity_grams / 100
+                    ))
                 
                 return entries
+    
+    @timed(QUERY_LATENCY, 'postgres', 'get_day_version')
+    def get_day_version(self, day: Union[str, date], user_id: str = DEFAULT_USER_ID) -> int:
+        """Return a user's write version for a day (0 if nothing was written since versioning began)"""
+        if isinstance(day, str):
+            day = date.fromisoformat(day)
+        with self.get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT version FROM daily_versions WHERE user_id = %s AND day = %s",
+                               (user_id, day))
+                row = cursor.fetchone()
+                return row[0] if row else 0
+    
+    @timed(QUERY_LATENCY, 'postgres', 'get_daily_summary')
+    def get_daily_summary(self, date_str: str, user_id: str = DEFAULT_USER_ID) -> Dict[str, Tuple[float, int]]:
+        """Return a user's ``{meal_type: (calories, entry_count)}`` for a date from the daily_totals rollup"""
+        day = date.fromisoformat(date_str) if isinstance(date_str, str) else date_str
+        with self.get_connection() as conn:
+            with conn.cursor() as cursor:
+                # At most one row per meal type, however many entries the day has
+                cursor.execute("""
+                    SELECT meal_type, calories, entry_count
+                    FROM daily_totals
+                    WHERE user_id = %s AND day = %s AND entry_count > 0
+                """, (user_id, day))
+                return {row[0]: (float(row[1]), row[2]) for row in cursor.fetchall()}
+    
+    @timed(QUERY_LATENCY, 'postgres', 'get_range_summary')
+    def get_range_summary(self, start_day: date, end_day: date,
+                          user_id: str = DEFAULT_USER_ID) -> List[Tuple[date, str, float, int]]:
+        """A user's per-day, per-meal ``(day, meal_type, calories, count)`` rows for an inclusive span
+        
+        Reads the daily_totals rollup: at most one row per day and meal, so a
+        multi-year span never touches individual entries.
+        """
+        with self.get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("""
+                    SELECT day, meal_type, calories, entry_count
+                    FROM daily_totals
+                    WHERE user_id = %s AND day >= %s AND day <= %s AND entry_count > 0
+                    ORDER BY day
+                """, (user_id, start_day, end_day))
+                return [(row[0], row[1], float(row[2]), row[3]) for row in cursor]
+    
+    def iter_food_entries(self, start_day: date = None, end_day: date = None, chunk_size: int = 2000,
+                          user_id: str = DEFAULT_USER_ID) -> Iterator[Tuple[str, float, float, str, datetime]]:
+        """Stream a user's ``(food_name, calories_per_100g, quantity_grams, meal_type, timestamp)`` rows
+        
+        Reads through a server-side (named) cursor, ``chunk_size`` rows per
+        round trip, so memory stays flat however long the history is. The
+        pooled connection is held until the iterator is exhausted or closed.
+        """
+        entry_filter, params = day_filter('timestamp', start_day, end_day, timestamps=True)
+        with self.get_connection() as conn:
+            with conn.cursor(name='food_entries_export') as cursor:
+                cursor.itersize = chunk_size
+                cursor.execute(f"""
+                    SELECT food_name, calories_per_100g, quantity_grams, meal_type, timestamp
+                    FROM food_entries
+                    WHERE user_id = %s AND {entry_filter}
+                    ORDER BY timestamp, id
+                """, [user_id] + params)
+                for row in cursor:
+                    yield row[0], float(row[1]), float(row[2]), row[3], row[4]
+    
+    def rebuild_daily_totals(self, start_day: date = None, end_day: date = None) -> int:
+        """Recompute daily_totals from food_entries for a span (all days by default)
+        
+        Blocks concurrent inserts for the duration so no write can fall
+        between the delete and the re-aggregation. Returns rows written.
+        """
+        rollup_filter, rollup_params = day_filter('day', start_day, end_day)
+        entry_filter, entry_params = day_filter('timestamp', start_day, end_day, timestamps=True)
+        with self.get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("LOCK TABLE food_entries IN SHARE MODE")
+                cursor.execute(f"DELETE FROM daily_totals WHERE {rollup_filter}", rollup_params)
+                cursor.execute(f"""
+                    INSERT INTO daily_totals (user_id, day, meal_type, calories, entry_count)
+                    SELECT user_id, CAST(timestamp AS DATE), meal_type,
+                           SUM(calories_per_100g * quantity_grams / 100), COUNT(*)
+                    FROM food_entries
+                    WHERE {entry_filter}
+                    GROUP BY 1, 2, 3
+                """, entry_params)
+                written = cursor.rowcount
+                # Summaries may have changed, so cached copies must revalidate
+                cursor.execute(f"""
+                    INSERT INTO daily_versions (user_id, day, version)
+                    SELECT user_id, day, nextval('daily_version_seq')
+                    FROM (
+                        SELECT user_id, day FROM daily_versions WHERE {rollup_filter}
+                        UNION SELECT user_id, day FROM daily_totals WHERE {rollup_filter}
+                    ) AS days
+                    ORDER BY user_id, day
+                    ON CONFLICT (user_id, day) DO UPDATE SET version = EXCLUDED.version
+                """, rollup_params + rollup_params)
+            conn.commit()
+            return written
+    
+    def check_daily_totals(self, start_day: date = None, end_day: date = None) -> List[Dict]:
+        """Rollup rows that disagree with aggregating food_entries directly
+        
+        Covers every user. Each mismatch is ``{user_id, day, meal_type,
+        rollup: (calories, count) | None, actual: (calories, count) | None}``;
+        an empty list means consistent.
+        """
+        rollup_filter, rollup_params = day_filter('day', start_day, end_day)
+        entry_filter, entry_params = day_filter('timestamp', start_day, end_day, timestamps=True)
+        with self.get_connection() as conn:
+            with conn.cursor() as cursor:
+                # Repeatable read: both sides see the same snapshot
+                cursor.execute("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ")
+                cursor.execute(f"""
+                    WITH actual AS (
+                        SELECT user_id, CAST(timestamp AS DATE) AS day, meal_type,
+                               SUM(calories_per_100g * quantity_grams / 100) AS calories,
+                               COUNT(*) AS entry_count
+                        FROM food_entries
+                        WHERE {entry_filter}
+                        GROUP BY 1, 2, 3
+                    ), rollup AS (
+                        SELECT user_id, day, meal_type, calories, entry_count
+                        FROM daily_totals
+                        WHERE {rollup_filter} AND entry_count > 0
+                    )
+                    SELECT COALESCE(a.user_id, r.user_id), COALESCE(a.day, r.day),
+                           COALESCE(a.meal_type, r.meal_type),
+                           r.calories, r.entry_count, a.calories, a.entry_count
+                    FROM actual a
+                    FULL OUTER JOIN rollup r
+                        ON a.user_id = r.user_id AND a.day = r.day AND a.meal_type = r.meal_type
+                    WHERE a.calories IS DISTINCT FROM r.calories
+                       OR a.entry_count IS DISTINCT FROM r.entry_count
+                    ORDER BY 1, 2, 3
+                """, entry_params + rollup_params)
+                rows = cursor.fetchall()
+            conn.rollback()
+        return [
+            {
+                'user_id': row[0],
+                'day': row[1],
+                'meal_type': row[2],
+                'rollup': (float(row[3]), row[4]) if row[4] is not None else None,
+                'actual': (float(row[5]), row[6]) if row[6] is not None else None,
+            }
+            for row in rows
+        ]
+    
+    def ensure_partitions(self, months_ahead: int = None, today: date = None) -> List[str]:
+        """Create monthly food_entries partitions through ``months_ahead`` months from now
+        
+        Also covers every month that has rows in the DEFAULT partition (writes
+        beyond the horizon); those rows move into their new partition in the
+        same transaction. One transaction per month keeps the DEFAULT
+        partition's lock short. Months inside an existing range, such as
+        food_entries_legacy, are skipped. Returns the partitions created.
+        """
+        if months_ahead is None:
+            months_ahead = Config.PARTITION_MONTHS_AHEAD
+        month = month_start(today or date.today())
+        wanted = [month]
+        for _ in range(months_ahead):
+            month = next_month(month)
+            wanted.append(month)
+        
+        with self.get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(f"SELECT DISTINCT date_trunc('month', timestamp) FROM {DEFAULT_PARTITION}")
+                wanted.extend(row[0].date() for row in cursor.fetchall())
+                ranges = [partition_range(bounds) for _, bounds, _ in self._partitions(cursor)]
+            conn.rollback()
+            
+            created = []
+            for month in sorted(set(wanted)):
+                if any((lower is None or lower <= month) and (upper is None or month < upper)
+                       for lower, upper in filter(None, ranges)):
+                    continue
+                name = partition_name(month)
+                lower, upper = month.isoformat(), next_month(month).isoformat()
+                with conn.cursor() as cursor:
+                    # Hold off inserts routed to DEFAULT while its rows move
+                    cursor.execute(f"LOCK TABLE {DEFAULT_PARTITION} IN EXCLUSIVE MODE")
+                    cursor.execute(f"""
+                        CREATE TABLE {name}
+                        (LIKE food_entries INCLUDING DEFAULTS INCLUDING CONSTRAINTS)
+                    """)
+                    cursor.execute(f"""
+                        WITH moved AS (
+                            DELETE FROM {DEFAULT_PARTITION}
+                            WHERE timestamp >= %s AND timestamp < %s
+                            RETURNING *
+                        )
+                        INSERT INTO {name} SELECT * FROM moved
+                    """, (lower, upper))
+                    # Attaching builds the partitioned indexes on the new table
+                    cursor.execute(f"""
+                        ALTER TABLE food_entries ATTACH PARTITION {name}
+                        FOR VALUES FROM ('{lower}') TO ('{upper}')
+                    """)
+                conn.commit()
+                created.append(name)
+            return created
+    
+    def list_partitions(self) -> List[Tuple[str, str, int]]:
+        """``(name, bounds, estimated_rows)`` for every food_entries partition"""
+        with self.get_connection() as conn:
+            with conn.cursor() as cursor:
+                partitions = self._partitions(cursor)
+            conn.rollback()
+            return partitions
+    
+    @staticmethod
+    def _partitions(cursor) -> List[Tuple[str, str, int]]:
+        cursor.execute("""
+            SELECT c.relname, pg_get_expr(c.relpartbound, c.oid), GREATEST(c.reltuples, 0)::BIGINT
+            FROM pg_inherits i
+            JOIN pg_class c ON c.oid = i.inhrelid
+            WHERE i.inhparent = 'food_entries'::regclass
+            ORDER BY 1
+        """)
+        return cursor.fetchall()
@@ -0,0 +1,284 @@
+"""
+Database Connection Pool
+
+Thread-safe connection pool shared by every DatabaseManager operation.
+Connections are opened lazily, validated before reuse and never shared
+across processes, so the pool is safe to create before gunicorn forks.
+Works with any DB-API driver: psycopg2 in production, sqlite3 as a stand-in.
+"""
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, asdict
+from typing import Callable, Dict, List, Tuple
+
+from ..metrics import POOL_WAIT
+
+
+class PoolTimeoutError(Exception):
+    """Raised when no connection becomes available within the checkout timeout"""
+
+
+@dataclass
+class PoolStats:
+    """Checkout counters for monitoring pool pressure"""
+    checkouts: int = 0
+    waits: int = 0
+    timeouts: int = 0
+    connections_created: int = 0
+    connections_discarded: int = 0
+    wait_time_total: float = 0.0
+    wait_time_max: float = 0.0
+    held_time_total: float = 0.0
+    held_time_max: float = 0.0
+
+    def to_dict(self) -> Dict[str, float]:
+        return asdict(self)
+
+
+class ConnectionPool:
+    """Bounded pool of DB-API connections with health checks and wait counters"""
+
+    def __init__(self, connect: Callable, min_size: int = 1, max_size: int = 10,
+                 timeout: float = 5.0, health_check_interval: float = 30.0,
+                 max_idle_time: float = 300.0):
+        """Initialize pool with a zero-argument connection factory"""
+        if min_size < 0 or max_size < 1 or min_size > max_size:
+            raise ValueError("Pool sizes must satisfy 0 <= min_size <= max_size and max_size >= 1")
+        self._connect = connect
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.health_check_interval = health_check_interval
+        self.max_idle_time = max_idle_time
+
+        self._lock = threading.Lock()
+        self._available = threading.Condition(self._lock)
+        self._inherited: List[object] = []
+        self._reset_state()
+
+    @classmethod
+    def from_config(cls, connect: Callable, config) -> 'ConnectionPool':
+        """Build a pool from ``DB_POOL_*`` settings in a Flask config or Config class"""
+        get = config.get if isinstance(config, dict) else lambda key: getattr(config, key)
+        return cls(
+            connect,
+            min_size=get('DB_POOL_MIN_SIZE'),
+            max_size=get('DB_POOL_MAX_SIZE'),
+            timeout=get('DB_POOL_TIMEOUT'),
+            health_check_interval=get('DB_POOL_HEALTH_CHECK_INTERVAL'),
+            max_idle_time=get('DB_POOL_MAX_IDLE_TIME')
+        )
+
+    def _reset_state(self):
+        """Forget all connections; used at construction and after a fork"""
+        self._pid = os.getpid()
+        self._idle: List[Tuple[object, float]] = []
+        self._checked_out: Dict[int, float] = {}
+        self._size = 0
+        self._warmed = False
+        self.stats = PoolStats()
+
+    def _check_pid(self):
+        """Drop connections inherited from a parent process (caller holds the lock)"""
+        if self._pid != os.getpid():
+            # Closing inherited sockets would terminate the parent's sessions,
+            # so the child keeps them referenced and simply never uses them.
+            self._inherited.extend(conn for conn, _ in self._idle)
+            self._reset_state()
+
+    @property
+    def size(self) -> int:
+        """Number of open connections, idle or checked out"""
+        return self._size
+
+    @property
+    def idle_count(self) -> int:
+        return len(self._idle)
+
+    def getconn(self):
+        """Check out a healthy connection, waiting up to ``timeout`` seconds"""
+        start = time.monotonic()
+        deadline = start + self.timeout
+        waited = False
+
+        if not self._warmed:
+            self._warm_up()
+
+        while True:
+            with self._available:
+                self._check_pid()
+                while not self._idle and self._size >= self.max_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self.stats.timeouts += 1
+                        raise PoolTimeoutError(
+                            f"No database connection available within {self.timeout}s "
+                            f"(max_size={self.max_size})"
+                        )
+                    waited = True
+                    self._available.wait(remaining)
+
+                if self._idle:
+                    conn, idle_since = self._idle.pop()
+                else:
+                    conn, idle_since = None, None
+                    self._size += 1
+
+            if conn is None:
+                conn = self._open()
+            elif not self._is_healthy(conn, idle_since):
+                self._discard(conn)
+                continue
+
+            now = time.monotonic()
+            wait_time = now - start
+            POOL_WAIT.observe(wait_time)
+            with self._lock:
+                self._checked_out[id(conn)] = now
+                self.stats.checkouts += 1
+                self.stats.wait_time_total += wait_time
+                self.stats.wait_time_max = max(self.stats.wait_time_max, wait_time)
+                if waited:
+                    self.stats.waits += 1
+            return conn
+
+    def putconn(self, conn, discard: bool = False):
+        """Return a connection to the pool, closing it if broken or discarded"""
+        now = time.monotonic()
+        with self._lock:
+            if self._pid != os.getpid():
+                return
+            checked_out_at = self._checked_out.pop(id(conn), None)
+            if checked_out_at is not None:
+                held = now - checked_out_at
+                self.stats.held_time_total += held
+                self.stats.held_time_max = max(self.stats.held_time_max, held)
+
+        if not discard and not self._is_closed(conn):
+            try:
+                # Leave no transaction open between checkouts
+                conn.rollback()
+            except Exception:
+                discard = True
+
+        if discard or self._is_closed(conn):
+            self._discard(conn)
+            return
+
+        with self._available:
+            self._idle.append((conn, now))
+            self._close_expired_idle(now)
+            self._available.notify()
+
+    @contextmanager
+    def connection(self):
+        """Context manager that checks out a connection and always returns it"""
+        conn = self.getconn()
+        discard = False
+        try:
+            yield conn
+        except Exception:
+            try:
+                conn.rollback()
+            except Exception:
+                discard = True
+            raise
+        finally:
+            self.putconn(conn, discard=discard)
+
+    def close_all(self):
+        """Close every idle connection owned by this process"""
+        with self._available:
+            self._check_pid()
+            idle, self._idle = self._idle, []
+            self._size -= len(idle)
+            self._available.notify_all()
+        for conn, _ in idle:
+            self._close(conn)
+
+    def _warm_up(self):
+        """Open ``min_size`` connections on first use in this process"""
+        with self._lock:
+            self._check_pid()
+            if self._warmed:
+                return
+            self._warmed = True
+            missing = max(0, self.min_size - self._size)
+            self._size += missing
+        opened = []
+        try:
+            for _ in range(missing):
+                opened.append(self._open())
+        except Exception:
+            # _open released the failed slot; release the ones never attempted.
+            # Connection errors surface on the actual checkout instead.
+            with self._available:
+                self._size -= missing - len(opened) - 1
+                self._available.notify_all()
+        now = time.monotonic()
+        with self._available:
+            self._idle.extend((conn, now) for conn in opened)
+            self._available.notify_all()
+
+    def _open(self):
+        """Create a new connection for a slot already reserved in ``_size``"""
+        try:
+            conn = self._connect()
+        except Exception:
+            with self._available:
+                self._size -= 1
+                self._available.notify()
+            raise
+        with self._lock:
+            self.stats.connections_created += 1
+        return conn
+
+    def _discard(self, conn):
+        self._close(conn)
+        with self._available:
+            self._size -= 1
+            self.stats.connections_discarded += 1
+            self._available.notify()
+
+    def _close_expired_idle(self, now: float):
+        """Close idle connections above ``min_size`` unused for ``max_idle_time`` (caller holds the lock)"""
+        while len(self._idle) and self._size > self.min_size:
+            conn, idle_since = self._idle[0]
+            if now - idle_since < self.max_idle_time:
+                break
+            self._idle.pop(0)
+            self._size -= 1
+            self._close(conn)
+
+    def _is_healthy(self, conn, idle_since: float) -> bool:
+        """Detect dead connections before handing them out"""
+        if self._is_closed(conn):
+            return False
+        if time.monotonic() - idle_since < self.health_check_interval:
+            return True
+        try:
+            cursor = conn.cursor()
+            try:
+                cursor.execute("SELECT 1")
+                cursor.fetchone()
+            finally:
+                cursor.close()
+            conn.rollback()
+            return True
+        except Exception:
+            return False
+
+    @staticmethod
+    def _is_closed(conn) -> bool:
+        # psycopg2 exposes a non-zero ``closed`` flag; other drivers may not
+        return bool(getattr(conn, 'closed', False))
+
+    @staticmethod
+    def _close(conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
@@ -0,0 +1,115 @@
+"""
+Service Registry
+
+Builds application services lazily, once per app and worker process, and
+keeps them in ``app.extensions``. Creating the app or importing blueprints
+never touches a database; the first request that needs a service builds it
+from ``app.config``. Schema setup lives in the ``flask init-db`` command.
+"""
+
+import threading
+from typing import Callable, Dict
+
+from flask import Flask, current_app
+
+from app.database.food_data import FoodDatabase
+from app.database.memory import InMemoryDatabaseManager, is_memory_url
+from app.database.models import CONNECTION_ERRORS, DatabaseManager
+from app.services.cache import MemoryCache, create_cache
+from app.services.calorie_calculator import CalorieCalculatorService
+from app.services.food_tracker import FoodTrackingService
+from app.services.write_buffer import GroupCommitWriter
+
+EXTENSION_NAME = 'calorie_services'
+
+
+class ServiceRegistry:
+    """Per-app container of lazily constructed, shared service instances"""
+
+    def __init__(self, app: Flask):
+        self.app = app
+        self._services: Dict[str, object] = {}
+        self._lock = threading.RLock()
+        self._factories: Dict[str, Callable[[], object]] = {
+            'db_manager': self._create_db_manager,
+            'food_tracker': self._create_food_tracker,
+            'food_db': self._create_food_db,
+            'calculator': CalorieCalculatorService,
+            'export_slots': self._create_export_slots,
+        }
+
+    def register(self, name: str, factory: Callable[[], object]):
+        """Add or replace a factory; an already built instance is discarded"""
+        with self._lock:
+            self._factories[name] = factory
+            self._services.pop(name, None)
+
+    def get(self, name: str):
+        """Return the service, constructing it on first use"""
+        service = self._services.get(name)
+        if service is None:
+            with self._lock:
+                service = self._services.get(name)
+                if service is None:
+                    service = self._services[name] = self._factories[name]()
+        return service
+
+    def peek(self, name: str):
+        """Return the service if it has been built, without building it"""
+        return self._services.get(name)
+
+    def _create_db_manager(self) -> DatabaseManager:
+        db_url = self.app.config['DATABASE_URL']
+        if is_memory_url(db_url):
+            return InMemoryDatabaseManager(db_url)
+        return DatabaseManager(db_url, config=self.app.config)
+
+    def _create_food_tracker(self) -> FoodTrackingService:
+        config = self.app.config
+        cache = create_cache(
+            config['INTAKE_CACHE_BACKEND'],
+            max_entries=config['INTAKE_CACHE_MAX_ENTRIES'],
+            ttl=config['INTAKE_CACHE_TTL'],
+            url=config['INTAKE_CACHE_URL']
+        )
+        db_manager = self.get('db_manager')
+        writer = None
+        if config['WRITE_BEHIND_ENABLED']:
+            writer = GroupCommitWriter(
+                db_manager.save_food_entries,
+                max_batch=config['WRITE_BEHIND_MAX_BATCH'],
+                max_delay=config['WRITE_BEHIND_MAX_DELAY_MS'] / 1000,
+                max_queue=config['WRITE_BEHIND_QUEUE_SIZE'],
+                submit_timeout=config['WRITE_BEHIND_SUBMIT_TIMEOUT'],
+                connection_errors=CONNECTION_ERRORS
+            )
+        return FoodTrackingService(db_manager, cache=cache, writer=writer)
+
+    def _create_export_slots(self) -> threading.BoundedSemaphore:
+        # Each running export holds a pooled connection until its stream ends
+        return threading.BoundedSemaphore(self.app.config['EXPORT_MAX_CONCURRENT'])
+
+    def _create_food_db(self) -> FoodDatabase:
+        config = self.app.config
+        return FoodDatabase(
+            config['FOOD_DB_PATH'],
+            search_engine=config['FOOD_SEARCH_ENGINE'],
+            index_refresh_interval=config['FOOD_INDEX_REFRESH_INTERVAL'],
+            food_cache=MemoryCache(config['FOOD_CACHE_MAX_ENTRIES'], config['FOOD_CACHE_TTL']),
+            snapshot_path=config['FOOD_SNAPSHOT_PATH']
+        )
+
+
+def init_app(app: Flask) -> ServiceRegistry:
+    """Attach an empty registry to the app; nothing is built yet"""
+    registry = app.extensions[EXTENSION_NAME] = ServiceRegistry(app)
+    return registry
+
+
+def get_registry(app: Flask = None) -> ServiceRegistry:
+    return (app or current_app).extensions[EXTENSION_NAME]
+
+
+def get_service(name: str):
+    """Look up a service on the current app"""
+    return get_registry().get(name)
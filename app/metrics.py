@@ -0,0 +1,273 @@
+"""
+Request and Query Metrics
+
+Lightweight latency histograms exposed in the Prometheus text format on
+``/metrics``. Routes, DB queries, pool waits and request phases (JSON
+parsing, validation, serialization) are timed with ``Histogram.time()``
+spans. Cache and pool counters are read from the live services at scrape
+time.
+
+Metrics are per worker process, like ``/api/stats``; scrape each worker or
+run a single one. ``METRICS_ENABLED=false`` turns every span into a no-op
+and removes the endpoint.
+"""
+
+import bisect
+import functools
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+
+from flask import Flask, Response, g, request
+from flask.json.provider import JSONProvider
+
+# Upper bounds in seconds; spans range from microsecond parses to slow queries
+DEFAULT_BUCKETS = (0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+                   0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def format_labels(names: Sequence[str], values: Sequence, extra: str = '') -> str:
+    pairs = [f'{name}="{str(value)}"'.replace('\n', ' ') for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+class _Timer:
+    """Span that observes its duration on exit; free when metrics are off"""
+    __slots__ = ('histogram', 'labelvalues', 'start')
+
+    def __init__(self, histogram: 'Histogram', labelvalues: Tuple):
+        self.histogram = histogram
+        self.labelvalues = labelvalues
+        self.start = None
+
+    def __enter__(self):
+        if self.histogram.registry.enabled:
+            self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        if self.start is not None:
+            self.histogram.observe(time.perf_counter() - self.start, *self.labelvalues)
+
+
+class Histogram:
+    """Cumulative-bucket latency histogram with optional labels"""
+
+    def __init__(self, registry: 'MetricsRegistry', name: str, documentation: str,
+                 labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.registry = registry
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        # labelvalues -> [per-bucket counts..., +Inf count, sum]
+        self._children: Dict[Tuple, List[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float, *labelvalues):
+        if not self.registry.enabled:
+            return
+        index = bisect.bisect_left(self.buckets, seconds)
+        with self._lock:
+            child = self._children.get(labelvalues)
+            if child is None:
+                child = self._children[labelvalues] = [0] * (len(self.buckets) + 1) + [0.0]
+            child[index] += 1
+            child[-1] += seconds
+
+    def time(self, *labelvalues) -> _Timer:
+        return _Timer(self, labelvalues)
+
+    def snapshot(self) -> Dict[Tuple, Tuple[List[int], int, float]]:
+        """``{labelvalues: (cumulative bucket counts, count, sum)}``"""
+        with self._lock:
+            children = {labels: list(child) for labels, child in self._children.items()}
+        result = {}
+        for labels, child in children.items():
+            cumulative, running = [], 0
+            for count in child[:-1]:
+                running += count
+                cumulative.append(running)
+            result[labels] = (cumulative[:-1], running, child[-1])
+        return result
+
+    def render(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} histogram"
+        for labels, (buckets, count, total) in sorted(self.snapshot().items()):
+            for bound, cumulative in zip(self.buckets, buckets):
+                le = 'le="%s"' % bound
+                yield f"{self.name}_bucket{format_labels(self.labelnames, labels, le)} {cumulative}"
+            le = 'le="+Inf"'
+            yield f"{self.name}_bucket{format_labels(self.labelnames, labels, le)} {count}"
+            yield f"{self.name}_sum{format_labels(self.labelnames, labels)} {total}"
+            yield f"{self.name}_count{format_labels(self.labelnames, labels)} {count}"
+
+
+class MetricsRegistry:
+    """Histograms plus scrape-time collectors for counters and gauges"""
+
+    def __init__(self):
+        self.enabled = True
+        self._histograms: Dict[str, Histogram] = {}
+        self._collectors: Dict[str, Callable[[], Iterable[str]]] = {}
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        if name not in self._histograms:
+            self._histograms[name] = Histogram(self, name, documentation, labelnames, buckets)
+        return self._histograms[name]
+
+    def add_collector(self, name: str, collect: Callable[[], Iterable[str]]):
+        """``collect()`` yields exposition lines when /metrics is scraped; replaces ``name``"""
+        self._collectors[name] = collect
+
+    def reset(self):
+        for histogram in self._histograms.values():
+            with histogram._lock:
+                histogram._children.clear()
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for histogram in self._histograms.values():
+            lines.extend(histogram.render())
+        for collect in self._collectors.values():
+            lines.extend(collect())
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = MetricsRegistry()
+
+REQUEST_LATENCY = REGISTRY.histogram(
+    'http_request_duration_seconds', 'Request latency by route', ('method', 'route', 'status'))
+QUERY_LATENCY = REGISTRY.histogram(
+    'db_query_duration_seconds', 'Database call latency including pool wait', ('store', 'query'))
+POOL_WAIT = REGISTRY.histogram(
+    'db_pool_wait_seconds', 'Time to check a connection out of the pool, including connects')
+PHASE_LATENCY = REGISTRY.histogram(
+    'request_phase_seconds', 'Time spent in request phases', ('phase',))
+WRITE_BATCH_SIZE = REGISTRY.histogram(
+    'write_buffer_batch_entries', 'Entries committed per write-behind batch',
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256, 512))
+
+
+def timed(histogram: Histogram, *labelvalues):
+    """Decorator form of ``histogram.time(*labelvalues)``"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with histogram.time(*labelvalues):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def counter(name: str, documentation: str, samples: Dict[str, float], labelname: str = None,
+            kind: str = 'counter') -> Iterable[str]:
+    """Exposition lines for one counter/gauge family, ``{labelvalue or '': value}``"""
+    yield f"# HELP {name} {documentation}"
+    yield f"# TYPE {name} {kind}"
+    for labelvalue, value in samples.items():
+        labels = format_labels((labelname,), (labelvalue,)) if labelname else ''
+        yield f"{name}{labels} {value}"
+
+
+class TimedJSONProvider(JSONProvider):
+    """Times request body parsing and response serialization of another provider
+    
+    Wraps whatever provider ``app.json`` already is (stdlib or orjson);
+    other attributes such as ``sort_keys`` are read from the wrapped one.
+    """
+
+    def __init__(self, app: Flask, provider: JSONProvider):
+        super().__init__(app)
+        self.provider = provider
+
+    def __getattr__(self, name):
+        return getattr(self.provider, name)
+
+    def loads(self, s, **kwargs):
+        with PHASE_LATENCY.time('json_parse'):
+            return self.provider.loads(s, **kwargs)
+
+    def dumps(self, obj, **kwargs):
+        with PHASE_LATENCY.time('json_serialize'):
+            return self.provider.dumps(obj, **kwargs)
+
+    def response(self, *args, **kwargs):
+        with PHASE_LATENCY.time('json_serialize'):
+            return self.provider.response(*args, **kwargs)
+
+
+def _service_collector(app: Flask) -> Callable[[], Iterable[str]]:
+    """Pool, cache and write buffer counters of services this worker has already built"""
+    from app.extensions import get_registry
+
+    def collect():
+        registry = get_registry(app)
+        food_tracker = registry.peek('food_tracker')
+        food_db = registry.peek('food_db')
+        caches = {}
+        if food_tracker is not None and food_tracker.cache is not None:
+            caches['intake'] = food_tracker.cache.stats.to_dict()
+        if food_db is not None and food_db.food_cache is not None:
+            caches['food'] = food_db.food_cache.stats.to_dict()
+        if caches:
+            for field in ('hits', 'misses', 'evictions', 'invalidations', 'errors'):
+                yield from counter(f'cache_{field}_total', f'Cache {field}',
+                                   {name: stats[field] for name, stats in caches.items()}, 'cache')
+            yield from counter('cache_hit_ratio', 'Cache hits per lookup',
+                               {name: stats['hit_rate'] for name, stats in caches.items()}, 'cache', kind='gauge')
+        if food_tracker is None:
+            return
+        pool = getattr(food_tracker.db_manager, 'pool', None)
+        if pool is not None:
+            stats = pool.stats.to_dict()
+            for field in ('checkouts', 'waits', 'timeouts', 'connections_created', 'connections_discarded'):
+                yield from counter(f'db_pool_{field}_total', f'Pool {field.replace("_", " ")}',
+                                   {'': stats[field]})
+            yield from counter('db_pool_connections', 'Open pool connections',
+                               {'': pool.size}, kind='gauge')
+        writer = food_tracker.writer
+        if writer is not None:
+            stats = writer.stats.to_dict()
+            for field in ('submitted', 'committed', 'failed', 'rejected'):
+                yield from counter(f'write_buffer_{field}_total', f'Write-behind entries {field}',
+                                   {'': stats[field]})
+            yield from counter('write_buffer_queue_depth', 'Entries waiting for a batch',
+                               {'': writer.depth}, kind='gauge')
+    return collect
+
+
+def init_app(app: Flask, registry: MetricsRegistry = REGISTRY):
+    """Install the request middleware and /metrics when METRICS_ENABLED"""
+    registry.enabled = app.config.get('METRICS_ENABLED', True)
+    if not registry.enabled:
+        return
+
+    app.json = TimedJSONProvider(app, app.json)
+
+    @app.before_request
+    def start_timer():
+        g.metrics_start = time.perf_counter()
+
+    @app.after_request
+    def observe_request(response):
+        # Also runs for error responses, so 4xx/5xx latency is recorded too
+        start = g.pop('metrics_start', None)
+        if start is not None and request.endpoint != 'metrics':
+            # The rule template, not the raw path, keeps label cardinality bounded
+            rule = request.url_rule.rule if request.url_rule else 'unmatched'
+            REQUEST_LATENCY.observe(time.perf_counter() - start, request.method, rule,
+                                    response.status_code)
+        return response
+
+    registry.add_collector('services', _service_collector(app))
+
+    @app.route('/metrics')
+    def metrics():
+        return Response(registry.render(), content_type=CONTENT_TYPE)
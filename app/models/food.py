@@ -1,7 +1,18 @@
+import re
 from dataclasses import dataclass
 from enum import Enum
 from datetime import datetime
-from typing import List
+from typing import Dict, List
+
+# Owner of entries written without a user (single-tenant deployments)
+DEFAULT_USER_ID = "default"
+USER_ID_PATTERN = re.compile(r"^[A-Za-z0-9_.@-]{1,64}$")
+
+
+def validate_user_id(user_id: str) -> str:
+    if not isinstance(user_id, str) or not USER_ID_PATTERN.match(user_id):
+        raise ValueError("User id must be 1-64 letters, digits or _.@-")
+    return user_id
 
 class MealType(Enum):
     BREAKFAST = "breakfast"
@@ -16,8 +27,9 @@ class FoodItem:
     quantity_grams: float
     
     def __post_init__(self):
-        if self.calories_per_100g <= 0:
-            raise ValueError("Calories per 100g must be positive")
+        # Zero is valid (water, black coffee), as in the catalog importer
+        if self.calories_per_100g < 0:
+            raise ValueError("Calories per 100g cannot be negative")
         if self.quantity_grams <= 0:
             raise ValueError("Quantity must be positive")
     
@@ -30,6 +42,10 @@ class FoodEntry:
     meal_type: MealType
     food_item: FoodItem
     timestamp: datetime
+    user_id: str = DEFAULT_USER_ID
+    
+    def __post_init__(self):
+        validate_user_id(self.user_id)
     
     @property
     def calories(self) -> float:
@@ -38,3 +54,35 @@ class FoodEntry:
     def calculate_calories(self) -> float:
         """Calculate total calories for this food entry"""
         return self.food_item.total_calories
+
+@dataclass(slots=True)
+class FoodEntryRow:
+    """Read model for stored entries
+    
+    Built straight from trusted database rows: no FoodItem/FoodEntry
+    validation, no MealType lookup, and calories computed once. Write paths
+    keep using the validating FoodEntry.
+    """
+    food_name: str
+    calories_per_100g: float
+    quantity_grams: float
+    meal_type: str
+    timestamp: datetime
+    calories: float
+    
+    @classmethod
+    def from_entry(cls, entry: FoodEntry) -> 'FoodEntryRow':
+        item = entry.food_item
+        return cls(item.name, item.calories_per_100g, item.quantity_grams,
+                   entry.meal_type.value, entry.timestamp, item.total_calories)
+    
+    def to_dict(self) -> Dict:
+        """API representation used by GET /api/food-entries"""
+        return {
+            'food_name': self.food_name,
+            'calories_per_100g': self.calories_per_100g,
+            'quantity_grams': self.quantity_grams,
+            'meal_type': self.meal_type,
+            'calories': self.calories,
+            'timestamp': self.timestamp.isoformat()
+        }
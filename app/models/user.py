@@ -20,6 +20,7 @@ class User:
     weight: float  # kg
     height: float  # cm
     activity_level: ActivityLevel
+    body_fat_percentage: Optional[float] = None  # only needed by lean-mass formulas
     
     def __post_init__(self):
         if self.age <= 0 or self.age > 120:
@@ -28,3 +29,12 @@ class User:
             raise ValueError("Weight must be between 1 and 500 kg")
         if self.height <= 0 or self.height > 300:
             raise ValueError("Height must be between 1 and 300 cm")
+        if self.body_fat_percentage is not None and not 2 <= self.body_fat_percentage <= 70:
+            raise ValueError("Body fat must be between 2 and 70 percent")
+    
+    @property
+    def lean_body_mass(self) -> Optional[float]:
+        """Fat-free mass in kg, when body fat is known"""
+        if self.body_fat_percentage is None:
+            return None
+        return self.weight * (1 - self.body_fat_percentage / 100)
@@ -0,0 +1,249 @@
+"""
+Slow Request Profiler
+
+A stack sampler that records where slow requests spend their time. While a
+profiled request runs, one background thread per worker wakes every
+``interval`` seconds and folds the request thread's current stack into a
+counter. Requests that finish under the threshold drop their samples. Slow
+ones are written to a bounded on-disk ring buffer that is shared by every
+worker on the host.
+
+Profiles store collapsed stacks (``frame;frame;frame count``), which
+flamegraph.pl, speedscope and similar tools read directly. Unlike cProfile,
+sampling adds no per-call overhead, so it is safe to leave on in
+production.
+"""
+
+import json
+import os
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from typing import Dict, List, Optional
+
+from flask import Flask, g, request
+
+PROFILE_ID = re.compile(r'^[0-9]{13}-[0-9a-f]{8}$')
+MAX_STACK_DEPTH = 128
+
+
+def collapse(frame) -> str:
+    """``root;...;leaf`` stack string for a frame, outermost call first"""
+    names = []
+    while frame is not None and len(names) < MAX_STACK_DEPTH:
+        code = frame.f_code
+        names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+        frame = frame.f_back
+    return ';'.join(reversed(names))
+
+
+class StackSampler:
+    """Samples the stacks of registered threads from one daemon thread"""
+
+    def __init__(self, interval: float = 0.01):
+        self.interval = interval
+        self._active: Dict[int, Counter] = {}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._pid = None
+
+    def _ensure_thread(self):
+        # Threads don't survive fork; each worker starts its own
+        if self._thread is None or self._pid != os.getpid() or not self._thread.is_alive():
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name='stack-sampler', daemon=True)
+            self._thread.start()
+
+    def start(self) -> Counter:
+        """Begin sampling the calling thread"""
+        samples = Counter()
+        with self._lock:
+            self._ensure_thread()
+            self._active[threading.get_ident()] = samples
+            self._wakeup.set()
+        return samples
+
+    def stop(self) -> Counter:
+        """Stop sampling the calling thread and return its folded stacks"""
+        with self._lock:
+            return self._active.pop(threading.get_ident(), Counter())
+
+    def peek(self, ident: int) -> Counter:
+        """Copy of the samples collected so far for a registered thread"""
+        with self._lock:
+            return Counter(self._active.get(ident, ()))
+
+    def _run(self):
+        while True:
+            if not self._active:
+                # Sleep until a request registers; no wake-ups while idle
+                self._wakeup.wait()
+                self._wakeup.clear()
+            time.sleep(self.interval)
+            frames = sys._current_frames()
+            with self._lock:
+                for ident, samples in self._active.items():
+                    frame = frames.get(ident)
+                    if frame is not None:
+                        samples[collapse(frame)] += 1
+
+
+class ProfileStore:
+    """Ring buffer of profile files in one directory, newest ``max_profiles`` kept"""
+
+    def __init__(self, directory: str, max_profiles: int = 50):
+        self.directory = directory
+        self.max_profiles = max_profiles
+
+    def _path(self, profile_id: str) -> str:
+        return os.path.join(self.directory, f"{profile_id}.json")
+
+    def save(self, profile: Dict) -> str:
+        """Write a profile atomically, evict the oldest beyond the bound, return its id"""
+        os.makedirs(self.directory, exist_ok=True)
+        # Millisecond timestamp first, so name order is age order across workers
+        profile_id = f"{int(time.time() * 1000):013d}-{uuid.uuid4().hex[:8]}"
+        path = self._path(profile_id)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump({'id': profile_id, **profile}, f)
+        os.replace(tmp_path, path)
+        for stale in self._ids()[self.max_profiles:]:
+            try:
+                os.remove(self._path(stale))
+            except FileNotFoundError:
+                pass  # another worker evicted it first
+        return profile_id
+
+    def _ids(self) -> List[str]:
+        """Profile ids, newest first"""
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return []
+        ids = [name[:-5] for name in names if name.endswith('.json') and PROFILE_ID.match(name[:-5])]
+        return sorted(ids, reverse=True)
+
+    def load(self, profile_id: str) -> Optional[Dict]:
+        if not PROFILE_ID.match(profile_id):
+            return None
+        try:
+            with open(self._path(profile_id)) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def list(self) -> List[Dict]:
+        """Metadata of stored profiles, newest first"""
+        summaries = []
+        for profile_id in self._ids():
+            profile = self.load(profile_id)
+            if profile is not None:
+                profile.pop('stacks', None)
+                summaries.append(profile)
+        return summaries
+
+
+def folded(profile: Dict) -> str:
+    """Collapsed-stack text for flame graph tools"""
+    return ''.join(f"{stack} {count}\n" for stack, count in profile['stacks'].items())
+
+
+class SlowRequestProfiler:
+    """Samples matching requests and keeps profiles of the slow ones"""
+
+    def __init__(self, store: ProfileStore, threshold: float, path_prefixes: List[str],
+                 sampler: StackSampler = None):
+        self.store = store
+        self.threshold = threshold
+        self.path_prefixes = tuple(path_prefixes)
+        self.sampler = sampler or StackSampler()
+        # thread ident -> (perf_counter start, request metadata)
+        self._inflight: Dict[int, tuple] = {}
+
+    def matches(self, path: str) -> bool:
+        return path.startswith(self.path_prefixes)
+
+    def begin(self, method: str, path: str, query: str = ''):
+        """Start sampling the calling thread's request"""
+        self._inflight[threading.get_ident()] = (
+            time.perf_counter(), {'method': method, 'path': path, 'query': query}
+        )
+        self.sampler.start()
+
+    def end(self) -> Optional[str]:
+        """Stop sampling; save and return a profile id if the request was slow"""
+        samples = self.sampler.stop()
+        started, meta = self._inflight.pop(threading.get_ident(), (None, None))
+        if started is None:
+            return None
+        duration = time.perf_counter() - started
+        if duration < self.threshold or not samples:
+            return None
+        return self._save(meta, duration, samples)
+
+    def dump_inflight(self) -> List[str]:
+        """Save every request still running, e.g. before a worker is killed"""
+        ids = []
+        now = time.perf_counter()
+        for ident, (started, meta) in list(self._inflight.items()):
+            samples = self.sampler.peek(ident)
+            if samples:
+                ids.append(self._save({**meta, 'aborted': True}, now - started, samples))
+        return ids
+
+    def _save(self, meta: Dict, duration: float, samples: Counter) -> str:
+        return self.store.save({
+            **meta,
+            'created': time.time(),
+            'duration_ms': round(duration * 1000, 1),
+            'interval_ms': self.sampler.interval * 1000,
+            'samples': sum(samples.values()),
+            'pid': os.getpid(),
+            'stacks': dict(samples.most_common()),
+        })
+
+
+EXTENSION_NAME = 'slow_request_profiler'
+
+
+def get_profiler(app: Flask) -> Optional[SlowRequestProfiler]:
+    return app.extensions.get(EXTENSION_NAME)
+
+
+def init_app(app: Flask) -> Optional[SlowRequestProfiler]:
+    """Sample requests under PROFILE_PATH_PREFIXES when PROFILE_ENABLED"""
+    config = app.config
+    if not config.get('PROFILE_ENABLED', False):
+        return None
+    # A relative directory would follow the working directory of whoever starts the server
+    if not config.get('PROFILE_DIR') or not os.path.isabs(config['PROFILE_DIR']):
+        raise ValueError(f"PROFILE_ENABLED requires an absolute PROFILE_DIR, got {config.get('PROFILE_DIR')!r}")
+    profiler = app.extensions[EXTENSION_NAME] = SlowRequestProfiler(
+        ProfileStore(config['PROFILE_DIR'], config['PROFILE_MAX_FILES']),
+        threshold=config['PROFILE_SLOW_REQUEST_MS'] / 1000,
+        path_prefixes=config['PROFILE_PATH_PREFIXES'],
+        sampler=StackSampler(config['PROFILE_SAMPLE_INTERVAL_MS'] / 1000),
+    )
+
+    @app.before_request
+    def start_profile():
+        if profiler.matches(request.path):
+            g.profiling = True
+            profiler.begin(request.method, request.path,
+                           request.query_string.decode('utf-8', 'replace'))
+
+    @app.teardown_request
+    def stop_profile(exc=None):
+        # Teardown also runs after unhandled errors, so samplers never leak
+        if g.pop('profiling', False):
+            try:
+                profiler.end()
+            except OSError as e:
+                app.logger.warning("Could not save slow request profile: %s", e)
+
+    return profiler
@@ -0,0 +1,82 @@
+"""
+JSON Providers
+
+Flask JSON providers for API responses, installed by ``init_app`` according
+to ``JSON_PROVIDER``. ``OrjsonProvider`` serializes with orjson when it is
+installed: dataclasses such as FoodEntryRow, datetimes and dates are
+written straight to bytes, so handlers can return read-model rows without
+building per-entry dicts or calling ``isoformat()``. ``IsoJSONProvider`` is
+the stdlib fallback; it accepts the same objects, converting read models
+through their ``to_dict``, and emits the same ISO 8601 dates (Flask's
+default provider would write RFC 822 dates).
+"""
+
+from datetime import date, datetime
+from typing import Any
+
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # optional; the stdlib provider is used instead
+    orjson = None
+
+JSON_PROVIDERS = ('auto', 'orjson', 'stdlib')
+
+
+def iso_default(o: Any) -> Any:
+    """``default`` hook: ISO 8601 dates, ``to_dict()``, then Flask's conversions (dataclasses, Decimal, UUID)"""
+    if isinstance(o, (datetime, date)):
+        return o.isoformat()
+    # Read models define to_dict; dataclasses.asdict deep-copies every field
+    to_dict = getattr(o, 'to_dict', None)
+    if to_dict is not None:
+        return to_dict()
+    return DefaultJSONProvider.default(o)
+
+
+class IsoJSONProvider(DefaultJSONProvider):
+    """Stdlib json provider writing dates as ISO 8601"""
+
+    default = staticmethod(iso_default)
+
+
+class OrjsonProvider(IsoJSONProvider):
+    """orjson-backed provider; falls back to stdlib json for json.dumps-only keyword arguments"""
+
+    def dumps_bytes(self, obj: Any, indent: bool = False) -> bytes:
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        if self.sort_keys:
+            # Sorts dict keys; dataclass fields keep their declared order
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=self.default, option=option)
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+        return self.dumps_bytes(obj).decode()
+
+    def loads(self, s, **kwargs: Any) -> Any:
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any):
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = self.compact is False or (self.compact is None and self._app.debug)
+        return self._app.response_class(self.dumps_bytes(obj, indent) + b"\n", mimetype=self.mimetype)
+
+
+def init_app(app: Flask) -> DefaultJSONProvider:
+    """Install the provider selected by JSON_PROVIDER ('auto' prefers orjson)"""
+    choice = app.config.get('JSON_PROVIDER', 'auto')
+    if choice not in JSON_PROVIDERS:
+        raise ValueError(f"Unknown JSON provider: {choice}. Choose from {', '.join(JSON_PROVIDERS)}")
+    if choice == 'orjson' and orjson is None:
+        raise RuntimeError("JSON_PROVIDER=orjson but orjson is not installed")
+    use_orjson = orjson is not None and choice != 'stdlib'
+    app.json = (OrjsonProvider if use_orjson else IsoJSONProvider)(app)
+    return app.json
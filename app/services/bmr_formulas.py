@@ -0,0 +1,106 @@
+"""
+BMR Formula Tables
+
+Each BMR equation is stored as a coefficient table indexed by gender and
+age band. Every formula is the same linear kernel
+
+    bmr = c_weight * kg + c_height * cm + c_age * years + c_lean * lean_kg + c_const
+
+so adding a formula means adding a table, not code. Tables are precomputed
+in kcal/day (Schofield's MJ/day constants are converted once at import).
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, Sequence, Tuple
+
+import numpy as np
+
+from ..models.user import Gender
+
+KCAL_PER_MJ = 239.005736
+
+# Row order of every table's first axis
+GENDER_INDEX = {Gender.MALE: 0, Gender.FEMALE: 1}
+
+Coefficients = Tuple[float, float, float, float, float]  # weight, height, age, lean mass, constant
+
+
+def bmr_kernel(c, weight, height, age, lean_mass):
+    """Shared evaluation for scalars (tuple ``c``) and columns (``c`` shaped 5 x n)"""
+    return c[0] * weight + c[1] * height + c[2] * age + c[3] * lean_mass + c[4]
+
+
+@dataclass(frozen=True)
+class BMRFormula:
+    """A named coefficient table of shape (gender, age band, 5)"""
+    name: str
+    label: str
+    male: Sequence[Coefficients]
+    female: Sequence[Coefficients]
+    # Lower age bound of every band after the first
+    age_bands: Sequence[int] = ()
+    requires_lean_mass: bool = False
+    table: np.ndarray = field(init=False, repr=False, compare=False)
+    rows: Tuple[Tuple[Coefficients, ...], ...] = field(init=False, repr=False, compare=False)
+    edges: np.ndarray = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        if not (len(self.male) == len(self.female) == len(self.age_bands) + 1):
+            raise ValueError(f"{self.name}: need one coefficient row per age band and gender")
+        table = np.array([self.male, self.female], dtype=float)
+        table.setflags(write=False)
+        object.__setattr__(self, 'table', table)
+        object.__setattr__(self, 'rows', tuple(tuple(map(tuple, t)) for t in table.tolist()))
+        object.__setattr__(self, 'edges', np.array(self.age_bands, dtype=float))
+
+    def band(self, age: float) -> int:
+        """Age band index for a single age"""
+        band = 0
+        for lower in self.age_bands:
+            if age < lower:
+                break
+            band += 1
+        return band
+
+    def coefficients(self, gender: Gender, age: float) -> Coefficients:
+        return self.rows[GENDER_INDEX[gender]][self.band(age)]
+
+    def coefficient_columns(self, gender_index: np.ndarray, ages: np.ndarray) -> np.ndarray:
+        """Per-row coefficients as a (5, n) array for bmr_kernel"""
+        bands = np.searchsorted(self.edges, ages, side='right')
+        return self.table[gender_index, bands].T
+
+
+def _schofield(rows_mj: Sequence[Tuple[float, float]]) -> Tuple[Coefficients, ...]:
+    """Convert Schofield ``(MJ per kg, MJ constant)`` rows to kcal coefficients"""
+    return tuple((a * KCAL_PER_MJ, 0.0, 0.0, 0.0, b * KCAL_PER_MJ) for a, b in rows_mj)
+
+
+BMR_FORMULAS: Dict[str, BMRFormula] = {formula.name: formula for formula in (
+    BMRFormula(
+        'mifflin_st_jeor', 'Mifflin-St Jeor (1990)',
+        male=[(10.0, 6.25, -5.0, 0.0, 5.0)],
+        female=[(10.0, 6.25, -5.0, 0.0, -161.0)],
+    ),
+    BMRFormula(
+        'harris_benedict', 'Harris-Benedict (Roza & Shizgal 1984)',
+        male=[(13.397, 4.799, -5.677, 0.0, 88.362)],
+        female=[(9.247, 3.098, -4.330, 0.0, 447.593)],
+    ),
+    BMRFormula(
+        'katch_mcardle', 'Katch-McArdle',
+        male=[(0.0, 0.0, 0.0, 21.6, 370.0)],
+        female=[(0.0, 0.0, 0.0, 21.6, 370.0)],
+        requires_lean_mass=True,
+    ),
+    BMRFormula(
+        'schofield', 'Schofield (WHO 1985)',
+        male=_schofield([(0.249, -0.127), (0.095, 2.110), (0.074, 2.754),
+                         (0.063, 2.896), (0.048, 3.653), (0.049, 2.459)]),
+        female=_schofield([(0.244, -0.130), (0.085, 2.033), (0.056, 2.898),
+                           (0.062, 2.036), (0.034, 3.538), (0.038, 2.755)]),
+        age_bands=(3, 10, 18, 30, 60),
+    ),
+)}
+
+DEFAULT_FORMULA = 'mifflin_st_jeor'
@@ -0,0 +1,240 @@
+"""
+Cache Backends
+
+Size-bounded, TTL-expiring caches used for read-through caching of service
+results. ``MemoryCache`` is private to one worker process; ``SQLiteCache``
+is shared by every worker on a host through one file and stands in locally
+for ``RedisCache``, which shares entries across hosts.
+"""
+
+import pickle
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass, asdict
+from typing import Any, Dict, Optional
+
+MISSING = object()
+
+
+@dataclass
+class CacheStats:
+    """Counters since the cache was created (per worker process)"""
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+    errors: int = 0  # backend failures callers fell back from
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return round(self.hits / lookups, 4) if lookups else 0.0
+
+    def to_dict(self) -> Dict[str, float]:
+        return {**asdict(self), 'hit_rate': self.hit_rate}
+
+
+class Cache(ABC):
+    def __init__(self, max_entries: int = 1024, ttl: float = 60.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.stats = CacheStats()
+        self._stats_lock = threading.Lock()
+
+    @abstractmethod
+    def get(self, key: str) -> Any:
+        """Return the cached value or ``MISSING``"""
+
+    @abstractmethod
+    def set(self, key: str, value: Any) -> None:
+        pass
+
+    @abstractmethod
+    def delete(self, *keys: str) -> None:
+        pass
+
+    @abstractmethod
+    def clear(self) -> None:
+        pass
+
+    def record_error(self):
+        """Count a backend failure the caller handled by skipping the cache"""
+        self._count('errors')
+
+    def _count(self, field: str, amount: int = 1):
+        with self._stats_lock:
+            setattr(self.stats, field, getattr(self.stats, field) + amount)
+
+
+class MemoryCache(Cache):
+    """In-process LRU with per-entry TTL; suitable for a single worker"""
+
+    def __init__(self, max_entries: int = 1024, ttl: float = 60.0):
+        super().__init__(max_entries, ttl)
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Any:
+        with self._lock:
+            item = self._entries.get(key)
+            if item is not None:
+                expires_at, value = item
+                if expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.stats.hits += 1
+                    return value
+                del self._entries[key]
+                self.stats.evictions += 1
+            self.stats.misses += 1
+            return MISSING
+
+    def set(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats.evictions += 1
+
+    def delete(self, *keys: str) -> None:
+        with self._lock:
+            for key in keys:
+                if self._entries.pop(key, None) is not None:
+                    self.stats.invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteCache(Cache):
+    """Cache shared by all workers on one host through a SQLite file"""
+
+    def __init__(self, path: str, max_entries: int = 1024, ttl: float = 60.0):
+        super().__init__(max_entries, ttl)
+        self.path = path
+        self._local = threading.local()
+        with self._connection() as conn:
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS cache_entries (
+                    key TEXT PRIMARY KEY,
+                    value BLOB NOT NULL,
+                    expires_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_cache_entries_accessed ON cache_entries (accessed_at)")
+
+    def _connection(self) -> sqlite3.Connection:
+        """One connection per thread; sqlite3 connections are not thread-safe"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._local.conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA synchronous = OFF")
+        return conn
+
+    def get(self, key: str) -> Any:
+        conn = self._connection()
+        now = time.time()
+        row = conn.execute(
+            "SELECT value, expires_at FROM cache_entries WHERE key = ?", (key,)
+        ).fetchone()
+        if row is not None and row[1] > now:
+            conn.execute("UPDATE cache_entries SET accessed_at = ? WHERE key = ?", (now, key))
+            self._count('hits')
+            return pickle.loads(row[0])
+        if row is not None:
+            conn.execute("DELETE FROM cache_entries WHERE key = ? AND expires_at <= ?", (key, now))
+            self._count('evictions')
+        self._count('misses')
+        return MISSING
+
+    def set(self, key: str, value: Any) -> None:
+        conn = self._connection()
+        now = time.time()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute(
+                "INSERT OR REPLACE INTO cache_entries (key, value, expires_at, accessed_at) "
+                "VALUES (?, ?, ?, ?)",
+                (key, pickle.dumps(value, pickle.HIGHEST_PROTOCOL), now + self.ttl, now)
+            )
+            evicted = conn.execute("""
+                DELETE FROM cache_entries WHERE key IN (
+                    SELECT key FROM cache_entries ORDER BY accessed_at DESC LIMIT -1 OFFSET ?
+                )
+            """, (self.max_entries,)).rowcount
+        if evicted > 0:
+            self._count('evictions', evicted)
+
+    def delete(self, *keys: str) -> None:
+        if not keys:
+            return
+        conn = self._connection()
+        placeholders = ", ".join("?" for _ in keys)
+        deleted = conn.execute(f"DELETE FROM cache_entries WHERE key IN ({placeholders})", keys).rowcount
+        if deleted > 0:
+            self._count('invalidations', deleted)
+
+    def clear(self) -> None:
+        self._connection().execute("DELETE FROM cache_entries")
+
+
+class RedisCache(Cache):
+    """Cache shared across hosts; size is bounded by Redis ``maxmemory-policy allkeys-lru``"""
+
+    def __init__(self, url: str = None, client=None, ttl: float = 60.0, prefix: str = 'calorie:'):
+        super().__init__(max_entries=0, ttl=ttl)
+        if client is None:
+            try:
+                import redis
+            except ImportError as e:
+                raise RuntimeError("RedisCache requires the 'redis' package") from e
+            client = redis.Redis.from_url(url)
+        self.client = client
+        self.prefix = prefix
+
+    def get(self, key: str) -> Any:
+        raw = self.client.get(self.prefix + key)
+        if raw is None:
+            self._count('misses')
+            return MISSING
+        self._count('hits')
+        return pickle.loads(raw)
+
+    def set(self, key: str, value: Any) -> None:
+        self.client.set(self.prefix + key, pickle.dumps(value, pickle.HIGHEST_PROTOCOL),
+                        px=int(self.ttl * 1000))
+
+    def delete(self, *keys: str) -> None:
+        if keys:
+            deleted = self.client.delete(*(self.prefix + key for key in keys))
+            if deleted:
+                self._count('invalidations', deleted)
+
+    def clear(self) -> None:
+        for key in self.client.scan_iter(self.prefix + '*'):
+            self.client.delete(key)
+
+
+def create_cache(backend: str, max_entries: int = 1024, ttl: float = 60.0,
+                 url: str = None) -> Optional[Cache]:
+    """Build a cache from config values; ``'none'`` disables caching"""
+    if backend == 'none':
+        return None
+    if backend == 'memory':
+        return MemoryCache(max_entries, ttl)
+    if backend == 'sqlite':
+        return SQLiteCache(url or 'cache.db', max_entries, ttl)
+    if backend == 'redis':
+        if not url:
+            raise ValueError("The redis cache backend requires a redis:// URL (INTAKE_CACHE_URL)")
+        return RedisCache(url, ttl=ttl)
+    raise ValueError(f"Unknown cache backend: {backend}")
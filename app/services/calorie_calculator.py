@@ -1,29 +1,206 @@
 from abc import ABC, abstractmethod
-from ..models.user import User, Gender
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from ..models.user import User, Gender, ActivityLevel
+from .bmr_formulas import BMRFormula, BMR_FORMULAS, DEFAULT_FORMULA, GENDER_INDEX, bmr_kernel
+
+ACTIVITY_MULTIPLIERS = np.array([level.value for level in ActivityLevel])
+
 
 class BMRCalculator(ABC):
     @abstractmethod
     def calculate_bmr(self, user: User) -> float:
         pass
 
-class MifflinStJeorCalculator(BMRCalculator):
+    def calculate_bmr_batch(self, ages: np.ndarray, is_male: np.ndarray,
+                            weights: np.ndarray, heights: np.ndarray,
+                            body_fat_percentages: np.ndarray = None) -> np.ndarray:
+        """BMR for whole columns (NaN body fat = unknown); override with a vectorized kernel"""
+        if body_fat_percentages is None:
+            body_fat_percentages = np.full(len(ages), np.nan)
+        return np.fromiter(
+            (
+                self.calculate_bmr(User(
+                    int(age), Gender.MALE if male else Gender.FEMALE, weight, height,
+                    ActivityLevel.SEDENTARY, None if np.isnan(body_fat) else float(body_fat)
+                ))
+                for age, male, weight, height, body_fat in zip(
+                    ages, is_male, weights, heights, body_fat_percentages)
+            ),
+            dtype=float, count=len(ages)
+        )
+
+class TableBMRCalculator(BMRCalculator):
+    """Evaluates any coefficient-table formula from bmr_formulas"""
+
+    def __init__(self, formula: BMRFormula):
+        self.formula = formula
+
     def calculate_bmr(self, user: User) -> float:
-        if user.gender == Gender.MALE:
-            return 10 * user.weight + 6.25 * user.height - 5 * user.age + 5
+        lean_mass = user.lean_body_mass
+        if lean_mass is None:
+            if self.formula.requires_lean_mass:
+                raise ValueError(f"{self.formula.label} requires body fat percentage")
+            lean_mass = 0.0
+        coefficients = self.formula.coefficients(user.gender, user.age)
+        return bmr_kernel(coefficients, user.weight, user.height, user.age, lean_mass)
+
+    def calculate_bmr_batch(self, ages: np.ndarray, is_male: np.ndarray,
+                            weights: np.ndarray, heights: np.ndarray,
+                            body_fat_percentages: np.ndarray = None) -> np.ndarray:
+        if body_fat_percentages is None:
+            lean_masses = np.zeros(len(ages))
         else:
-            return 10 * user.weight + 6.25 * user.height - 5 * user.age - 161
+            # Same arithmetic as User.lean_body_mass; unknown body fat contributes 0
+            lean_masses = np.where(np.isnan(body_fat_percentages), 0.0,
+                                   weights * (1 - body_fat_percentages / 100))
+        gender_index = np.where(is_male, GENDER_INDEX[Gender.MALE], GENDER_INDEX[Gender.FEMALE])
+        columns = self.formula.coefficient_columns(gender_index, ages)
+        return bmr_kernel(columns, weights, heights, ages, lean_masses)
+
+class MifflinStJeorCalculator(TableBMRCalculator):
+    def __init__(self):
+        super().__init__(BMR_FORMULAS['mifflin_st_jeor'])
+
+
+# One shared calculator per registered formula
+BMR_CALCULATORS: Dict[str, TableBMRCalculator] = {
+    name: TableBMRCalculator(formula) for name, formula in BMR_FORMULAS.items()
+}
+
+
+def get_bmr_calculator(name: str) -> TableBMRCalculator:
+    if name not in BMR_CALCULATORS:
+        raise ValueError(f"Unknown BMR formula: {name}. Choose from {', '.join(BMR_CALCULATORS)}")
+    return BMR_CALCULATORS[name]
+
+
+def _round1(values: np.ndarray) -> np.ndarray:
+    """Round to one decimal exactly like Python's round(), vectorized
+
+    np.round scales by 10 in floating point, which misrounds values that sit
+    on or near a .x5 boundary (common here, e.g. 6.25 * height). Those rows
+    are re-decided by the exact sign of ``20 * value - (2k + 1)``.
+    """
+    rounded = np.round(values, 1)
+    # 20 * value computed error-free as s + err (16x and 4x are exact, then TwoSum)
+    a, b = values * 16, values * 4
+    s = a + b
+    bb = s - a
+    err = (a - (s - bb)) + (b - bb)
+    k = np.floor(s / 2)
+    near_tie = np.abs(s - (2 * k + 1)) <= 1e-6 * np.maximum(1.0, np.abs(s))
+    if near_tie.any():
+        k, s, err = k[near_tie], s[near_tie], err[near_tie]
+        diff = (s - (2 * k + 1)) + err
+        round_up = (diff > 0) | ((diff == 0) & (k % 2 == 1))
+        rounded[near_tie] = (k + round_up) / 10
+    return rounded
+
+
+def _float_column(values: Sequence) -> np.ndarray:
+    """Coerce a column to float64, turning unparseable cells into NaN"""
+    try:
+        return np.asarray(values, dtype=float)
+    except (TypeError, ValueError):
+        column = np.empty(len(values))
+        for i, value in enumerate(values):
+            try:
+                column[i] = float(value)
+            except (TypeError, ValueError):
+                column[i] = np.nan
+        return column
+
 
 class CalorieCalculatorService:
     def __init__(self, bmr_calculator: BMRCalculator = None):
-        self.bmr_calculator = bmr_calculator or MifflinStJeorCalculator()
-    
-    def calculate_daily_calories(self, user: User) -> dict:
-        bmr = self.bmr_calculator.calculate_bmr(user)
+        self.bmr_calculator = bmr_calculator or BMR_CALCULATORS[DEFAULT_FORMULA]
+
+    def _calculator(self, formula: Optional[str]) -> BMRCalculator:
+        return get_bmr_calculator(formula) if formula else self.bmr_calculator
+
+    def calculate_daily_calories(self, user: User, formula: str = None) -> dict:
+        bmr = self._calculator(formula).calculate_bmr(user)
         tdee = bmr * user.activity_level.value
-        
+
         return {
             'bmr': round(bmr, 1),
             'tdee': round(tdee, 1),
             'weight_loss': round(tdee - 500, 1),
             'weight_gain': round(tdee + 500, 1)
         }
+
+    def calculate_batch(self, ages: Sequence, genders: Sequence, weights: Sequence,
+                        heights: Sequence, activity_levels: Sequence,
+                        body_fat_percentages: Sequence = None,
+                        formula: str = None) -> Dict[str, List]:
+        """Vectorized calculate_daily_calories over columnar inputs
+
+        Returns columns aligned with the input; rows that fail validation hold
+        ``None`` and are listed in ``errors`` with the same messages as User.
+        """
+        calculator = self._calculator(formula)
+        if body_fat_percentages is None:
+            body_fat_percentages = [None] * len(ages)
+        lengths = {len(ages), len(genders), len(weights), len(heights), len(activity_levels),
+                   len(body_fat_percentages)}
+        if len(lengths) != 1:
+            raise ValueError("All input columns must have the same length")
+
+        # Truncated before validation, as int() is in the scalar API: 0.5 is
+        # age 0 (rejected) and 120.5 is age 120 (accepted)
+        age = np.trunc(_float_column(ages))
+        weight = _float_column(weights)
+        height = _float_column(heights)
+        activity = _float_column(activity_levels)
+        body_fat = _float_column([np.nan if value is None else value for value in body_fat_percentages])
+        gender = np.asarray(genders, dtype=object)
+        is_male = gender == Gender.MALE.value
+        needs_lean_mass = getattr(getattr(calculator, 'formula', None), 'requires_lean_mass', False)
+
+        # Same checks and order as User.__post_init__; first failure wins
+        checks = [
+            (np.isnan(age) | np.isnan(weight) | np.isnan(height) | np.isnan(activity),
+             "Numeric fields must be numbers"),
+            (~(is_male | (gender == Gender.FEMALE.value)), "Gender must be 'male' or 'female'"),
+            (~np.isin(activity, ACTIVITY_MULTIPLIERS), "Invalid activity level"),
+            ((age <= 0) | (age > 120), "Age must be between 1 and 120"),
+            ((weight <= 0) | (weight > 500), "Weight must be between 1 and 500 kg"),
+            ((height <= 0) | (height > 300), "Height must be between 1 and 300 cm"),
+            ((body_fat < 2) | (body_fat > 70), "Body fat must be between 2 and 70 percent"),
+        ]
+        if needs_lean_mass:
+            checks.append((np.isnan(body_fat), f"{calculator.formula.label} requires body fat percentage"))
+        invalid = np.zeros(len(age), dtype=bool)
+        messages = np.full(len(age), None, dtype=object)
+        for failed, message in checks:
+            new_failures = failed & ~invalid
+            messages[new_failures] = message
+            invalid |= failed
+
+        # Only valid rows reach the formula
+        valid = ~invalid
+        bmr = np.full(len(age), np.nan)
+        bmr[valid] = calculator.calculate_bmr_batch(
+            age[valid], is_male[valid], weight[valid], height[valid], body_fat[valid]
+        )
+        tdee = bmr * activity
+
+        def column(values: np.ndarray) -> List:
+            rounded = _round1(values).astype(object)
+            rounded[invalid] = None
+            return rounded.tolist()
+
+        error_rows = np.flatnonzero(invalid)
+        return {
+            'bmr': column(bmr),
+            'tdee': column(tdee),
+            'weight_loss': column(tdee - 500),
+            'weight_gain': column(tdee + 500),
+            'errors': [
+                {'index': int(index), 'error': message}
+                for index, message in zip(error_rows.tolist(), messages[error_rows].tolist())
+            ]
+        }
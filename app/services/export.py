@@ -0,0 +1,63 @@
+"""
+Food Entry Export
+
+Serializes streamed entry rows as NDJSON or CSV text chunks for a Flask
+generator response. Rows are grouped into chunks of ``batch`` lines so the
+WSGI server writes a few large blocks instead of one per entry; nothing
+beyond one chunk is held in memory.
+"""
+
+import csv
+import io
+import json
+from typing import Iterable, Iterator, Tuple
+
+EXPORT_FIELDS = ('timestamp', 'meal_type', 'food_name', 'calories_per_100g', 'quantity_grams', 'calories')
+
+EXPORT_FORMATS = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv',
+}
+
+Row = Tuple[str, float, float, str, object]
+
+
+def _record(row: Row) -> tuple:
+    name, calories_per_100g, quantity_grams, meal_type, timestamp = row
+    return (timestamp.isoformat(), meal_type, name, calories_per_100g, quantity_grams,
+            round(calories_per_100g * quantity_grams / 100, 1))
+
+
+def ndjson_chunks(rows: Iterable[Row], batch: int = 500) -> Iterator[str]:
+    lines = []
+    for row in rows:
+        lines.append(json.dumps(dict(zip(EXPORT_FIELDS, _record(row)))))
+        if len(lines) >= batch:
+            yield '\n'.join(lines) + '\n'
+            lines = []
+    if lines:
+        yield '\n'.join(lines) + '\n'
+
+
+def csv_chunks(rows: Iterable[Row], batch: int = 500) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_FIELDS)
+    pending = 0
+    for row in rows:
+        writer.writerow(_record(row))
+        pending += 1
+        if pending >= batch:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            pending = 0
+    yield buffer.getvalue()
+
+
+def export_chunks(rows: Iterable[Row], fmt: str, batch: int = 500) -> Iterator[str]:
+    if fmt == 'ndjson':
+        return ndjson_chunks(rows, batch)
+    if fmt == 'csv':
+        return csv_chunks(rows, batch)
+    raise ValueError(f"Unsupported export format: {fmt}. Choose from {', '.join(EXPORT_FORMATS)}")
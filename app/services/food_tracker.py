@@ -1,32 +1,184 @@
-from datetime import datetime, date
-from typing import List, Dict
-from ..models.food import FoodEntry, MealType
+import logging
+from collections import defaultdict, deque
+from datetime import datetime, date, timedelta
+from typing import Iterable, Iterator, List, Dict, Optional, Tuple, Union
+from ..models.food import DEFAULT_USER_ID, FoodEntry, MealType
 from ..database.models import DatabaseManager
+from .cache import Cache, MISSING
+from .write_buffer import GroupCommitWriter
+
+logger = logging.getLogger(__name__)
+
+
+def intake_cache_keys(target_date: date, version: Optional[int] = None,
+                      user_id: str = DEFAULT_USER_ID) -> Tuple[str, str]:
+    """Cache keys for the summary-only and with-entries views of one user's day
+    
+    Keys that carry the day's write version can't be served stale by a
+    worker that missed the invalidation; unversioned keys rely on it.
+    """
+    day = target_date.isoformat() if version is None else f"{target_date.isoformat()}@{version}"
+    return f"daily_intake:{user_id}:{day}:summary", f"daily_intake:{user_id}:{day}:entries"
+
 
 class FoodTrackingService:
-    def __init__(self, db_manager: DatabaseManager = None):
+    def __init__(self, db_manager: DatabaseManager = None, cache: Optional[Cache] = None,
+                 writer: Optional[GroupCommitWriter] = None):
+        """``writer`` turns on write-behind: single entries are group-committed in batches"""
         self.db_manager = db_manager or DatabaseManager()
+        self.cache = cache
+        self.writer = writer
     
     def add_food_entry(self, entry: FoodEntry) -> int:
-        return self.db_manager.save_food_entry(entry)
+        """Persist one entry; returns once it is committed, buffered or not"""
+        if self.writer is not None:
+            entry_id = self.writer.write(entry)
+        else:
+            entry_id = self.db_manager.save_food_entry(entry)
+        self._invalidate([entry])
+        return entry_id
+    
+    def add_food_entries(self, entries: List[FoodEntry]) -> List[int]:
+        """Persist a batch of validated entries atomically, returning IDs in order"""
+        entry_ids = self.db_manager.save_food_entries(entries)
+        self._invalidate(entries)
+        return entry_ids
     
-    def get_daily_intake(self, target_date: date = None) -> Dict[str, float]:
+    def close(self):
+        """Commit any buffered entries; call before the worker exits"""
+        if self.writer is not None:
+            self.writer.close()
+    
+    def _invalidate(self, entries: Iterable[FoodEntry]):
+        """Drop cached summaries for exactly the days that were written"""
+        if self.cache is None:
+            return
+        for user_id, day in {(entry.user_id, entry.timestamp.date()) for entry in entries}:
+            try:
+                self.cache.delete(*intake_cache_keys(day, user_id=user_id))
+            except Exception as e:
+                # The write is committed; versioned keys keep reads correct
+                self._cache_failed('delete', e)
+    
+    def _cache_failed(self, operation: str, error: Exception):
+        self.cache.record_error()
+        logger.warning("Intake cache %s failed, using the database: %s", operation, error)
+    
+    def get_day_version(self, target_date: Union[date, str], user_id: str = DEFAULT_USER_ID) -> int:
+        """The user's write version for a day; it changes whenever the day's intake may have"""
+        return self.db_manager.get_day_version(target_date, user_id)
+    
+    def get_daily_intake(self, target_date: Union[date, str] = None, include_entries: bool = False,
+                         version: Optional[int] = None, user_id: str = DEFAULT_USER_ID) -> Dict:
+        """Summarize a day's intake; entry objects are only loaded when requested
+        
+        Pass the ``version`` read before this call (see get_day_version) to
+        cache the result under that version.
+        """
         if target_date is None:
             target_date = date.today()
+        elif isinstance(target_date, str):
+            target_date = date.fromisoformat(target_date)
         
-        daily_entries = self.db_manager.get_daily_entries(target_date.isoformat())
-        total_calories = sum(entry.calories for entry in daily_entries)
+        if self.cache is None:
+            return self._load_daily_intake(target_date, include_entries, user_id)
         
-        meal_breakdown = {}
-        for meal_type in MealType:
-            meal_calories = sum(
-                entry.calories for entry in daily_entries 
-                if entry.meal_type == meal_type
-            )
-            meal_breakdown[meal_type.value] = round(meal_calories, 1)
+        key = intake_cache_keys(target_date, version, user_id)[1 if include_entries else 0]
+        # An unavailable cache backend counts as a miss, never as a failed read
+        try:
+            intake = self.cache.get(key)
+        except Exception as e:
+            self._cache_failed('get', e)
+            intake = MISSING
+        if intake is MISSING:
+            intake = self._load_daily_intake(target_date, include_entries, user_id)
+            try:
+                self.cache.set(key, intake)
+            except Exception as e:
+                self._cache_failed('set', e)
+        # Shallow copy so callers can't mutate the cached summary
+        return dict(intake)
+    
+    def get_range_intake(self, start_day: date, end_day: date, tdee: Optional[float] = None,
+                         window: int = 7, user_id: str = DEFAULT_USER_ID) -> Dict:
+        """Per-day totals for an inclusive span with trailing rolling averages
         
+        Aggregation happens in the database; Python only walks one row per
+        day and meal. Days without entries appear with zero totals so the
+        series is dense. The first ``window - 1`` averages cover fewer days.
+        """
+        if end_day < start_day:
+            raise ValueError("End date must not be before start date")
+        if window < 1:
+            raise ValueError("Window must be at least 1 day")
+        
+        meal_totals: Dict[date, Dict[str, Tuple[float, int]]] = defaultdict(dict)
+        for day, meal_type, calories, count in self.db_manager.get_range_summary(start_day, end_day, user_id):
+            meal_totals[day][meal_type] = (calories, count)
+        
+        days = []
+        recent = deque()
+        running_total = 0.0
+        span_total = 0.0
+        for offset in range((end_day - start_day).days + 1):
+            day = start_day + timedelta(days=offset)
+            totals = meal_totals.get(day, {})
+            day_total = sum(calories for calories, _ in totals.values())
+            span_total += day_total
+            recent.append(day_total)
+            running_total += day_total
+            if len(recent) > window:
+                running_total -= recent.popleft()
+            rolling_average = running_total / len(recent)
+            
+            summary = self._build_summary(totals)
+            summary['date'] = day.isoformat()
+            summary['rolling_average'] = round(rolling_average, 1)
+            if tdee is not None:
+                summary['vs_tdee'] = round(rolling_average - tdee, 1)
+            days.append(summary)
+        
+        return {
+            'start': start_day.isoformat(),
+            'end': end_day.isoformat(),
+            'window': window,
+            'tdee': tdee,
+            'total_calories': round(span_total, 1),
+            'average_calories': round(span_total / len(days), 1),
+            'days_logged': len(meal_totals),
+            'days': days
+        }
+    
+    def export_entries(self, start_day: date = None, end_day: date = None, chunk_size: int = 2000,
+                       user_id: str = DEFAULT_USER_ID) -> Iterator[Tuple]:
+        """Lazily stream a user's raw entry rows in timestamp order (never cached)"""
+        return self.db_manager.iter_food_entries(start_day, end_day, chunk_size, user_id)
+    
+    def _load_daily_intake(self, target_date: date, include_entries: bool, user_id: str) -> Dict:
+        if not include_entries:
+            # Totals and counts come from the daily_totals rollup
+            meal_totals = self.db_manager.get_daily_summary(target_date.isoformat(), user_id)
+            return self._build_summary(meal_totals)
+        
+        daily_entries = self.db_manager.get_daily_entries(target_date.isoformat(), user_id)
+        meal_totals: Dict[str, Tuple[float, int]] = {}
+        for entry in daily_entries:
+            calories, count = meal_totals.get(entry.meal_type, (0.0, 0))
+            meal_totals[entry.meal_type] = (calories + entry.calories, count + 1)
+        
+        summary = self._build_summary(meal_totals)
+        summary['entries'] = daily_entries
+        return summary
+    
+    @staticmethod
+    def _build_summary(meal_totals: Dict[str, Tuple[float, int]]) -> Dict:
+        """Shape per-meal ``(calories, count)`` totals into the daily summary"""
+        meal_breakdown = {
+            meal_type.value: round(meal_totals.get(meal_type.value, (0.0, 0))[0], 1)
+            for meal_type in MealType
+        }
         return {
-            'total_calories': round(total_calories, 1),
+            'total_calories': round(sum(calories for calories, _ in meal_totals.values()), 1),
             'meal_breakdown': meal_breakdown,
-            'entry_count': len(daily_entries)
+            'entry_count': sum(count for _, count in meal_totals.values())
         }
@@ -0,0 +1,177 @@
+"""
+Write-Behind Entry Buffer
+
+Groups single food-entry writes from concurrent request threads into one
+transaction per batch (group commit). The flush thread commits whatever is
+queued, up to ``max_batch`` entries, and entries arriving during that
+commit form the next batch, so batches grow with load and a lone writer
+never waits. ``max_delay`` optionally lingers that long after a batch's
+first entry to collect more. Callers still block until their batch has
+committed, so an acknowledged entry is durable; what they share is the
+commit and its fsync.
+
+A batch that fails to commit is split in half and each half retried, down
+to single entries, so one invalid entry fails only its own request.
+Failures listed in ``connection_errors`` fail the whole batch at once.
+
+The queue is bounded: when it is full, submitters wait up to
+``submit_timeout`` for space and then get ``WriteBufferFull``. One buffer
+and flush thread run per worker process; ``close`` drains it on shutdown.
+"""
+
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass, asdict
+from typing import Callable, Dict, List, Tuple
+
+from ..metrics import WRITE_BATCH_SIZE
+from ..models.food import FoodEntry
+
+logger = logging.getLogger(__name__)
+
+# Queued after the last entry to stop the flush thread
+_STOP = object()
+
+
+class WriteBufferFull(Exception):
+    """No room in the write-behind queue within the submit timeout"""
+
+
+@dataclass
+class WriteBufferStats:
+    """Counters since the buffer was created (per worker process)"""
+    submitted: int = 0
+    committed: int = 0
+    failed: int = 0
+    rejected: int = 0
+    batches: int = 0
+
+    @property
+    def mean_batch_size(self) -> float:
+        return round((self.committed + self.failed) / self.batches, 2) if self.batches else 0.0
+
+    def to_dict(self) -> Dict[str, float]:
+        return {**asdict(self), 'mean_batch_size': self.mean_batch_size}
+
+
+class GroupCommitWriter:
+    """Bounded queue of entries flushed by one background thread through ``save_batch``"""
+
+    def __init__(self, save_batch: Callable[[List[FoodEntry]], List[int]], max_batch: int = 200,
+                 max_delay: float = 0.0, max_queue: int = 2000, submit_timeout: float = 1.0,
+                 connection_errors: Tuple[type, ...] = (ConnectionError, TimeoutError)):
+        self.save_batch = save_batch
+        self.connection_errors = connection_errors
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.submit_timeout = submit_timeout
+        self.stats = WriteBufferStats()
+        self._stats_lock = threading.Lock()
+        self._queue: "queue.Queue" = queue.Queue(max_queue)
+        # Held from the closed check to the put, and by close() while it queues _STOP,
+        # so no entry can land behind _STOP where nothing would resolve it
+        self._submit_lock = threading.Lock()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name='write-behind', daemon=True)
+        self._thread.start()
+
+    @property
+    def depth(self) -> int:
+        """Entries waiting for a batch"""
+        return self._queue.qsize()
+
+    def submit(self, entry: FoodEntry) -> Future:
+        """Queue an entry; the future resolves to its id once the batch commits"""
+        future: Future = Future()
+        deadline = time.monotonic() + self.submit_timeout
+        # Submitters waiting for space queue up on the lock, all within submit_timeout
+        if not self._submit_lock.acquire(timeout=self.submit_timeout):
+            self._reject()
+        try:
+            if self._closed:
+                raise RuntimeError("Write buffer is closed")
+            try:
+                self._queue.put((entry, future), timeout=max(deadline - time.monotonic(), 0))
+            except queue.Full:
+                self._reject()
+        finally:
+            self._submit_lock.release()
+        self._count('submitted')
+        return future
+
+    def _reject(self):
+        self._count('rejected')
+        raise WriteBufferFull(f"Write buffer full ({self._queue.maxsize} entries queued)")
+
+    def write(self, entry: FoodEntry) -> int:
+        """Queue an entry and wait until it is committed; returns its id
+        
+        No timeout: the flush thread resolves every accepted entry (commit,
+        failure or close), and giving up earlier would report a failure
+        for an entry that still commits.
+        """
+        return self.submit(entry).result()
+
+    def close(self, timeout: float = 30.0):
+        """Stop accepting entries, commit everything queued and stop the thread"""
+        with self._submit_lock:
+            if self._closed:
+                return
+            self._closed = True
+            # Every accepted entry is ahead of _STOP, so the flush thread resolves it
+            self._queue.put(_STOP)
+        self._thread.join(timeout)
+        if self._thread.is_alive():
+            logger.warning("Write buffer still flushing after %.0fs", timeout)
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is _STOP:
+                break
+            batch = [item]
+            deadline = time.monotonic() + self.max_delay
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                try:
+                    # Past the deadline, still take whatever is already queued
+                    item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+            self._flush(batch)
+
+    def _flush(self, batch: List[Tuple[FoodEntry, Future]]):
+        self._count('batches')
+        WRITE_BATCH_SIZE.observe(len(batch))
+        self._commit(batch)
+
+    def _commit(self, batch: List[Tuple[FoodEntry, Future]]):
+        try:
+            entry_ids = self.save_batch([entry for entry, _ in batch])
+        except Exception as e:
+            if len(batch) > 1 and not isinstance(e, self.connection_errors):
+                # One transaction per batch: halve it until the bad entry is alone
+                middle = len(batch) // 2
+                self._commit(batch[:middle])
+                self._commit(batch[middle:])
+                return
+            logger.exception("Write-behind batch of %d entries failed", len(batch))
+            self._count('failed', len(batch))
+            for _, future in batch:
+                future.set_exception(e)
+            return
+        self._count('committed', len(batch))
+        for (_, future), entry_id in zip(batch, entry_ids):
+            future.set_result(entry_id)
+
+    def _count(self, field: str, amount: int = 1):
+        with self._stats_lock:
+            setattr(self.stats, field, getattr(self.stats, field) + amount)
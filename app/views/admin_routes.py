@@ -0,0 +1,51 @@
+"""
+Admin Routes
+
+Operational endpoints for maintainers. Every route requires
+``Authorization: Bearer <ADMIN_TOKEN>``; without an ADMIN_TOKEN configured
+the blueprint answers 404 so nothing is exposed by default.
+"""
+
+import hmac
+
+from flask import Blueprint, Response, abort, current_app, jsonify, request
+
+from app.profiling import folded, get_profiler
+
+admin_bp = Blueprint('admin', __name__, url_prefix='/admin')
+
+
+@admin_bp.before_request
+def require_admin_token():
+    token = current_app.config.get('ADMIN_TOKEN')
+    if not token:
+        abort(404)
+    supplied = request.headers.get('Authorization', '')
+    if not hmac.compare_digest(supplied.encode(), f"Bearer {token}".encode()):
+        return jsonify({'error': 'Unauthorized'}), 401
+
+
+def profile_store():
+    profiler = get_profiler(current_app)
+    if profiler is None:
+        abort(404)
+    return profiler.store
+
+
+@admin_bp.route('/profiles', methods=['GET'])
+def list_profiles():
+    """Stored slow-request profiles, newest first (stacks omitted)"""
+    return jsonify(profile_store().list())
+
+
+@admin_bp.route('/profiles/<profile_id>', methods=['GET'])
+def download_profile(profile_id):
+    """One profile as JSON, or collapsed stacks with ?format=folded"""
+    profile = profile_store().load(profile_id)
+    if profile is None:
+        return jsonify({'error': 'Profile not found'}), 404
+    if request.args.get('format') == 'folded':
+        return Response(folded(profile), content_type='text/plain; charset=utf-8', headers={
+            'Content-Disposition': f'attachment; filename="{profile_id}.folded"'
+        })
+    return jsonify(profile)
@@ -5,24 +5,73 @@ RESTful API endpoints that serve JSON data to the React application.
 Handles CORS and provides clean API responses.
 """
 
-from flask import Blueprint, request, jsonify
+import itertools
+from typing import Optional, Tuple
+
+from flask import Blueprint, Response, request, jsonify, current_app, stream_with_context
 from flask_cors import CORS
 from datetime import datetime, date
 
 from app.models.user import User, Gender, ActivityLevel
-from app.models.food import FoodItem, FoodEntry, MealType
-from app.services.calorie_calculator import CalorieCalculatorService
-from app.services.food_tracker import FoodTrackingService
-from app.database.food_data import FoodDatabase
+from app.models.food import FoodItem, FoodEntry, MealType, validate_user_id
+from app.extensions import get_service
+from app.metrics import PHASE_LATENCY
+from app.services.bmr_formulas import BMR_FORMULAS, DEFAULT_FORMULA
+from app.services.export import EXPORT_FORMATS, export_chunks
+from app.services.write_buffer import WriteBufferFull
 
 # Create API Blueprint
 api_bp = Blueprint('api', __name__, url_prefix='/api')
 CORS(api_bp)  # Enable CORS for React frontend
 
-# Initialize services
-calculator = CalorieCalculatorService()
-food_tracker = FoodTrackingService()
-food_db = FoodDatabase()
+# Services are built on first use per app (see app.extensions), so importing
+# this module never connects to a database.
+
+# Entries change with every write: clients keep them but must revalidate
+ENTRIES_CACHE_CONTROL = 'private, no-cache'
+
+# Set by the authenticating proxy in front of the API; food entries are
+# scoped to it. Without it requests fall back to DEFAULT_USER_ID.
+USER_HEADER = 'X-User-Id'
+
+
+def current_user_id() -> str:
+    """Owner of the request's food entries"""
+    user_id = request.headers.get(USER_HEADER) or current_app.config.get('DEFAULT_USER_ID')
+    if not user_id:
+        raise ValueError(f"Missing {USER_HEADER} header")
+    return validate_user_id(user_id)
+
+
+def not_modified(etag: str, cache_control: str, vary: str = None) -> Optional[Response]:
+    """A bodiless 304 when the request's If-None-Match already holds ``etag``"""
+    if not request.if_none_match.contains(etag):
+        return None
+    response = Response(status=304)
+    return tagged(response, etag, cache_control, vary)
+
+
+def tagged(response: Response, etag: str, cache_control: str, vary: str = None) -> Response:
+    """Attach a strong ETag and Cache-Control (and Vary) to a response"""
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = cache_control
+    if vary:
+        response.vary.add(vary)
+    return response
+
+
+def parse_user(data) -> User:
+    """Build a validated User from a JSON payload or query string"""
+    age = int(data['age'])
+    gender = Gender.MALE if data['gender'] == 'male' else Gender.FEMALE
+    weight = float(data['weight'])
+    height = float(data['height'])
+    activity_level = ActivityLevel(float(data['activity_level']))
+    body_fat = data.get('body_fat_percentage')
+    body_fat = float(body_fat) if body_fat is not None else None
+    
+    with PHASE_LATENCY.time('validate'):
+        return User(age, gender, weight, height, activity_level, body_fat)
 
 
 @api_bp.route('/calculate', methods=['POST'])
@@ -32,52 +81,196 @@ def calculate_calories():
         data = request.get_json()
         
         # Create user object
-        age = int(data['age'])
-        gender = Gender.MALE if data['gender'] == 'male' else Gender.FEMALE
-        weight = float(data['weight'])
-        height = float(data['height'])
-        activity_level = ActivityLevel(float(data['activity_level']))
-        
-        user = User(age, gender, weight, height, activity_level)
-        results = calculator.calculate_daily_calories(user)
+        user = parse_user(data)
+        formula = data.get('formula') or DEFAULT_FORMULA
+        results = get_service('calculator').calculate_daily_calories(user, formula)
         
         return jsonify({
-            'bmr': results.bmr,
-            'tdee': results.tdee,
-            'weight_loss': getattr(results, 'weight_loss', None),
-            'weight_gain': getattr(results, 'weight_gain', None)
+            'bmr': results['bmr'],
+            'tdee': results['tdee'],
+            'weight_loss': results.get('weight_loss'),
+            'weight_gain': results.get('weight_gain'),
+            'formula': formula
         })
         
     except Exception as e:
         return jsonify({'error': str(e)}), 400
 
 
+@api_bp.route('/formulas', methods=['GET'])
+def list_formulas():
+    """List BMR formulas accepted by the calculate endpoints"""
+    return jsonify([
+        {'name': formula.name, 'label': formula.label, 'requires_body_fat': formula.requires_lean_mass}
+        for formula in BMR_FORMULAS.values()
+    ])
+
+
+@api_bp.route('/calculate/batch', methods=['POST'])
+def calculate_calories_batch():
+    """Calculate BMR and TDEE for a cohort given as columnar arrays"""
+    try:
+        data = request.get_json()
+        columns = [data[field] for field in ('age', 'gender', 'weight', 'height', 'activity_level')]
+        if not all(isinstance(column, list) for column in columns):
+            raise ValueError("Each field must be a list")
+        max_rows = current_app.config.get('CALCULATE_BATCH_MAX_ROWS', 100000)
+        if len(columns[0]) > max_rows:
+            raise ValueError(f"Batch exceeds {max_rows} rows")
+        
+        results = get_service('calculator').calculate_batch(
+            *columns,
+            body_fat_percentages=data.get('body_fat_percentage'),
+            formula=data.get('formula') or DEFAULT_FORMULA
+        )
+        return jsonify(results)
+        
+    except Exception as e:
+        return jsonify({'error': describe_error(e)}), 400
+
+
 @api_bp.route('/food-entries', methods=['GET'])
 def get_food_entries():
     """Get food entries for a specific date"""
     try:
         date_str = request.args.get('date', date.today().isoformat())
-        intake = food_tracker.get_daily_intake(date_str)
-        
-        entries_data = []
-        for entry in intake.entries if intake else []:
-            entries_data.append({
-                'food_name': entry.food_item.name,
-                'calories_per_100g': entry.food_item.calories_per_100g,
-                'quantity_grams': entry.food_item.quantity_grams,
-                'meal_type': entry.meal_type.value,
-                'calories': entry.calculate_calories(),
-                'timestamp': entry.timestamp.isoformat()
-            })
+        # ?entries=false returns only the aggregated summary
+        include_entries = request.args.get('entries', 'true').lower() != 'false'
+        day = date.fromisoformat(date_str)
+        user_id = current_user_id()
+        food_tracker = get_service('food_tracker')
         
-        return jsonify({
-            'entries': entries_data,
-            'total_calories': intake.total_calories if intake else 0,
+        # Read the version before the data: a write in between leaves an
+        # older tag on newer data, never the other way round
+        version = food_tracker.get_day_version(day, user_id)
+        etag = f"entries-{user_id}-{day.isoformat()}-v{version}-{'full' if include_entries else 'summary'}"
+        cached = not_modified(etag, ENTRIES_CACHE_CONTROL, USER_HEADER)
+        if cached is not None:
+            return cached
+        
+        intake = food_tracker.get_daily_intake(day, include_entries, version=version, user_id=user_id)
+        
+        # FoodEntryRow dataclasses serialize directly (see app.serialization)
+        return tagged(jsonify({
+            'entries': intake.get('entries', []),
+            'total_calories': intake['total_calories'],
+            'meal_breakdown': intake['meal_breakdown'],
+            'entry_count': intake['entry_count'],
             'date': date_str
-        })
+        }), etag, ENTRIES_CACHE_CONTROL, USER_HEADER)
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 400
+
+
+@api_bp.route('/food-entries/range', methods=['GET'])
+def get_food_entries_range():
+    """Per-day totals and rolling averages for ``start``..``end`` (inclusive)
+    
+    Pass ``tdee`` directly, or the /calculate user fields as query
+    parameters, to compare rolling averages against the user's TDEE.
+    """
+    try:
+        user_id = current_user_id()
+        start_day = date.fromisoformat(request.args['start'])
+        end_day = date.fromisoformat(request.args.get('end', date.today().isoformat()))
+        window = int(request.args.get('window', 7))
+        max_days = current_app.config.get('RANGE_MAX_DAYS', 3660)
+        if (end_day - start_day).days + 1 > max_days:
+            raise ValueError(f"Range exceeds {max_days} days")
+        
+        tdee = request.args.get('tdee', type=float)
+        if tdee is None and 'age' in request.args:
+            user = parse_user(request.args)
+            formula = request.args.get('formula') or DEFAULT_FORMULA
+            tdee = get_service('calculator').calculate_daily_calories(user, formula)['tdee']
+        
+        return jsonify(get_service('food_tracker').get_range_intake(
+            start_day, end_day, tdee, window, user_id))
         
+    except Exception as e:
+        return jsonify({'error': describe_error(e)}), 400
+
+
+@api_bp.route('/food-entries/export', methods=['GET'])
+def export_food_entries():
+    """Stream the entry history as NDJSON (default) or CSV, optionally within start..end"""
+    try:
+        user_id = current_user_id()
+        fmt = request.args.get('format', 'ndjson')
+        if fmt not in EXPORT_FORMATS:
+            raise ValueError(f"Unsupported export format: {fmt}. Choose from {', '.join(EXPORT_FORMATS)}")
+        start_day = request.args.get('start')
+        end_day = request.args.get('end')
+        start_day = date.fromisoformat(start_day) if start_day else None
+        end_day = date.fromisoformat(end_day) if end_day else None
     except Exception as e:
         return jsonify({'error': str(e)}), 400
+    
+    # A stream holds its pooled connection until the download finishes, so
+    # cap running exports to leave connections for ordinary requests
+    slots = get_service('export_slots')
+    if not slots.acquire(blocking=False):
+        return jsonify({'error': "Too many exports in progress; try again shortly"}), 503, {'Retry-After': '5'}
+    try:
+        rows = get_service('food_tracker').export_entries(
+            start_day, end_day, current_app.config.get('EXPORT_CHUNK_SIZE', 2000), user_id)
+        # Pull the first row now so connection and query errors become a 500
+        # instead of a truncated 200 stream
+        first = list(itertools.islice(rows, 1))
+    except Exception:
+        slots.release()
+        raise
+    body = export_chunks(itertools.chain(first, rows), fmt)
+    response = Response(stream_with_context(body), mimetype=EXPORT_FORMATS[fmt], headers={
+        'Content-Disposition': f'attachment; filename="food-entries.{fmt}"'
+    })
+    # Runs when the server closes the response: finished, failed or abandoned
+    response.call_on_close(slots.release)
+    return response
+
+
+def resolve_food(data: dict) -> Tuple[str, float]:
+    """``(name, calories_per_100g)`` from the payload or the catalog
+    
+    ``food_id`` always resolves through the catalog; ``food_name`` does when
+    the client leaves out ``calories_per_100g`` (custom foods send it).
+    """
+    if 'food_id' not in data and data.get('calories_per_100g') is not None:
+        return data['food_name'], float(data['calories_per_100g'])
+    food_db = get_service('food_db')
+    if 'food_id' in data:
+        food = food_db.lookup_food(food_id=int(data['food_id']))
+        reference = f"id {data['food_id']}"
+    else:
+        food = food_db.lookup_food(name=data['food_name'])
+        reference = repr(data['food_name'])
+    if food is None:
+        raise ValueError(f"Unknown food {reference}; send calories_per_100g for foods outside the catalog")
+    return food['name'], food['calories_per_100g']
+
+
+def parse_food_entry(data: dict, user_id: str) -> FoodEntry:
+    """Build a validated FoodEntry owned by ``user_id`` from a JSON payload"""
+    name, calories_per_100g = resolve_food(data)
+    food_item = FoodItem(name, calories_per_100g, float(data['quantity']))
+    
+    meal_type = MealType(data['meal_type'])
+    
+    # Handle timestamp
+    if 'timestamp' in data:
+        timestamp = datetime.fromisoformat(data['timestamp'])
+    else:
+        timestamp = datetime.now()
+    
+    return FoodEntry(meal_type, food_item, timestamp, user_id)
+
+
+def describe_error(error: Exception) -> str:
+    """Readable message for validation errors (KeyError only carries the key)"""
+    if isinstance(error, KeyError):
+        return f"Missing field: {error.args[0]}"
+    return str(error)
 
 
 @api_bp.route('/food-entries', methods=['POST'])
@@ -85,32 +278,74 @@ def add_food_entry():
     """Add a new food entry"""
     try:
         data = request.get_json()
+        user_id = current_user_id()
         
         # Create food entry
-        food_item = FoodItem(
-            data['food_name'],
-            float(data['calories_per_100g']),
-            float(data['quantity'])
-        )
-        
-        meal_type = MealType(data['meal_type'])
-        
-        # Handle timestamp
-        if 'timestamp' in data:
-            timestamp = datetime.fromisoformat(data['timestamp'])
-        else:
-            timestamp = datetime.now()
-        
-        entry = FoodEntry(meal_type, food_item, timestamp)
-        food_tracker.add_food_entry(entry)
+        with PHASE_LATENCY.time('validate'):
+            entry = parse_food_entry(data, user_id)
+        entry_id = get_service('food_tracker').add_food_entry(entry)
         
         return jsonify({
             'message': 'Food entry added successfully',
+            'id': entry_id,
             'calories': entry.calculate_calories()
         })
         
+    except WriteBufferFull as e:
+        # Backpressure: the worker's write-behind queue stayed full
+        return jsonify({'error': str(e)}), 503, {'Retry-After': '1'}
     except Exception as e:
-        return jsonify({'error': str(e)}), 400
+        return jsonify({'error': describe_error(e)}), 400
+
+
+@api_bp.route('/food-entries/batch', methods=['POST'])
+def add_food_entries():
+    """Add many food entries in a single transaction"""
+    try:
+        user_id = current_user_id()
+        data = request.get_json()
+        items = data['entries'] if isinstance(data, dict) else data
+        if not isinstance(items, list):
+            raise ValueError("entries must be a list")
+        max_entries = current_app.config.get('BATCH_MAX_ENTRIES', 5000)
+        if len(items) > max_entries:
+            raise ValueError(f"Batch exceeds {max_entries} entries")
+    except Exception as e:
+        return jsonify({'error': describe_error(e)}), 400
+    
+    # Validate every item up front; only valid entries are written
+    results = []
+    valid_entries = []
+    valid_results = []
+    with PHASE_LATENCY.time('validate'):
+        for index, item in enumerate(items):
+            try:
+                if not isinstance(item, dict):
+                    raise ValueError("Entry must be an object")
+                entry = parse_food_entry(item, user_id)
+            except Exception as e:
+                results.append({'index': index, 'error': describe_error(e)})
+                continue
+            result = {'index': index, 'calories': entry.calculate_calories()}
+            results.append(result)
+            valid_entries.append(entry)
+            valid_results.append(result)
+    
+    try:
+        entry_ids = get_service('food_tracker').add_food_entries(valid_entries)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+    
+    for result, entry_id in zip(valid_results, entry_ids):
+        result['id'] = entry_id
+    
+    failed = len(results) - len(valid_entries)
+    status = 400 if failed and not valid_entries else 200
+    return jsonify({
+        'results': results,
+        'inserted': len(entry_ids),
+        'failed': failed
+    }), status
 
 
 @api_bp.route('/search-food', methods=['GET'])
@@ -121,8 +356,33 @@ def search_food():
         if len(query) < 2:
             return jsonify([])
         
-        foods = food_db.search_food(query)
-        return jsonify(foods[:10])  # Limit to 10 results
+        category = request.args.get('category') or None
+        food_db = get_service('food_db')
+        # The catalog rarely changes; let clients reuse results, then revalidate
+        cache_control = f"public, max-age={current_app.config.get('SEARCH_CACHE_MAX_AGE', 300)}"
+        etag = f"catalog-{food_db.search_engine_name}-v{food_db.search_version()}"
+        cached = not_modified(etag, cache_control)
+        if cached is not None:
+            return cached
+        
+        foods = food_db.search_food(query, limit=10, category=category)
+        return tagged(jsonify(foods), etag, cache_control)
         
     except Exception as e:
         return jsonify({'error': str(e)}), 400
+
+
+@api_bp.route('/stats', methods=['GET'])
+def get_stats():
+    """Connection pool, cache and write buffer counters for this worker process"""
+    food_tracker = get_service('food_tracker')
+    food_cache = get_service('food_db').food_cache
+    cache = food_tracker.cache
+    pool = food_tracker.db_manager.pool
+    writer = food_tracker.writer
+    return jsonify({
+        'db_pool': pool.stats.to_dict() if pool else None,
+        'intake_cache': cache.stats.to_dict() if cache else None,
+        'food_cache': food_cache.stats.to_dict() if food_cache else None,
+        'write_buffer': {**writer.stats.to_dict(), 'depth': writer.depth} if writer else None
+    })
@@ -0,0 +1,172 @@
+"""
+API Benchmark Suite
+
+Measures /api/calculate, /api/food-entries (GET and POST) and
+/api/search-food through the Flask test client (in-process, no network)
+and through a real gunicorn process. Food entries live in the in-memory
+stand-in by default or in a scratch PostgreSQL schema; either way they are
+seeded at the requested scale. Results are JSON; with ``--baseline`` the
+run is compared against a previous ``--output`` file and exits non-zero on
+a regression.
+
+Usage:
+    python -m benchmarks.bench_api --entries 50000 --days 30 --output bench.json
+    DATABASE_URL=postgresql://... python -m benchmarks.bench_api --database postgres --baseline bench.json
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import timedelta
+from typing import Dict, Iterator, List, Tuple
+
+from app import create_app
+from app.database.memory import SEED_START, synthetic_entries
+from benchmarks.common import report, scratch_database, summarize, SCRATCH_SCHEMA
+from benchmarks.load_test import Request, gunicorn_server, run_load
+from config.settings import Config
+
+# Writes go to the day before the seeded range so GET results stay stable
+POST_DAY = SEED_START - timedelta(days=1)
+
+SCENARIOS: Dict[str, Request] = {
+    'calculate': Request('POST', '/api/calculate', json.dumps({
+        'age': 30, 'gender': 'male', 'weight': 80, 'height': 180, 'activity_level': 1.55
+    }).encode()),
+    'food_entries_get': Request('GET', f'/api/food-entries?date={SEED_START.isoformat()}'),
+    'food_entries_post': Request('POST', '/api/food-entries', json.dumps({
+        'food_name': 'Apple', 'calories_per_100g': 52, 'quantity': 150,
+        'meal_type': 'snack', 'timestamp': f'{POST_DAY.isoformat()}T10:00:00'
+    }).encode()),
+    'food_entries_range': Request('GET', f'/api/food-entries/range?start={SEED_START.isoformat()}'
+                                         f'&end={(SEED_START + timedelta(days=29)).isoformat()}&tdee=2200'),
+    'search_food': Request('GET', '/api/search-food?q=chicken'),
+}
+
+# Relative change that counts as a regression when comparing to a baseline
+REGRESSION_METRICS = {'p50_ms': 1, 'p99_ms': 1, 'requests_per_second': -1}
+
+
+def with_search_path(db_url: str, schema: str) -> str:
+    separator = '&' if '?' in db_url else '?'
+    return f"{db_url}{separator}options=-csearch_path%3D{schema}"
+
+
+@contextmanager
+def seeded_database(kind: str, entries: int, days: int) -> Iterator[str]:
+    """Yield a DATABASE_URL holding ``entries`` synthetic entries over ``days`` days"""
+    if kind == 'memory':
+        # Every process seeds the same deterministic log from the URL
+        yield f'memory://?entries={entries}&days={days}'
+        return
+    with scratch_database() as db:
+        db.save_food_entries(list(synthetic_entries(entries, days)))
+        yield with_search_path(db.db_url, SCRATCH_SCHEMA)
+
+
+def bench_client(app, scenario: Request, requests: int, warmup: int = 20) -> Dict:
+    """Sequential requests through the Flask test client"""
+    client = app.test_client()
+    kwargs = {'data': scenario.body, 'content_type': 'application/json'} if scenario.body else {}
+
+    def send():
+        response = client.open(scenario.path, method=scenario.method, **kwargs)
+        if response.status_code != 200:
+            raise RuntimeError(f"{scenario.method} {scenario.path}: {response.status_code} {response.data[:200]}")
+
+    for _ in range(warmup):
+        send()
+    samples = []
+    started = time.perf_counter()
+    for _ in range(requests):
+        start = time.perf_counter()
+        send()
+        samples.append(time.perf_counter() - start)
+    elapsed = time.perf_counter() - started
+    return {**summarize(samples), 'requests_per_second': round(requests / elapsed, 1)}
+
+
+def compare(results: Dict, baseline: Dict, tolerance: float) -> List[Tuple[str, float, float]]:
+    """Return ``(metric path, baseline, current)`` for every metric worse than tolerance"""
+    regressions = []
+    for mode, scenarios in results.items():
+        for scenario, metrics in scenarios.items():
+            previous = baseline.get(mode, {}).get(scenario, {})
+            for metric, direction in REGRESSION_METRICS.items():
+                old, new = previous.get(metric), metrics.get(metric)
+                if not old or new is None:
+                    continue
+                change = (new - old) / old * direction
+                if change > tolerance:
+                    regressions.append((f"{mode}.{scenario}.{metric}", old, new))
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--database', choices=('memory', 'postgres'), default='memory')
+    parser.add_argument('--entries', type=int, default=10000, help="seeded food entries")
+    parser.add_argument('--days', type=int, default=30, help="days the seeded entries span")
+    parser.add_argument('--mode', action='append', choices=('client', 'gunicorn'),
+                        help="default: both")
+    parser.add_argument('--scenario', action='append', choices=sorted(SCENARIOS), help="default: all")
+    parser.add_argument('--requests', type=int, default=2000, help="test client requests per scenario")
+    parser.add_argument('--worker-class', choices=('sync', 'gthread'), default='gthread')
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--duration', type=float, default=5.0, help="gunicorn seconds per scenario")
+    parser.add_argument('--output', help="write results JSON here")
+    parser.add_argument('--baseline', help="results JSON from an earlier run to compare against")
+    parser.add_argument('--tolerance', type=float, default=0.2, help="allowed relative slowdown")
+    args = parser.parse_args()
+
+    modes = args.mode or ['client', 'gunicorn']
+    scenarios = {name: SCENARIOS[name] for name in (args.scenario or SCENARIOS)}
+    results: Dict[str, Dict] = {}
+
+    with tempfile.TemporaryDirectory() as workdir, \
+            seeded_database(args.database, args.entries, args.days) as db_url:
+        food_db_path = os.path.join(workdir, 'foods.db')
+
+        class BenchConfig(Config):
+            DATABASE_URL = db_url
+            FOOD_DB_PATH = food_db_path
+
+        app = create_app(BenchConfig)
+        app.test_cli_runner().invoke(args=['init-db', '--skip-postgres'])
+
+        if 'client' in modes:
+            results['client'] = {
+                name: bench_client(app, scenario, args.requests) for name, scenario in scenarios.items()
+            }
+        if 'gunicorn' in modes:
+            env = {'DATABASE_URL': db_url, 'FOOD_DB_PATH': food_db_path, 'FLASK_ENV': 'production'}
+            with gunicorn_server(args.worker_class, args.workers, env=env) as url:
+                results['gunicorn'] = {
+                    name: run_load(url, [scenario], args.concurrency, args.duration)
+                    for name, scenario in scenarios.items()
+                }
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+    report('api', {
+        'database': args.database, 'entries': args.entries, 'days': args.days,
+        'worker_class': args.worker_class, 'concurrency': args.concurrency, **results
+    })
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for metric, old, new in regressions:
+            print(f"REGRESSION {metric}: {old} -> {new}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
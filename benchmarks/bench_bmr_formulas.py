@@ -0,0 +1,49 @@
+"""
+BMR Formula Microbenchmarks
+
+Per-formula cost of the shared table kernel: nanoseconds per scalar
+calculate_bmr call and per row of calculate_bmr_batch.
+
+Usage:
+    python -m benchmarks.bench_bmr_formulas --rows 100000
+"""
+
+import argparse
+import timeit
+
+import numpy as np
+
+from app.models.user import User, Gender, ActivityLevel
+from app.services.calorie_calculator import BMR_CALCULATORS
+from benchmarks.common import report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rows', type=int, default=100_000)
+    parser.add_argument('--number', type=int, default=100_000, help="scalar calls per timing")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(3)
+    ages = np.trunc(rng.uniform(1, 100, args.rows))
+    is_male = rng.random(args.rows) < 0.5
+    weights = rng.uniform(10, 150, args.rows)
+    heights = rng.uniform(80, 210, args.rows)
+    body_fat = rng.uniform(8, 40, args.rows)
+    user = User(35, Gender.FEMALE, 65.0, 168.0, ActivityLevel.MODERATELY_ACTIVE, 24.0)
+
+    results = {}
+    for name, calculator in BMR_CALCULATORS.items():
+        scalar = min(timeit.repeat(lambda: calculator.calculate_bmr(user), number=args.number, repeat=3))
+        batch = min(timeit.repeat(
+            lambda: calculator.calculate_bmr_batch(ages, is_male, weights, heights, body_fat),
+            number=5, repeat=3)) / 5
+        results[name] = {
+            'scalar_ns_per_call': round(scalar / args.number * 1e9, 1),
+            'batch_ns_per_row': round(batch / args.rows * 1e9, 2),
+        }
+    report('bmr_formulas', results)
+
+
+if __name__ == '__main__':
+    main()
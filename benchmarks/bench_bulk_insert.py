@@ -0,0 +1,55 @@
+"""
+Bulk Insert Benchmark
+
+Compares entries/second of the single-row save_food_entry path (one INSERT
+and one commit per entry) against save_food_entries (multi-row VALUES in
+one transaction) on a scratch schema.
+
+Usage:
+    DATABASE_URL=postgresql://... python -m benchmarks.bench_bulk_insert --entries 5000
+"""
+
+import argparse
+import time
+from datetime import datetime, timedelta
+
+from app.models.food import FoodEntry, FoodItem, MealType
+from benchmarks.common import scratch_database, report
+
+
+def make_entries(count: int):
+    meals = list(MealType)
+    start = datetime(2024, 1, 1, 8)
+    return [
+        FoodEntry(meals[i % len(meals)], FoodItem(f"Food {i % 100}", 50 + i % 300, 100), start + timedelta(minutes=i))
+        for i in range(count)
+    ]
+
+
+def throughput(func, count: int) -> dict:
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    return {'seconds': round(elapsed, 3), 'entries_per_second': round(count / elapsed, 1)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--entries', type=int, default=5000)
+    parser.add_argument('--page-size', type=int, default=1000)
+    args = parser.parse_args()
+
+    entries = make_entries(args.entries)
+    with scratch_database() as db:
+        single = throughput(lambda: [db.save_food_entry(entry) for entry in entries], args.entries)
+        batched = throughput(lambda: db.save_food_entries(entries, page_size=args.page_size), args.entries)
+        report('bulk_insert', {
+            'entries': args.entries,
+            'single_insert': single,
+            'batch_insert': batched,
+            'speedup': round(batched['entries_per_second'] / single['entries_per_second'], 1),
+        })
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+"""
+Batch Calorie Calculation Benchmark
+
+Compares a scalar loop over CalorieCalculatorService.calculate_daily_calories
+(one User per row, as cohort dashboards did over HTTP) with the vectorized
+calculate_batch path.
+
+Usage:
+    python -m benchmarks.bench_calculate_batch --rows 1000 10000 100000
+"""
+
+import argparse
+import random
+
+from app.models.user import User, Gender, ActivityLevel
+from app.services.calorie_calculator import CalorieCalculatorService
+from benchmarks.common import time_calls, report
+
+
+def cohort(rows: int, seed: int = 1):
+    rng = random.Random(seed)
+    levels = [level.value for level in ActivityLevel]
+    return {
+        'ages': [rng.randint(18, 90) for _ in range(rows)],
+        'genders': [rng.choice(['male', 'female']) for _ in range(rows)],
+        'weights': [round(rng.uniform(40, 150), 1) for _ in range(rows)],
+        'heights': [round(rng.uniform(140, 210), 1) for _ in range(rows)],
+        'activity_levels': [rng.choice(levels) for _ in range(rows)],
+    }
+
+
+def scalar_loop(service: CalorieCalculatorService, data: dict):
+    return [
+        service.calculate_daily_calories(User(age, Gender(gender), weight, height, ActivityLevel(level)))
+        for age, gender, weight, height, level in zip(
+            data['ages'], data['genders'], data['weights'], data['heights'], data['activity_levels'])
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rows', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    service = CalorieCalculatorService()
+    results = {}
+    for rows in args.rows:
+        data = cohort(rows)
+        scalar = time_calls(lambda: scalar_loop(service, data), repeat=args.repeat, warmup=1)
+        batch = time_calls(lambda: service.calculate_batch(**data), repeat=args.repeat, warmup=1)
+        results[rows] = {
+            'scalar_loop': scalar,
+            'vectorized': batch,
+            'speedup': round(scalar['p50_ms'] / batch['p50_ms'], 1),
+        }
+    report('calculate_batch', results)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+"""
+Daily Entries Benchmark
+
+Seeds ``food_entries`` with millions of rows in a scratch schema and compares
+the old ``DATE(timestamp) = %s`` lookup against the indexed half-open range
+query used by DatabaseManager.get_daily_entries. Rows are spread over
+``--users`` owners and moved into monthly partitions, so the "after" plan
+should prune to one partition and use idx_food_entries_user_timestamp.
+
+Usage:
+    DATABASE_URL=postgresql://... python -m benchmarks.bench_daily_entries --rows 2000000
+"""
+
+import argparse
+from datetime import date, timedelta
+
+from app.database.models import DatabaseManager
+from benchmarks.common import scratch_database, time_calls, report
+
+OLD_DAILY_QUERY = """
+    SELECT food_name, calories_per_100g, quantity_grams, meal_type, timestamp
+    FROM food_entries
+    WHERE DATE(timestamp) = %s
+    ORDER BY timestamp
+"""
+
+
+def seed(db: DatabaseManager, rows: int, days: int, users: int = 1) -> None:
+    """Generate ``rows`` entries over ``days`` days and ``users`` owners server-side"""
+    with db.get_connection() as conn:
+        with conn.cursor() as cursor:
+            cursor.execute("TRUNCATE food_entries")
+            cursor.execute("""
+                INSERT INTO food_entries
+                (user_id, food_name, calories_per_100g, quantity_grams, meal_type, timestamp)
+                SELECT CASE WHEN n %% %s = 0 THEN 'default' ELSE 'user-' || (n %% %s) END,
+                       'Food ' || (n %% 500),
+                       50 + (n %% 400),
+                       50 + (n %% 250),
+                       (ARRAY['breakfast', 'lunch', 'dinner', 'snack'])[1 + n %% 4],
+                       TIMESTAMP '2020-01-01' + (n::float / %s * %s) * INTERVAL '1 day'
+                FROM generate_series(0, %s - 1) AS n
+            """, (users, users, rows, days, rows))
+        conn.commit()
+    # Rows land in the DEFAULT partition; split them out by month
+    db.ensure_partitions()
+    with db.get_connection() as conn:
+        with conn.cursor() as cursor:
+            cursor.execute("ANALYZE food_entries")
+        conn.commit()
+
+
+def explain(db: DatabaseManager, sql: str, params) -> str:
+    with db.get_connection() as conn:
+        with conn.cursor() as cursor:
+            cursor.execute("EXPLAIN " + sql, params)
+            return cursor.fetchall()[0][0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rows', type=int, default=2_000_000)
+    parser.add_argument('--days', type=int, default=1825)
+    parser.add_argument('--users', type=int, default=1, help="entry owners; reads are for 'default'")
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--keep', action='store_true', help="keep the scratch schema")
+    args = parser.parse_args()
+
+    with scratch_database(keep=args.keep) as db:
+        seed(db, args.rows, args.days, args.users)
+        day = date(2020, 1, 1) + timedelta(days=args.days // 2)
+        start, end = day.isoformat(), (day + timedelta(days=1)).isoformat()
+
+        def old_query():
+            with db.get_connection() as conn:
+                with conn.cursor() as cursor:
+                    cursor.execute(OLD_DAILY_QUERY, (day.isoformat(),))
+                    cursor.fetchall()
+
+        report('daily_entries', {
+            'rows': args.rows,
+            'rows_per_day': args.rows // args.days,
+            'users': args.users,
+            'before': {
+                'plan': explain(db, OLD_DAILY_QUERY, (day.isoformat(),)),
+                'latency': time_calls(old_query, repeat=args.repeat),
+            },
+            'after': {
+                'plan': explain(db, "SELECT * FROM food_entries "
+                                    "WHERE user_id = 'default' AND timestamp >= %s AND timestamp < %s",
+                                (start, end)),
+                'latency': time_calls(lambda: db.get_daily_entries(day.isoformat()), repeat=args.repeat),
+            },
+        })
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+"""
+Daily Intake Benchmark
+
+Times FoodTrackingService.get_daily_intake for users with large daily logs:
+the previous five-pass implementation over materialized FoodEntry objects,
+the single-pass ``include_entries=True`` path, a GROUP BY over raw entries
+and the daily_totals rollup read.
+
+Usage:
+    DATABASE_URL=postgresql://... python -m benchmarks.bench_daily_intake --sizes 100 1000 10000
+"""
+
+import argparse
+from datetime import date
+
+from app.database.models import day_bounds
+from app.models.food import MealType
+from app.services.food_tracker import FoodTrackingService
+from benchmarks.bench_bulk_insert import make_entries
+from benchmarks.common import scratch_database, time_calls, report
+
+
+def legacy_daily_intake(service: FoodTrackingService, target_date: date) -> dict:
+    """The original implementation: one pass for the total plus one per meal"""
+    daily_entries = service.db_manager.get_daily_entries(target_date.isoformat())
+    total_calories = sum(entry.calories for entry in daily_entries)
+    meal_breakdown = {}
+    for meal_type in MealType:
+        meal_calories = sum(
+            entry.calories for entry in daily_entries
+            if entry.meal_type == meal_type.value
+        )
+        meal_breakdown[meal_type.value] = round(meal_calories, 1)
+    return {
+        'total_calories': round(total_calories, 1),
+        'meal_breakdown': meal_breakdown,
+        'entry_count': len(daily_entries)
+    }
+
+
+def raw_group_by_summary(db, target_date: date) -> dict:
+    """The pre-rollup summary: GROUP BY meal_type over the day's raw entries"""
+    start, end = day_bounds(target_date)
+    with db.get_connection() as conn:
+        with conn.cursor() as cursor:
+            cursor.execute("""
+                SELECT meal_type, SUM(calories_per_100g * quantity_grams / 100), COUNT(*)
+                FROM food_entries
+                WHERE timestamp >= %s AND timestamp < %s
+                GROUP BY meal_type
+            """, (start, end))
+            return FoodTrackingService._build_summary(
+                {row[0]: (float(row[1]), row[2]) for row in cursor.fetchall()})
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 1000, 10000])
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    results = {}
+    with scratch_database() as db:
+        service = FoodTrackingService(db)
+        for size in args.sizes:
+            with db.get_connection() as conn:
+                with conn.cursor() as cursor:
+                    cursor.execute("TRUNCATE food_entries, daily_totals")
+                conn.commit()
+            entries = make_entries(size)
+            for entry in entries:
+                # Pin every entry to the benchmarked day
+                entry.timestamp = entry.timestamp.replace(day=1, hour=12, minute=0)
+            db.save_food_entries(entries)
+            day = date(2024, 1, 1)
+            results[size] = {
+                'legacy_five_pass': time_calls(lambda: legacy_daily_intake(service, day), repeat=args.repeat),
+                'single_pass_entries': time_calls(
+                    lambda: service.get_daily_intake(day, include_entries=True), repeat=args.repeat),
+                'sql_group_by': time_calls(lambda: raw_group_by_summary(db, day), repeat=args.repeat),
+                'daily_totals_rollup': time_calls(lambda: service.get_daily_intake(day), repeat=args.repeat),
+            }
+    report('daily_intake', results)
+
+
+if __name__ == '__main__':
+    main()
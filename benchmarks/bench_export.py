@@ -0,0 +1,82 @@
+"""
+Export Benchmark
+
+Streams /api/food-entries/export through the Flask test client for
+growing histories and reports rows/s and the Python heap peak while
+streaming. A flat peak across sizes shows the export never materializes
+the history.
+
+Usage:
+    python -m benchmarks.bench_export --sizes 10000 100000
+    DATABASE_URL=postgresql://... python -m benchmarks.bench_export --database postgres
+"""
+
+import argparse
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Iterator
+
+from app import create_app
+from app.database.memory import synthetic_entries
+from benchmarks.bench_api import with_search_path
+from benchmarks.common import report, scratch_database, SCRATCH_SCHEMA
+from config.settings import Config
+
+
+@contextmanager
+def seeded(kind: str, size: int) -> Iterator[str]:
+    if kind == 'memory':
+        yield f'memory://?entries={size}&days={max(1, size // 100)}'
+        return
+    with scratch_database() as db:
+        db.save_food_entries(list(synthetic_entries(size, max(1, size // 100))))
+        yield with_search_path(db.db_url, SCRATCH_SCHEMA)
+
+
+def drain(client, fmt: str) -> int:
+    response = client.get(f'/api/food-entries/export?format={fmt}', buffered=False)
+    size = sum(len(chunk) for chunk in response.response)
+    response.close()
+    return size
+
+
+def stream_export(client, fmt: str) -> dict:
+    """Time one export, then repeat it under tracemalloc for the heap peak"""
+    started = time.perf_counter()
+    size = drain(client, fmt)
+    elapsed = time.perf_counter() - started
+    tracemalloc.start()
+    drain(client, fmt)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {'seconds': round(elapsed, 3), 'bytes': size, 'peak_heap_kb': round(peak / 1024, 1)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--database', choices=('memory', 'postgres'), default='memory')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000])
+    args = parser.parse_args()
+
+    results = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        for size in args.sizes:
+            with seeded(args.database, size) as db_url:
+                class BenchConfig(Config):
+                    DATABASE_URL = db_url
+                    FOOD_DB_PATH = f'{workdir}/foods.db'
+                    METRICS_ENABLED = False
+                client = create_app(BenchConfig).test_client()
+                client.get('/api/food-entries/export?end=1970-01-01')  # build services first
+                results[size] = {}
+                for fmt in ('ndjson', 'csv'):
+                    run = stream_export(client, fmt)
+                    run['rows_per_second'] = round(size / run['seconds'], 1)
+                    results[size][fmt] = run
+    report('export', results)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+"""
+Food Search Benchmark
+
+Builds a synthetic catalog of hundreds of thousands of foods in a temporary
+SQLite file and compares search latency of each FoodDatabase search engine,
+plus the in-memory index build time and footprint and the snapshot
+compile time. Snapshot pages are shared between workers, so its RSS growth
+is paid once per host rather than per worker.
+
+Usage:
+    python -m benchmarks.bench_food_search --foods 500000
+"""
+
+import argparse
+import os
+import random
+import sqlite3
+import tempfile
+import resource
+import time
+
+from app.database.food_data import FoodDatabase
+from app.database.food_search import SEARCH_ENGINES
+from benchmarks.common import time_calls, report
+
+WORDS = [
+    "apple", "banana", "roasted", "chicken", "breast", "whole", "wheat", "bread", "greek",
+    "yogurt", "plain", "low", "fat", "cheddar", "cheese", "brown", "rice", "cooked", "raw",
+    "salted", "butter", "almond", "milk", "orange", "juice", "sweet", "potato", "baked",
+    "grilled", "salmon", "fillet", "spinach", "frozen", "canned", "tuna", "oil", "dark",
+    "chocolate", "peanut", "oat", "cereal", "honey", "smoked", "turkey", "ham", "beef",
+]
+CATEGORIES = ["Fruits", "Vegetables", "Grains", "Proteins", "Dairy", "Nuts", "Oils", "Beverages", "Snacks"]
+QUERIES = {
+    'short': "ch",
+    'prefix': "chicken",
+    'substring': "cheese",
+    'multiword': "brown rice",
+    'miss': "zzzq",
+}
+
+
+def synthetic_foods(count: int, seed: int = 42):
+    rng = random.Random(seed)
+    for i in range(count):
+        name = " ".join(rng.choice(WORDS) for _ in range(rng.randint(2, 4))).title()
+        yield (f"{name} #{i}", round(rng.uniform(1, 900), 1), rng.choice(CATEGORIES))
+
+
+def build_catalog(path: str, count: int) -> None:
+    FoodDatabase(path, search_engine='like').init_food_database()
+    with sqlite3.connect(path) as conn:
+        conn.execute("DELETE FROM food_database")
+        conn.executemany(
+            "INSERT INTO food_database (name, calories_per_100g, category) VALUES (?, ?, ?)",
+            synthetic_foods(count)
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--foods', type=int, default=300_000)
+    parser.add_argument('--repeat', type=int, default=50)
+    parser.add_argument('--engines', nargs='+', default=list(SEARCH_ENGINES))
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "catalog.db")
+        build_catalog(path, args.foods)
+        results = {'foods': args.foods}
+        for engine in args.engines:
+            food_db = FoodDatabase(path, search_engine=engine, index_refresh_interval=3600)
+            food_db.init_food_database()  # builds the FTS5 table when needed
+            start = time.perf_counter()
+            food_db.search_engine.publish()  # compiles the snapshot file for 'snapshot'
+            publish_seconds = time.perf_counter() - start
+            rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            start = time.perf_counter()
+            food_db.search_food("warm up")  # loads the index for in-memory engines
+            warmup_seconds = time.perf_counter() - start
+            rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            results[engine] = {
+                'publish_seconds': round(publish_seconds, 3),
+                'first_query_seconds': round(warmup_seconds, 3),
+                'peak_rss_growth_mb': round((rss_after - rss_before) / 1024, 1),
+                'queries': {
+                    label: time_calls(lambda q=query: food_db.search_food(q), repeat=args.repeat)
+                    for label, query in QUERIES.items()
+                },
+            }
+    report('food_search', results)
+
+
+if __name__ == '__main__':
+    main()
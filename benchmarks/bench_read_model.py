@@ -0,0 +1,99 @@
+"""
+Read Model Benchmark
+
+Compares building a day's entries as validated FoodItem/FoodEntry objects
+(the previous get_daily_entries) against the slotted FoodEntryRow read
+model, for days with thousands of entries. It reports build latency,
+build-plus-serialize latency as GET /api/food-entries does it, and the
+bytes retained per entry. Rows mimic psycopg2 output (Decimal columns),
+so no database is needed.
+
+Usage:
+    python -m benchmarks.bench_read_model --sizes 1000 5000 20000
+"""
+
+import argparse
+import tracemalloc
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from app.models.food import FoodEntry, FoodEntryRow, FoodItem, MealType
+from benchmarks.common import report, time_calls
+
+
+def fake_rows(count: int):
+    start = datetime(2024, 1, 1, 6)
+    meals = [meal.value for meal in MealType]
+    return [
+        (f"Food {i % 100}", Decimal(50 + i % 300), Decimal(100), meals[i % 4], start + timedelta(seconds=i))
+        for i in range(count)
+    ]
+
+
+def build_legacy(rows):
+    return [
+        FoodEntry(MealType(meal_type), FoodItem(name, float(calories), float(quantity)), timestamp)
+        for name, calories, quantity, meal_type, timestamp in rows
+    ]
+
+
+def serialize_legacy(entries):
+    return [{
+        'food_name': entry.food_item.name,
+        'calories_per_100g': entry.food_item.calories_per_100g,
+        'quantity_grams': entry.food_item.quantity_grams,
+        'meal_type': entry.meal_type.value,
+        'calories': entry.calculate_calories(),
+        'timestamp': entry.timestamp.isoformat()
+    } for entry in entries]
+
+
+def build_rows(rows):
+    # Same loop as DatabaseManager.get_daily_entries
+    entries = []
+    for name, calories_per_100g, quantity_grams, meal_type, timestamp in rows:
+        calories_per_100g = float(calories_per_100g)
+        quantity_grams = float(quantity_grams)
+        entries.append(FoodEntryRow(name, calories_per_100g, quantity_grams, meal_type, timestamp,
+                                    calories_per_100g * quantity_grams / 100))
+    return entries
+
+
+def retained_bytes(build, rows) -> float:
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    entries = build(rows)
+    retained = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+    del entries
+    return round(retained / len(rows), 1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 5000, 20000])
+    parser.add_argument('--repeat', type=int, default=30)
+    args = parser.parse_args()
+
+    results = {}
+    for size in args.sizes:
+        rows = fake_rows(size)
+        results[size] = {
+            'food_entry': {
+                'build': time_calls(lambda: build_legacy(rows), repeat=args.repeat),
+                'build_and_serialize': time_calls(lambda: serialize_legacy(build_legacy(rows)),
+                                                  repeat=args.repeat),
+                'bytes_per_entry': retained_bytes(build_legacy, rows),
+            },
+            'food_entry_row': {
+                'build': time_calls(lambda: build_rows(rows), repeat=args.repeat),
+                'build_and_serialize': time_calls(lambda: [e.to_dict() for e in build_rows(rows)],
+                                                  repeat=args.repeat),
+                'bytes_per_entry': retained_bytes(build_rows, rows),
+            },
+        }
+    report('read_model', results)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+"""
+Serialization Benchmark
+
+Times rendering a GET /api/food-entries body of 10k entries three ways:
+the previous path (FoodEntryRow.to_dict per entry, then Flask's stdlib
+provider), the stdlib fallback provider given the rows themselves, and the
+orjson provider given the rows. Each case builds the whole Response, as
+jsonify does, and reports its latency and body size. No database is needed.
+
+Usage:
+    python -m benchmarks.bench_serialization --sizes 10000
+"""
+
+import argparse
+from datetime import date, datetime, timedelta
+
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+from app.models.food import FoodEntryRow, MealType
+from app.serialization import IsoJSONProvider, OrjsonProvider, orjson
+from benchmarks.common import report, time_calls
+
+
+def fake_rows(count: int):
+    start = datetime(2024, 1, 1, 6)
+    meals = [meal.value for meal in MealType]
+    return [
+        FoodEntryRow(f"Food {i % 100}", 50.0 + i % 300, 100.0, meals[i % 4], start + timedelta(seconds=i),
+                     50.0 + i % 300)
+        for i in range(count)
+    ]
+
+
+def body(entries):
+    return {
+        'entries': entries,
+        'total_calories': 0.0,
+        'meal_breakdown': {},
+        'entry_count': len(entries),
+        'date': date(2024, 1, 1).isoformat(),
+    }
+
+
+def render(app: Flask, provider, payload):
+    with app.app_context():
+        return provider.response(payload)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000])
+    parser.add_argument('--repeat', type=int, default=30)
+    args = parser.parse_args()
+
+    app = Flask(__name__)
+    cases = {
+        'stdlib_to_dict': (DefaultJSONProvider(app), lambda rows: body([row.to_dict() for row in rows])),
+        'stdlib_rows': (IsoJSONProvider(app), body),
+    }
+    if orjson is not None:
+        cases['orjson_rows'] = (OrjsonProvider(app), body)
+
+    results = {}
+    for size in args.sizes:
+        rows = fake_rows(size)
+        results[size] = {}
+        for name, (provider, build) in cases.items():
+            results[size][name] = {
+                **time_calls(lambda: render(app, provider, build(rows)), repeat=args.repeat),
+                'bytes': len(render(app, provider, build(rows)).get_data()),
+            }
+        baseline = results[size]['stdlib_to_dict']['p50_ms']
+        for name in cases:
+            results[size][name]['speedup'] = round(baseline / results[size][name]['p50_ms'], 2)
+    report('serialization', {'orjson': orjson is not None, 'sizes': results})
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,135 @@
+"""
+Write-Behind Benchmark
+
+Compares single-entry logging through FoodTrackingService.add_food_entry
+with and without the group-commit write buffer at several concurrency
+levels. Every thread writes entries back to back for ``--duration``
+seconds; results are committed entries/s, per-write latency and, with the
+buffer, the mean batch size. Against PostgreSQL (the default) each direct
+write is its own commit. ``--database memory`` shows the buffer's own
+overhead; add ``--commit-ms`` to charge every memory-store transaction a
+serialized flush, like one WAL fsync at a time.
+
+Usage:
+    DATABASE_URL=postgresql://... python -m benchmarks.bench_write_behind --concurrency 1 16 64
+    python -m benchmarks.bench_write_behind --database memory --commit-ms 1
+"""
+
+import argparse
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List
+
+from app.database.memory import InMemoryDatabaseManager, synthetic_entries
+from app.services.food_tracker import FoodTrackingService
+from app.services.write_buffer import GroupCommitWriter
+from benchmarks.common import report, scratch_database, summarize
+
+
+class FlushingMemoryStore(InMemoryDatabaseManager):
+    """Memory store whose every transaction waits for one shared simulated fsync"""
+
+    def __init__(self, commit_seconds: float):
+        super().__init__()
+        self.commit_seconds = commit_seconds
+        self._flush_lock = threading.Lock()
+
+    def _flush(self):
+        with self._flush_lock:
+            time.sleep(self.commit_seconds)
+
+    def save_food_entry(self, entry):
+        entry_id = super().save_food_entry(entry)
+        self._flush()
+        return entry_id
+
+    def save_food_entries(self, entries, page_size: int = 1000):
+        entry_ids = super().save_food_entries(entries, page_size)
+        self._flush()
+        return entry_ids
+
+
+@contextmanager
+def entry_store(kind: str, pool_size: int, commit_ms: float = 0.0) -> Iterator:
+    if kind == 'memory':
+        yield FlushingMemoryStore(commit_ms / 1000) if commit_ms else InMemoryDatabaseManager()
+        return
+    with scratch_database() as db:
+        # One connection per thread, as gunicorn.conf.py sizes gthread pools
+        db.pool.max_size = pool_size
+        yield db
+
+
+def run_writers(service: FoodTrackingService, threads: int, duration: float) -> Dict:
+    """``threads`` threads calling add_food_entry until ``duration`` elapses"""
+    entries = list(synthetic_entries(1000, days=7))
+    samples: List[List[float]] = [[] for _ in range(threads)]
+    errors = []
+    deadline = time.perf_counter() + duration
+
+    def write(thread_samples: List[float], offset: int):
+        n = offset
+        while time.perf_counter() < deadline:
+            entry = entries[n % len(entries)]
+            n += 1
+            start = time.perf_counter()
+            try:
+                service.add_food_entry(entry)
+            except Exception as e:
+                errors.append(repr(e))
+                continue
+            thread_samples.append(time.perf_counter() - start)
+
+    started = time.perf_counter()
+    workers = [threading.Thread(target=write, args=(samples[i], i * 7)) for i in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - started
+
+    latencies = [sample for thread_samples in samples for sample in thread_samples]
+    return {
+        **summarize(latencies),
+        'entries_per_second': round(len(latencies) / elapsed, 1),
+        'errors': len(errors),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--database', choices=('memory', 'postgres'), default='postgres')
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 16, 64])
+    parser.add_argument('--duration', type=float, default=5.0, help="seconds per run")
+    parser.add_argument('--max-batch', type=int, default=200)
+    parser.add_argument('--max-delay-ms', type=float, default=0.0)
+    parser.add_argument('--queue-size', type=int, default=2000)
+    parser.add_argument('--commit-ms', type=float, default=0.0, help="simulated flush per memory transaction")
+    args = parser.parse_args()
+
+    results = {}
+    with entry_store(args.database, max(args.concurrency), args.commit_ms) as db:
+        for threads in args.concurrency:
+            direct = run_writers(FoodTrackingService(db), threads, args.duration)
+
+            writer = GroupCommitWriter(db.save_food_entries, max_batch=args.max_batch,
+                                       max_delay=args.max_delay_ms / 1000, max_queue=args.queue_size)
+            buffered = run_writers(FoodTrackingService(db, writer=writer), threads, args.duration)
+            writer.close()
+            buffered['mean_batch_size'] = writer.stats.mean_batch_size
+
+            results[threads] = {
+                'direct': direct,
+                'write_behind': buffered,
+                'speedup': round(buffered['entries_per_second'] / direct['entries_per_second'], 2)
+                if direct['entries_per_second'] else None,
+            }
+    report('write_behind', {
+        'database': args.database, 'commit_ms': args.commit_ms, 'max_batch': args.max_batch,
+        'max_delay_ms': args.max_delay_ms, 'concurrency': results
+    })
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+"""
+Benchmark Helpers
+
+Shared timing and reporting utilities for the scripts in this package.
+Benchmarks are run manually, e.g. ``python -m benchmarks.bench_daily_entries``.
+"""
+
+import json
+import os
+import statistics
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, List
+
+SCRATCH_SCHEMA = 'calorie_bench'
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Return the ``pct`` percentile (0-100) of samples using nearest rank"""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    """Summarize latency samples (seconds) as milliseconds"""
+    return {
+        'runs': len(samples),
+        'mean_ms': round(statistics.fmean(samples) * 1000, 3) if samples else 0.0,
+        'p50_ms': round(percentile(samples, 50) * 1000, 3),
+        'p95_ms': round(percentile(samples, 95) * 1000, 3),
+        'p99_ms': round(percentile(samples, 99) * 1000, 3),
+        'max_ms': round(max(samples) * 1000, 3) if samples else 0.0,
+    }
+
+
+def time_calls(func: Callable, repeat: int = 20, warmup: int = 2) -> Dict[str, float]:
+    """Call ``func`` repeatedly and summarize its latency"""
+    for _ in range(warmup):
+        func()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return summarize(samples)
+
+
+def report(name: str, results: Dict) -> None:
+    """Print benchmark results as a single JSON document"""
+    print(json.dumps({'benchmark': name, 'results': results}, indent=2, default=str))
+
+
+@contextmanager
+def scratch_database(keep: bool = False):
+    """Yield a DatabaseManager whose tables live in a throwaway schema"""
+    import psycopg2
+    from app.database.models import DatabaseManager
+    from app.database.pool import ConnectionPool
+
+    db_url = os.getenv('DATABASE_URL', 'postgresql://localhost/calorie_tracker')
+    with psycopg2.connect(db_url) as conn:
+        with conn.cursor() as cursor:
+            cursor.execute(f"CREATE SCHEMA IF NOT EXISTS {SCRATCH_SCHEMA}")
+
+    pool = ConnectionPool(lambda: psycopg2.connect(db_url, options=f'-c search_path={SCRATCH_SCHEMA}'))
+    try:
+        db = DatabaseManager(db_url, pool=pool)
+        db.init_database()
+        yield db
+    finally:
+        pool.close_all()
+        if not keep:
+            with psycopg2.connect(db_url) as conn:
+                with conn.cursor() as cursor:
+                    cursor.execute(f"DROP SCHEMA {SCRATCH_SCHEMA} CASCADE")
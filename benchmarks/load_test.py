@@ -0,0 +1,169 @@
+"""
+HTTP Load Test
+
+Drives a running API with concurrent keep-alive clients and reports p50/p99
+latency and requests per second. With ``--mode`` it starts gunicorn itself
+(using gunicorn.conf.py) once per worker class, so the sync and gthread
+serving modes are measured against the same endpoints and database.
+
+Usage:
+    python -m benchmarks.load_test --mode sync --mode gthread --concurrency 32
+    python -m benchmarks.load_test --url http://localhost:8000 --path "/api/food-entries?date=2024-01-01"
+"""
+
+import argparse
+import http.client
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, NamedTuple, Optional, Sequence, Union
+from urllib.parse import urlsplit
+
+from benchmarks.common import report, summarize
+
+
+class Request(NamedTuple):
+    method: str
+    path: str
+    body: Optional[bytes] = None
+
+
+def as_request(spec: Union[str, Request]) -> Request:
+    """Plain paths are GET requests"""
+    return spec if isinstance(spec, Request) else Request('GET', spec)
+
+
+DEFAULT_PATHS = [
+    '/api/search-food?q=chicken',
+    '/api/food-entries',
+]
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def wait_until_ready(host: str, port: int, timeout: float = 15.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection((host, port), timeout=0.5).close()
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f"Server on {host}:{port} did not start within {timeout}s")
+
+
+@contextmanager
+def gunicorn_server(worker_class: str, workers: int, threads: int = None, env: Dict[str, str] = None):
+    """Run gunicorn with gunicorn.conf.py and the given worker class on a free port"""
+    port = free_port()
+    env = dict(os.environ, **(env or {}), GUNICORN_WORKER_CLASS=worker_class, GUNICORN_WORKERS=str(workers))
+    if threads:
+        env['GUNICORN_THREADS'] = str(threads)
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', 'run:app', '-c', 'gunicorn.conf.py',
+         '--bind', f'127.0.0.1:{port}', '--log-level', 'warning',
+         # Recycling workers mid-run shows up as latency spikes, not app cost
+         '--max-requests', '0'],
+        env=env
+    )
+    try:
+        wait_until_ready('127.0.0.1', port)
+        yield f'http://127.0.0.1:{port}'
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+
+
+def run_load(url: str, paths: Sequence[Union[str, Request]], concurrency: int, duration: float,
+             warmup: float = 1.0) -> Dict:
+    """Send ``paths`` round-robin from ``concurrency`` clients for ``duration`` seconds"""
+    target = urlsplit(url)
+    requests = [as_request(spec) for spec in paths]
+    headers = {'Content-Type': 'application/json'}
+    samples: List[float] = []
+    statuses: Dict[int, int] = {}
+    errors = [0]
+    lock = threading.Lock()
+    start_at = time.monotonic() + warmup
+    stop_at = start_at + duration
+
+    def client(offset: int):
+        conn = http.client.HTTPConnection(target.hostname, target.port, timeout=30)
+        local_samples, local_statuses, local_errors = [], {}, 0
+        i = offset
+        while True:
+            now = time.perf_counter()
+            if time.monotonic() >= stop_at:
+                break
+            try:
+                method, path, body = requests[i % len(requests)]
+                conn.request(method, path, body=body, headers=headers)
+                response = conn.getresponse()
+                response.read()
+                status = response.status
+            except (OSError, http.client.HTTPException):
+                conn.close()
+                conn = http.client.HTTPConnection(target.hostname, target.port, timeout=30)
+                status = None
+            elapsed = time.perf_counter() - now
+            i += 1
+            if time.monotonic() < start_at:
+                continue  # warm-up: connections and caches, not measured
+            if status is None:
+                local_errors += 1
+            else:
+                local_samples.append(elapsed)
+                local_statuses[status] = local_statuses.get(status, 0) + 1
+        conn.close()
+        with lock:
+            samples.extend(local_samples)
+            errors[0] += local_errors
+            for status, count in local_statuses.items():
+                statuses[status] = statuses.get(status, 0) + count
+
+    threads = [threading.Thread(target=client, args=(n,)) for n in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    return {
+        **summarize(samples),
+        'requests_per_second': round(len(samples) / duration, 1),
+        'status_codes': statuses,
+        'connection_errors': errors[0],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--url', help="benchmark an already running server instead of starting gunicorn")
+    parser.add_argument('--mode', action='append', choices=('sync', 'gthread'),
+                        help="gunicorn worker class to start (repeatable)")
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--threads', type=int, help="gthread threads per worker (default from gunicorn.conf.py)")
+    parser.add_argument('--path', action='append', help="request path (repeatable)")
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--duration', type=float, default=10.0)
+    args = parser.parse_args()
+
+    paths = args.path or DEFAULT_PATHS
+    results = {}
+    if args.url:
+        results['external'] = run_load(args.url, paths, args.concurrency, args.duration)
+    for mode in args.mode or ([] if args.url else ['sync', 'gthread']):
+        with gunicorn_server(mode, args.workers, args.threads) as url:
+            results[mode] = run_load(url, paths, args.concurrency, args.duration)
+    report('load_test', {'paths': paths, 'concurrency': args.concurrency, **results})
+
+
+if __name__ == '__main__':
+    main()
@@ -14,8 +14,82 @@ load_dotenv()
 class Config:
     """Base configuration class"""
     SECRET_KEY = os.environ.get('SECRET_KEY') or 'dev-secret-key-change-in-production'
+    # PostgreSQL URL, or memory://[?entries=N&days=D] for a per-process stand-in
     DATABASE_URL = os.environ.get('DATABASE_URL') or 'postgresql://localhost/calorie_tracker'
     
+    # Connection pool settings (per worker process)
+    DB_POOL_MIN_SIZE = int(os.environ.get('DB_POOL_MIN_SIZE', 1))
+    DB_POOL_MAX_SIZE = int(os.environ.get('DB_POOL_MAX_SIZE', 5))
+    DB_POOL_TIMEOUT = float(os.environ.get('DB_POOL_TIMEOUT', 5.0))  # seconds to wait for a free connection
+    DB_POOL_HEALTH_CHECK_INTERVAL = float(os.environ.get('DB_POOL_HEALTH_CHECK_INTERVAL', 30.0))  # ping idle connections older than this
+    DB_POOL_MAX_IDLE_TIME = float(os.environ.get('DB_POOL_MAX_IDLE_TIME', 300.0))  # close extra idle connections after this
+    
+    # Food entries are owned by the X-User-Id request header; requests without
+    # it belong to DEFAULT_USER_ID (set it empty to require the header)
+    DEFAULT_USER_ID = os.environ.get('DEFAULT_USER_ID', 'default')
+    PARTITION_MONTHS_AHEAD = int(os.environ.get('PARTITION_MONTHS_AHEAD', 3))  # monthly food_entries partitions kept ahead
+    
+    # Read-through cache for daily intake summaries: 'memory' (per worker),
+    # 'sqlite' (shared by workers on one host), 'redis' (shared) or 'none'
+    INTAKE_CACHE_BACKEND = os.environ.get('INTAKE_CACHE_BACKEND', 'memory')
+    INTAKE_CACHE_URL = os.environ.get('INTAKE_CACHE_URL')  # SQLite path or redis:// URL
+    INTAKE_CACHE_MAX_ENTRIES = int(os.environ.get('INTAKE_CACHE_MAX_ENTRIES', 1024))
+    INTAKE_CACHE_TTL = float(os.environ.get('INTAKE_CACHE_TTL', 30.0))  # seconds
+    
+    # Write-behind for single food entries: request threads queue entries and
+    # one flusher per worker commits everything queued (up to MAX_BATCH) per
+    # transaction, optionally lingering MAX_DELAY_MS to fill a batch.
+    # Requests still return only after their commit.
+    WRITE_BEHIND_ENABLED = os.environ.get('WRITE_BEHIND_ENABLED', 'false').lower() == 'true'
+    WRITE_BEHIND_MAX_BATCH = int(os.environ.get('WRITE_BEHIND_MAX_BATCH', 200))
+    WRITE_BEHIND_MAX_DELAY_MS = float(os.environ.get('WRITE_BEHIND_MAX_DELAY_MS', 0.0))
+    WRITE_BEHIND_QUEUE_SIZE = int(os.environ.get('WRITE_BEHIND_QUEUE_SIZE', 2000))  # entries; full queue applies backpressure
+    WRITE_BEHIND_SUBMIT_TIMEOUT = float(os.environ.get('WRITE_BEHIND_SUBMIT_TIMEOUT', 1.0))  # seconds to wait for room, then 503
+    
+    # Largest payloads accepted by the batch endpoints
+    BATCH_MAX_ENTRIES = int(os.environ.get('BATCH_MAX_ENTRIES', 5000))  # POST /api/food-entries/batch
+    CALCULATE_BATCH_MAX_ROWS = int(os.environ.get('CALCULATE_BATCH_MAX_ROWS', 100000))  # POST /api/calculate/batch
+    EXPORT_CHUNK_SIZE = int(os.environ.get('EXPORT_CHUNK_SIZE', 2000))  # rows per server-side cursor fetch
+    EXPORT_MAX_CONCURRENT = int(os.environ.get('EXPORT_MAX_CONCURRENT', 2))  # running exports per worker (each holds a pooled connection); more get 503
+    RANGE_MAX_DAYS = int(os.environ.get('RANGE_MAX_DAYS', 3660))  # GET /api/food-entries/range span
+    
+    # SQLite food catalog
+    FOOD_DB_PATH = os.environ.get('FOOD_DB_PATH') or 'calorie_tracker.db'
+    FOOD_IMPORT_CHUNK_SIZE = int(os.environ.get('FOOD_IMPORT_CHUNK_SIZE', 20000))  # rows per import transaction
+    
+    # Food catalog search: 'index' (in-memory, per worker), 'snapshot' (mmap'd
+    # binary catalog shared by all workers), 'fts' (SQLite FTS5, falls back
+    # to 'like' when FTS5 is missing) or 'like' (unindexed scan)
+    FOOD_SEARCH_ENGINE = os.environ.get('FOOD_SEARCH_ENGINE', 'index')
+    FOOD_SNAPSHOT_PATH = os.environ.get('FOOD_SNAPSHOT_PATH')  # default: FOOD_DB_PATH with a .snapshot suffix
+    FOOD_INDEX_REFRESH_INTERVAL = float(os.environ.get('FOOD_INDEX_REFRESH_INTERVAL', 5.0))  # seconds between catalog version checks
+    SEARCH_CACHE_MAX_AGE = int(os.environ.get('SEARCH_CACHE_MAX_AGE', 300))  # seconds clients may reuse /api/search-food results
+    
+    # Per-worker LRU of catalog foods resolved by id/name when entries are
+    # posted without calories_per_100g; cleared when the catalog version changes
+    FOOD_CACHE_MAX_ENTRIES = int(os.environ.get('FOOD_CACHE_MAX_ENTRIES', 2048))
+    FOOD_CACHE_TTL = float(os.environ.get('FOOD_CACHE_TTL', 3600.0))  # seconds
+    
+    # Latency histograms and the /metrics endpoint (cheap enough to leave on)
+    METRICS_ENABLED = os.environ.get('METRICS_ENABLED', 'true').lower() != 'false'
+    
+    # JSON provider for requests and responses: 'auto' (orjson when installed),
+    # 'orjson' (required) or 'stdlib'
+    JSON_PROVIDER = os.environ.get('JSON_PROVIDER', 'auto')
+    
+    # Slow request profiler: stack samples of requests under these path
+    # prefixes that take longer than the threshold, kept in a ring buffer.
+    # Off by default; enabling it requires an absolute PROFILE_DIR
+    PROFILE_ENABLED = os.environ.get('PROFILE_ENABLED', 'false').lower() == 'true'
+    PROFILE_PATH_PREFIXES = os.environ.get('PROFILE_PATH_PREFIXES', '/api/food-entries').split(',')
+    PROFILE_SLOW_REQUEST_MS = float(os.environ.get('PROFILE_SLOW_REQUEST_MS', 500))
+    PROFILE_SAMPLE_INTERVAL_MS = float(os.environ.get('PROFILE_SAMPLE_INTERVAL_MS', 10))
+    PROFILE_DIR = os.environ.get('PROFILE_DIR')
+    PROFILE_MAX_FILES = int(os.environ.get('PROFILE_MAX_FILES', 50))  # oldest profiles are deleted beyond this
+    
+    # Bearer token for /admin endpoints; unset disables them
+    ADMIN_TOKEN = os.environ.get('ADMIN_TOKEN')
+    
     # Flask settings
     DEBUG = False
     TESTING = False
@@ -34,6 +108,7 @@ class ProductionConfig(Config):
 class TestingConfig(Config):
     """Testing environment configuration"""
     TESTING = True
+    PROFILE_ENABLED = False
     DATABASE_URL = os.environ.get('TEST_DATABASE_URL') or 'postgresql://localhost/calorie_tracker_test'
 
 
@@ -5,14 +5,32 @@ Optimized settings for running the calorie calculator web application
 in production with proper worker management and performance tuning.
 """
 
+import os
+
+from dotenv import load_dotenv
+
+# Read .env before the settings below; the app's own load_dotenv() runs
+# later and never overrides variables that are already set
+load_dotenv()
+
 # Server socket binding
 bind = "0.0.0.0:8000"
 
 # Worker processes - adjust based on CPU cores (2 * cores + 1)
-workers = 2
+workers = int(os.environ.get('GUNICORN_WORKERS', 2))
+
+# Worker class - 'sync' serves one request per worker at a time; 'gthread'
+# runs a thread pool per worker so requests waiting on PostgreSQL/SQLite I/O
+# (psycopg2 and sqlite3 release the GIL) don't stall the others
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'sync')
+
+# Request threads per worker (only used by gthread)
+threads = int(os.environ.get('GUNICORN_THREADS', 8 if worker_class == 'gthread' else 1))
 
-# Worker class - sync is good for CPU-bound tasks
-worker_class = "sync"
+# Each worker owns its own DB connection pool; give every request thread a
+# connection unless DB_POOL_MAX_SIZE is set explicitly. Keep
+# workers * DB_POOL_MAX_SIZE below PostgreSQL's max_connections.
+os.environ.setdefault('DB_POOL_MAX_SIZE', str(max(threads, 1)))
 
 # Request timeout in seconds
 timeout = 30
@@ -23,3 +41,20 @@ keepalive = 2
 # Restart workers after handling this many requests (prevents memory leaks)
 max_requests = 1000
 max_requests_jitter = 100  # Add randomness to prevent thundering herd
+
+
+def worker_abort(worker):
+    """Save stack samples of in-flight requests before a timed-out worker dies"""
+    from app.profiling import get_profiler
+    profiler = get_profiler(worker.wsgi)
+    if profiler is not None:
+        for profile_id in profiler.dump_inflight():
+            worker.log.warning("Saved profile %s of a request killed by the timeout", profile_id)
+
+
+def worker_exit(server, worker):
+    """Commit entries still in the write-behind buffer before the worker exits"""
+    from app.extensions import get_registry
+    food_tracker = get_registry(worker.wsgi).peek('food_tracker')
+    if food_tracker is not None:
+        food_tracker.close()
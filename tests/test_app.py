@@ -1,18 +1,27 @@
 """
 Basic Application Tests
 
-Sample test structure for the calorie calculator application.
+Drive the API blueprint end to end through the Flask test client, with
+the in-memory food entry store standing in for PostgreSQL.
 """
 
+import json
+
 import pytest
 from app import create_app
+from app.extensions import get_registry
+from app.services.food_tracker import FoodTrackingService
 from config.settings import TestingConfig
 
 
 @pytest.fixture
-def app():
+def app(tmp_path):
     """Create test application"""
-    app = create_app(TestingConfig)
+    class Config(TestingConfig):
+        DATABASE_URL = 'memory://'
+        FOOD_DB_PATH = str(tmp_path / 'foods.db')
+    app = create_app(Config)
+    app.test_cli_runner().invoke(args=['init-db'])
     return app
 
 
@@ -22,13 +31,261 @@ def client(app):
     return app.test_client()
 
 
-def test_home_page(client):
-    """Test home page loads correctly"""
-    response = client.get('/')
+def test_calculate(client):
+    """Test BMR/TDEE calculation for a valid user"""
+    response = client.post('/api/calculate', json={
+        'age': 30, 'gender': 'male', 'weight': 80, 'height': 180, 'activity_level': 1.55
+    })
+    assert response.status_code == 200
+    assert response.get_json()['bmr'] == 1780.0
+
+
+def test_calculate_rejects_invalid_input(client):
+    """Test validation errors come back as 400 with a message"""
+    response = client.post('/api/calculate', json={
+        'age': 0, 'gender': 'male', 'weight': 80, 'height': 180, 'activity_level': 1.55
+    })
+    assert response.status_code == 400
+    assert 'Age' in response.get_json()['error']
+
+
+def test_calculate_batch_matches_calculate(client):
+    """Test the batch endpoint agrees row by row with /api/calculate, fractional ages included"""
+    ages = [30, 45.7, 120.5, 0.5]
+    response = client.post('/api/calculate/batch', json={
+        'age': ages, 'gender': ['male', 'female', 'male', 'female'],
+        'weight': [80, 62.5, 70, 60], 'height': [180, 165, 170, 160], 'activity_level': [1.2, 1.55, 1.2, 1.375]
+    })
+    assert response.status_code == 200
+    batch = response.get_json()
+    assert batch['errors'] == [{'index': 3, 'error': "Age must be between 1 and 120"}]
+    assert batch['tdee'][3] is None
+
+    for i, (age, gender, weight, height, level) in enumerate(
+            zip(ages[:3], ['male', 'female', 'male'], [80, 62.5, 70], [180, 165, 170], [1.2, 1.55, 1.2])):
+        scalar = client.post('/api/calculate', json={
+            'age': age, 'gender': gender, 'weight': weight, 'height': height, 'activity_level': level
+        }).get_json()
+        assert (batch['bmr'][i], batch['tdee'][i]) == (scalar['bmr'], scalar['tdee'])
+
+    assert client.post('/api/calculate/batch', json={'age': 30}).status_code == 400
+
+
+def test_food_entries_round_trip(client):
+    """Test a posted entry shows up in that day's intake"""
+    response = client.post('/api/food-entries', json={
+        'food_name': 'Apple', 'calories_per_100g': 52, 'quantity': 200,
+        'meal_type': 'snack', 'timestamp': '2024-03-01T10:00:00'
+    })
+    assert response.status_code == 200
+
+    intake = client.get('/api/food-entries?date=2024-03-01').get_json()
+    assert intake['total_calories'] == 104.0
+    assert intake['entries'][0]['food_name'] == 'Apple'
+
+
+def test_food_entry_calories_resolve_from_catalog(client):
+    """Test entries can name a catalog food (or its id) instead of sending calories"""
+    response = client.post('/api/food-entries', json={
+        'food_name': 'apple', 'quantity': 200, 'meal_type': 'snack', 'timestamp': '2024-03-01T10:00:00'
+    })
     assert response.status_code == 200
+    assert response.get_json()['calories'] == 104.0
+
+    apple = client.get('/api/food-entries?date=2024-03-01').get_json()['entries'][0]
+    assert apple['food_name'] == 'Apple'
+
+    unknown = client.post('/api/food-entries', json={
+        'food_id': 999999, 'quantity': 100, 'meal_type': 'snack'
+    })
+    assert unknown.status_code == 400
+    assert 'Unknown food' in unknown.get_json()['error']
+    assert client.get('/api/stats').get_json()['food_cache']['misses'] == 2
+
+
+def test_zero_calorie_catalog_food_can_be_logged(app, client):
+    """Test a zero-calorie food the importer accepts can be logged by id"""
+    food_db = get_registry(app).get('food_db')
+    with food_db.connect() as conn:
+        water_id = conn.execute("INSERT INTO food_database (name, calories_per_100g, category) "
+                                "VALUES ('Still Water', 0, 'Beverages')").lastrowid
+    response = client.post('/api/food-entries', json={
+        'food_id': water_id, 'quantity': 250, 'meal_type': 'snack', 'timestamp': '2024-03-01T10:00:00'
+    })
+    assert response.status_code == 200
+    assert response.get_json()['calories'] == 0.0
+
 
+def test_food_entries_are_per_user(client):
+    """Test X-User-Id scopes writes and reads to one owner"""
+    client.post('/api/food-entries', headers={'X-User-Id': 'alice'}, json={
+        'food_name': 'Apple', 'calories_per_100g': 52, 'quantity': 200,
+        'meal_type': 'snack', 'timestamp': '2024-03-01T10:00:00'
+    })
 
-def test_calculate_page(client):
-    """Test calculate page loads correctly"""
-    response = client.get('/calculate')
+    alice = client.get('/api/food-entries?date=2024-03-01', headers={'X-User-Id': 'alice'})
+    assert alice.get_json()['entry_count'] == 1
+    assert 'X-User-Id' in alice.headers['Vary']
+    assert client.get('/api/food-entries?date=2024-03-01',
+                      headers={'X-User-Id': 'bob'}).get_json()['entry_count'] == 0
+    assert client.get('/api/food-entries?date=2024-03-01').get_json()['entry_count'] == 0
+    assert client.get('/api/food-entries?date=2024-03-01',
+                      headers={'X-User-Id': 'no spaces'}).status_code == 400
+
+
+def test_user_header_required_without_default(app, client):
+    """Test an empty DEFAULT_USER_ID makes X-User-Id mandatory"""
+    app.config['DEFAULT_USER_ID'] = ''
+    assert client.get('/api/food-entries?date=2024-03-01').status_code == 400
+    assert client.get('/api/food-entries?date=2024-03-01',
+                      headers={'X-User-Id': 'alice'}).status_code == 200
+
+
+def test_food_entries_batch(app, client):
+    """Test a batch reports per-item ids and errors, with ids matching the input order"""
+    def item(name, hour, **overrides):
+        return {'food_name': name, 'calories_per_100g': 100, 'quantity': 50, 'meal_type': 'lunch',
+                'timestamp': f'2024-03-01T{hour:02d}:00:00', **overrides}
+    response = client.post('/api/food-entries/batch', json={'entries': [
+        item('Late', 20), item('Bad meal', 9, meal_type='brunch'), item('Early', 7),
+        'not an object', item('No quantity', 8, quantity=None), item('Noon', 12),
+    ]})
     assert response.status_code == 200
+    body = response.get_json()
+    assert (body['inserted'], body['failed']) == (3, 3)
+    results = body['results']
+    assert [result['index'] for result in results] == list(range(6))
+    assert all('error' in results[i] and 'id' not in results[i] for i in (1, 3, 4))
+
+    # Each returned id belongs to the entry at that index
+    db = get_registry(app).get('db_manager')
+    stored = {entry_id: entry.food_item.name
+              for rows in db._days['default'].values() for _, entry_id, entry in rows}
+    assert [stored[results[i]['id']] for i in (0, 2, 5)] == ['Late', 'Early', 'Noon']
+    assert results[0]['id'] < results[2]['id'] < results[5]['id']
+
+    all_bad = client.post('/api/food-entries/batch', json=[item('Bad', 9, meal_type='brunch')])
+    assert all_bad.status_code == 400
+
+
+def test_food_entries_batch_limit(app, client):
+    """Test batches over BATCH_MAX_ENTRIES are rejected whole"""
+    app.config['BATCH_MAX_ENTRIES'] = 2
+    entry = {'food_name': 'Rice', 'calories_per_100g': 130, 'quantity': 100, 'meal_type': 'lunch',
+             'timestamp': '2024-03-01T12:00:00'}
+    response = client.post('/api/food-entries/batch', json={'entries': [entry] * 3})
+    assert response.status_code == 400
+    assert 'exceeds 2' in response.get_json()['error']
+    assert client.get('/api/food-entries?date=2024-03-01').get_json()['entry_count'] == 0
+    assert client.post('/api/food-entries/batch', json={'entries': [entry] * 2}).status_code == 200
+
+
+def test_food_entries_range(client):
+    """Test the range endpoint rolls up days and compares against TDEE"""
+    for day in ('2024-03-01', '2024-03-02'):
+        client.post('/api/food-entries', json={
+            'food_name': 'Rice', 'calories_per_100g': 130, 'quantity': 1000,
+            'meal_type': 'dinner', 'timestamp': f'{day}T19:00:00'
+        })
+
+    response = client.get('/api/food-entries/range?start=2024-03-01&end=2024-03-03&window=3'
+                          '&age=30&gender=male&weight=80&height=180&activity_level=1.2')
+    data = response.get_json()
+    assert response.status_code == 200
+    assert [day['total_calories'] for day in data['days']] == [1300.0, 1300.0, 0.0]
+    assert data['tdee'] == 2136.0
+    assert data['days'][-1]['vs_tdee'] == round(2600 / 3 - 2136.0, 1)
+
+
+def test_food_entries_range_rejects_reversed_span(client):
+    """Test an end date before the start is a 400"""
+    response = client.get('/api/food-entries/range?start=2024-03-02&end=2024-03-01')
+    assert response.status_code == 400
+
+
+def test_export_streams_ndjson_and_csv(client):
+    """Test the export streams every entry in timestamp order in both formats"""
+    for hour, name in ((12, 'Rice'), (8, 'Oats')):
+        client.post('/api/food-entries', json={
+            'food_name': name, 'calories_per_100g': 100, 'quantity': 150,
+            'meal_type': 'lunch', 'timestamp': f'2024-03-01T{hour:02d}:00:00'
+        })
+
+    response = client.get('/api/food-entries/export?start=2024-03-01&end=2024-03-01')
+    assert response.is_streamed
+    rows = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert [row['food_name'] for row in rows] == ['Oats', 'Rice']
+    assert rows[0]['calories'] == 150.0
+
+    csv_lines = client.get('/api/food-entries/export?format=csv').get_data(as_text=True).splitlines()
+    assert csv_lines[0].startswith('timestamp,meal_type,food_name')
+    assert len(csv_lines) == 3
+    assert client.get('/api/food-entries/export?format=xml').status_code == 400
+
+
+def test_export_concurrency_is_capped(app, client):
+    """Test exports beyond EXPORT_MAX_CONCURRENT get 503 until a running one closes"""
+    app.config['EXPORT_MAX_CONCURRENT'] = 1
+    running = client.get('/api/food-entries/export')
+    assert running.status_code == 200
+
+    refused = client.get('/api/food-entries/export')
+    assert refused.status_code == 503
+    assert refused.headers['Retry-After'] == '5'
+
+    running.close()
+    assert client.get('/api/food-entries/export').status_code == 200
+
+
+def test_search_food(client):
+    """Test the seeded catalog is searchable"""
+    response = client.get('/api/search-food?q=chicken')
+    assert response.status_code == 200
+    assert any('Chicken' in food['name'] for food in response.get_json())
+
+
+def test_search_result_id_logs_food(client):
+    """Test the id from a search result can be posted as food_id"""
+    banana = client.get('/api/search-food?q=banana').get_json()[0]
+    response = client.post('/api/food-entries', json={
+        'food_id': banana['id'], 'quantity': 100, 'meal_type': 'snack', 'timestamp': '2024-03-01T10:00:00'
+    })
+    assert response.status_code == 200
+    entry = client.get('/api/food-entries?date=2024-03-01').get_json()['entries'][0]
+    assert (entry['food_name'], entry['calories']) == (banana['name'], banana['calories_per_100g'])
+
+
+def test_food_entries_conditional_get(client, monkeypatch):
+    """Test a matching If-None-Match gets a bare 304 until the day is written again"""
+    url = '/api/food-entries?date=2024-03-01'
+    first = client.get(url)
+    etag = first.headers['ETag']
+    assert first.headers['Cache-Control'] == 'private, no-cache'
+    assert client.get(url + '&entries=false').headers['ETag'] != etag
+
+    def fail(*args, **kwargs):
+        raise AssertionError("intake loaded for a conditional hit")
+    with monkeypatch.context() as m:
+        m.setattr(FoodTrackingService, 'get_daily_intake', fail)
+        cached = client.get(url, headers={'If-None-Match': etag})
+    assert cached.status_code == 304
+    assert cached.data == b''
+    assert cached.headers['ETag'] == etag
+
+    client.post('/api/food-entries', json={
+        'food_name': 'Apple', 'calories_per_100g': 52, 'quantity': 100,
+        'meal_type': 'snack', 'timestamp': '2024-03-01T10:00:00'
+    })
+    fresh = client.get(url, headers={'If-None-Match': etag})
+    assert fresh.status_code == 200
+    assert fresh.get_json()['entry_count'] == 1
+    assert fresh.headers['ETag'] != etag
+
+
+def test_search_food_conditional_get(client):
+    """Test catalog searches are publicly cacheable and revalidate to 304"""
+    response = client.get('/api/search-food?q=chicken')
+    assert response.headers['Cache-Control'] == 'public, max-age=300'
+    cached = client.get('/api/search-food?q=chicken',
+                        headers={'If-None-Match': response.headers['ETag']})
+    assert cached.status_code == 304
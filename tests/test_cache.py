@@ -0,0 +1,82 @@
+"""
+Cache Backend Tests
+"""
+
+import time
+from datetime import datetime
+
+import pytest
+from app.database.memory import InMemoryDatabaseManager
+from app.models.food import FoodEntry, FoodItem, MealType
+from app.services.cache import MISSING, MemoryCache, SQLiteCache, create_cache
+from app.services.food_tracker import FoodTrackingService
+
+
+def test_memory_cache_evicts_least_recently_used():
+    """Test the LRU entry goes first once max_entries is exceeded"""
+    cache = MemoryCache(max_entries=2)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    assert cache.get('a') == 1
+    cache.set('c', 3)
+    assert cache.get('b') is MISSING
+    assert cache.get('a') == 1
+    assert cache.stats.evictions == 1
+    assert (cache.stats.hits, cache.stats.misses) == (2, 1)
+
+
+def test_memory_cache_expires_entries():
+    """Test entries older than the TTL are treated as misses"""
+    cache = MemoryCache(ttl=0.01)
+    cache.set('a', 1)
+    time.sleep(0.02)
+    assert cache.get('a') is MISSING
+    assert cache.stats.evictions == 1
+
+
+def test_sqlite_cache_is_shared_between_instances(tmp_path):
+    """Test two workers pointing at one file see each other's writes and deletes"""
+    path = str(tmp_path / "cache.db")
+    worker_a, worker_b = SQLiteCache(path), SQLiteCache(path)
+    worker_a.set('day', {'total_calories': 1200.0})
+    assert worker_b.get('day') == {'total_calories': 1200.0}
+    worker_b.delete('day')
+    assert worker_a.get('day') is MISSING
+    assert worker_b.stats.invalidations == 1
+
+
+def test_sqlite_cache_bounds_size(tmp_path):
+    """Test the least recently accessed rows are evicted beyond max_entries"""
+    cache = SQLiteCache(str(tmp_path / "cache.db"), max_entries=2)
+    cache.set('a', 1)
+    time.sleep(0.001)
+    cache.set('b', 2)
+    time.sleep(0.001)
+    cache.set('c', 3)
+    assert cache.get('a') is MISSING
+    assert cache.get('c') == 3
+    assert cache.stats.evictions == 1
+
+
+class BrokenCache(MemoryCache):
+    """Backend that is down: every operation raises"""
+
+    def get(self, *args):
+        raise ConnectionError("cache unreachable")
+
+    set = delete = get
+
+
+def test_cache_failures_fall_back_to_database():
+    """Test writes and reads succeed from the database while the cache backend is down"""
+    service = FoodTrackingService(InMemoryDatabaseManager(), cache=BrokenCache())
+    service.add_food_entry(FoodEntry(MealType.LUNCH, FoodItem('Rice', 130, 200), datetime(2024, 3, 1, 12)))
+    intake = service.get_daily_intake('2024-03-01', version=1)
+    assert intake['entry_count'] == 1
+    assert service.cache.stats.errors == 3
+
+
+def test_redis_backend_requires_url():
+    """Test a redis cache without a URL is rejected instead of failing on first use"""
+    with pytest.raises(ValueError):
+        create_cache('redis', url=None)
@@ -0,0 +1,81 @@
+"""
+Calorie Calculator Tests
+"""
+
+import random
+
+import pytest
+from app.models.user import User, Gender, ActivityLevel
+from app.services.calorie_calculator import CalorieCalculatorService
+
+
+def test_batch_matches_scalar_calculation():
+    """Test the vectorized path returns exactly what the per-user path does"""
+    rng = random.Random(7)
+    levels = [level.value for level in ActivityLevel]
+    rows = [
+        (rng.choice([rng.randint(18, 90), round(rng.uniform(1, 120.9), 1)]), rng.choice(['male', 'female']),
+         round(rng.uniform(40, 150), 1), round(rng.uniform(140, 210), 1), rng.choice(levels))
+        for _ in range(200)
+    ]
+    service = CalorieCalculatorService()
+    batch = service.calculate_batch(*map(list, zip(*rows)))
+    assert batch['errors'] == []
+    for i, (age, gender, weight, height, level) in enumerate(rows):
+        # The API truncates ages with int(), like parse_user
+        user = User(int(age), Gender(gender), weight, height, ActivityLevel(level))
+        expected = service.calculate_daily_calories(user)
+        assert {key: batch[key][i] for key in expected} == expected
+
+
+def test_batch_reports_per_row_errors():
+    """Test invalid rows yield None columns and an error, leaving others intact"""
+    batch = CalorieCalculatorService().calculate_batch(
+        [30, 0, 30, 'x'], ['male', 'female', 'other', 'male'],
+        [80, 60, 70, 70], [180, 165, 170, 170], [1.2, 1.55, 1.2, 1.2]
+    )
+    assert batch['bmr'][0] == 1780.0
+    assert batch['bmr'][1:] == [None, None, None]
+    assert batch['errors'] == [
+        {'index': 1, 'error': "Age must be between 1 and 120"},
+        {'index': 2, 'error': "Gender must be 'male' or 'female'"},
+        {'index': 3, 'error': "Numeric fields must be numbers"},
+    ]
+
+
+def test_formulas_match_published_equations():
+    """Test table-driven formulas reproduce the reference equations"""
+    service = CalorieCalculatorService()
+    male = User(40, Gender.MALE, 80, 180, ActivityLevel.SEDENTARY, body_fat_percentage=20)
+    female = User(25, Gender.FEMALE, 60, 165, ActivityLevel.SEDENTARY)
+    bmr = lambda user, formula: service.calculate_daily_calories(user, formula)['bmr']
+
+    assert bmr(male, 'mifflin_st_jeor') == round(10 * 80 + 6.25 * 180 - 5 * 40 + 5, 1)
+    assert bmr(male, 'harris_benedict') == round(88.362 + 13.397 * 80 + 4.799 * 180 - 5.677 * 40, 1)
+    assert bmr(male, 'katch_mcardle') == round(370 + 21.6 * 64, 1)
+    # Schofield picks the 18-30 band for a 25 year old woman (MJ/day -> kcal)
+    assert bmr(female, 'schofield') == round((0.062 * 60 + 2.036) * 239.005736, 1)
+
+
+def test_katch_mcardle_requires_body_fat():
+    """Test lean-mass formulas reject users and rows without body fat"""
+    service = CalorieCalculatorService()
+    user = User(30, Gender.FEMALE, 60, 165, ActivityLevel.SEDENTARY)
+    with pytest.raises(ValueError):
+        service.calculate_daily_calories(user, 'katch_mcardle')
+    batch = service.calculate_batch([30, 30], ['female'] * 2, [60, 60], [165, 165], [1.2, 1.2],
+                                    body_fat_percentages=[None, 25], formula='katch_mcardle')
+    assert batch['bmr'] == [None, round(370 + 21.6 * 45, 1)]
+    assert batch['errors'][0]['error'] == "Katch-McArdle requires body fat percentage"
+
+
+@pytest.mark.parametrize('formula', ['harris_benedict', 'schofield', 'katch_mcardle'])
+def test_batch_matches_scalar_for_every_formula(formula):
+    """Test scalar and vectorized paths share the same kernel for each table"""
+    service = CalorieCalculatorService()
+    rows = [(age, gender, 70.0, 172.0, 1.55, 22.0) for age in (2, 5, 15, 25, 45, 75)
+            for gender in ('male', 'female')]
+    batch = service.calculate_batch(*map(list, zip(*rows)), formula=formula)
+    for i, (age, gender, weight, height, level, body_fat) in enumerate(rows):
+        user = User(age, Gender(gender), weight, height, ActivityLevel(level), body_fat)
+        assert batch['tdee'][i] == service.calculate_daily_calories(user, formula)['tdee']
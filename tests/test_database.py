@@ -0,0 +1,32 @@
+"""
+Database Layer Tests
+
+Covers query helpers that do not need a running PostgreSQL server.
+"""
+
+from datetime import date, datetime
+
+from app.database.models import day_bounds, next_month, partition_name, partition_range
+
+
+def test_day_bounds_is_half_open_range():
+    """Test daily lookups span exactly one day starting at midnight"""
+    start, end = day_bounds('2024-02-28')
+    assert start == datetime(2024, 2, 28)
+    assert end == datetime(2024, 2, 29)
+    assert day_bounds(date(2024, 2, 28)) == (start, end)
+
+
+def test_monthly_partition_names_and_bounds():
+    """Test partitions are named by month and roll over year ends"""
+    assert partition_name(date(2024, 3, 1)) == 'food_entries_p202403'
+    assert next_month(date(2024, 1, 31)) == date(2024, 2, 1)
+    assert next_month(date(2024, 12, 15)) == date(2025, 1, 1)
+
+
+def test_partition_range_parses_pg_bounds():
+    """Test pg_get_expr bounds become day ranges, with MINVALUE open and DEFAULT rangeless"""
+    assert partition_range("FOR VALUES FROM ('2024-03-01 00:00:00') TO ('2024-04-01 00:00:00')") == (
+        date(2024, 3, 1), date(2024, 4, 1))
+    assert partition_range("FOR VALUES FROM (MINVALUE) TO ('2024-04-01 00:00:00')") == (None, date(2024, 4, 1))
+    assert partition_range("DEFAULT") is None
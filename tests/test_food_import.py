@@ -0,0 +1,72 @@
+"""
+Food Import Tests
+
+Streams small CSV/JSONL files into a temporary SQLite catalog.
+"""
+
+import json
+
+import pytest
+from app.database.food_data import FoodDatabase
+from app.database.food_import import FoodImporter
+
+
+@pytest.fixture
+def food_db(tmp_path):
+    food_db = FoodDatabase(str(tmp_path / "foods.db"), search_engine='like')
+    food_db.initialize()
+    return food_db
+
+
+def write_csv(path, rows):
+    lines = ["name,calories_per_100g,category"] + [f"{n},{c},{g}" for n, c, g in rows]
+    path.write_text("\n".join(lines) + "\n")
+
+
+def test_import_upserts_and_skips_invalid_rows(food_db, tmp_path):
+    """Test new rows are inserted, existing names updated and bad rows skipped"""
+    source = tmp_path / "foods.csv"
+    write_csv(source, [("Apple", 55, "Fruits"), ("Kiwi", 61, "Fruits"), ("Broken", "n/a", "Fruits")])
+    report = FoodImporter(food_db, chunk_size=2).import_file(str(source))
+    assert (report.rows_read, report.rows_imported, report.rows_skipped) == (3, 2, 1)
+    assert food_db.get_food_by_name("apple")["calories_per_100g"] == 55
+    assert food_db.get_food_by_name("kiwi")["category"] == "Fruits"
+
+
+def test_import_skips_non_finite_calories(food_db, tmp_path):
+    """Test NaN and infinite calorie values are skipped rather than stored"""
+    source = tmp_path / "foods.csv"
+    write_csv(source, [("Apple", 55, "Fruits"), ("Ghost", "nan", "Fruits"), ("Star", "inf", "Fruits")])
+    report = FoodImporter(food_db).import_file(str(source))
+    assert (report.rows_imported, report.rows_skipped) == (1, 2)
+    assert food_db.get_food_by_name("Ghost") is None
+
+
+def test_import_maps_jsonl_columns(food_db, tmp_path):
+    """Test JSON Lines input with renamed columns"""
+    source = tmp_path / "usda.jsonl"
+    source.write_text(json.dumps({"description": "Rambutan", "kcal": 82, "group": "Fruits"}) + "\n")
+    importer = FoodImporter(food_db, columns={"name": "description", "calories_per_100g": "kcal",
+                                              "category": "group"})
+    importer.import_file(str(source))
+    assert food_db.get_food_by_name("Rambutan")["calories_per_100g"] == 82
+
+
+def test_interrupted_import_resumes_after_last_chunk(food_db, tmp_path):
+    """Test a rerun skips chunks that were already committed"""
+    source = tmp_path / "foods.csv"
+    write_csv(source, [(f"Food {i}", 100 + i, "Snacks") for i in range(5)])
+    importer = FoodImporter(food_db, chunk_size=2)
+
+    def crash(report):
+        raise KeyboardInterrupt
+
+    with pytest.raises(KeyboardInterrupt):
+        importer.import_file(str(source), progress=crash)
+    assert food_db.get_food_by_name("Food 1") is not None
+    assert food_db.get_food_by_name("Food 2") is None
+
+    report = importer.import_file(str(source))
+    assert report.resumed_from == 2
+    assert report.rows_read == 3
+    assert food_db.get_food_by_name("Food 4") is not None
@@ -0,0 +1,237 @@
+"""
+Food Search Tests
+
+Runs FoodDatabase against a temporary SQLite file with each search engine.
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from app.database.food_data import FoodDatabase
+from app.database.food_index import FoodCatalogIndex
+from app.database.food_snapshot import CatalogSnapshot, build_snapshot
+from app.services.cache import MemoryCache
+
+
+@pytest.fixture(params=['like', 'index', 'fts', 'snapshot'])
+def food_db(request, tmp_path):
+    """Seeded catalog using each search engine"""
+    food_db = FoodDatabase(str(tmp_path / "foods.db"), search_engine=request.param,
+                           index_refresh_interval=0)
+    food_db.initialize()
+    return food_db
+
+
+def names(results):
+    return [food['name'] for food in results]
+
+
+def test_search_finds_substring_matches(food_db):
+    """Test every engine finds names containing the query"""
+    assert set(names(food_db.search_food('juice'))) == {'Apple Juice', 'Orange Juice'}
+
+
+def test_search_results_carry_catalog_ids(food_db):
+    """Test every engine returns the same rows lookup_food resolves by id"""
+    for food in food_db.search_food('apple'):
+        assert food_db.lookup_food(food_id=food['id']) == food
+
+
+def test_search_filters_by_category(food_db):
+    """Test category narrows results"""
+    assert names(food_db.search_food('apple', category='Beverages')) == ['Apple Juice']
+
+
+def test_index_ranks_prefix_before_substring():
+    """Test exact and prefix matches outrank word-prefix and substring matches"""
+    index = FoodCatalogIndex([
+        (1, "Pineapple", 50, "Fruits"),
+        (2, "Apple Juice", 46, "Beverages"),
+        (3, "Apple", 52, "Fruits"),
+        (4, "Green Apple", 48, "Fruits"),
+    ])
+    assert names(index.search('apple')) == ['Apple', 'Apple Juice', 'Green Apple', 'Pineapple']
+    assert names(index.search('ap', limit=2)) == ['Apple', 'Apple Juice']
+
+
+def test_index_rebuilds_after_catalog_change(tmp_path):
+    """Test new foods become searchable once the catalog version changes"""
+    food_db = FoodDatabase(str(tmp_path / "foods.db"), search_engine='index',
+                           index_refresh_interval=0)
+    food_db.initialize()
+    assert food_db.search_food('dragon fruit') == []
+    with food_db.connect() as conn:
+        conn.execute("INSERT INTO food_database (name, calories_per_100g, category) "
+                     "VALUES ('Dragon Fruit', 60, 'Fruits')")
+    assert names(food_db.search_food('dragon fruit')) == ['Dragon Fruit']
+
+
+def test_index_invalidate_forces_rebuild_soon_after_boot(tmp_path, monkeypatch):
+    """Test invalidate() rebuilds the index even while monotonic() is below the refresh interval"""
+    monkeypatch.setattr('time.monotonic', lambda: 1.0)
+    food_db = FoodDatabase(str(tmp_path / "foods.db"), search_engine='index',
+                           index_refresh_interval=60)
+    food_db.initialize()
+    assert food_db.search_food('dragon fruit') == []
+    with food_db.connect() as conn:
+        conn.execute("INSERT INTO food_database (name, calories_per_100g, category) "
+                     "VALUES ('Dragon Fruit', 60, 'Fruits')")
+    food_db.invalidate()
+    assert names(food_db.search_food('dragon fruit')) == ['Dragon Fruit']
+
+
+def test_index_rebuild_does_not_block_searches(tmp_path, monkeypatch):
+    """Test other threads keep searching the old index while one thread rebuilds it"""
+    food_db = FoodDatabase(str(tmp_path / "foods.db"), search_engine='index',
+                           index_refresh_interval=0)
+    food_db.initialize()
+    assert food_db.search_food('dragon fruit') == []
+    with food_db.connect() as conn:
+        conn.execute("INSERT INTO food_database (name, calories_per_100g, category) "
+                     "VALUES ('Dragon Fruit', 60, 'Fruits')")
+
+    rebuilding, release = threading.Event(), threading.Event()
+    iter_foods = food_db.iter_foods
+    def slow_iter_foods():
+        rebuilding.set()
+        release.wait(5)
+        return iter_foods()
+    monkeypatch.setattr(food_db, 'iter_foods', slow_iter_foods)
+
+    with ThreadPoolExecutor(1) as pool:
+        refreshed = pool.submit(food_db.search_food, 'dragon fruit')
+        assert rebuilding.wait(5)
+        assert food_db.search_food('dragon fruit') == []
+        release.set()
+        assert names(refreshed.result(5)) == ['Dragon Fruit']
+
+
+def test_fts_ranks_and_follows_catalog_changes(tmp_path):
+    """Test FTS5 prefix tokens match and triggers keep the index in sync"""
+    food_db = FoodDatabase(str(tmp_path / "foods.db"), search_engine='fts')
+    food_db.initialize()
+    assert names(food_db.search_food('whole whe')) == ['Whole Wheat Bread']
+    with food_db.connect() as conn:
+        conn.execute("UPDATE food_database SET name = 'Wholemeal Bread' WHERE name = 'Whole Wheat Bread'")
+    assert food_db.search_food('whole whe') == []
+    assert names(food_db.search_food('wholemeal')) == ['Wholemeal Bread']
+
+
+def test_fts_falls_back_to_like(tmp_path, monkeypatch):
+    """Test the FTS engine degrades to LIKE when FTS5 is not compiled in"""
+    monkeypatch.setattr('app.database.food_search.fts5_available', lambda: False)
+    food_db = FoodDatabase(str(tmp_path / "foods.db"), search_engine='fts')
+    food_db.initialize()
+    assert set(names(food_db.search_food('uice'))) == {'Apple Juice', 'Orange Juice'}
+
+
+def test_snapshot_matches_index_ranking(tmp_path):
+    """Test the mapped snapshot ranks and filters exactly like the in-memory index"""
+    food_db = FoodDatabase(str(tmp_path / "foods.db"), search_engine='like')
+    food_db.initialize()
+    with food_db.connect() as conn:
+        brulee_id = conn.execute("INSERT INTO food_database (name, calories_per_100g, category) "
+                                 "VALUES ('Crème Brûlée', 52.3, 'Desserts')").lastrowid
+    build_snapshot(food_db, food_db.snapshot_path)
+    snapshot = CatalogSnapshot(food_db.snapshot_path)
+    index = FoodCatalogIndex(food_db.iter_foods())
+
+    assert len(snapshot) == len(index)
+    for query in ('apple', 'ap', 'o', 'cheese', 'oil', 'brûl', 'zzz'):
+        assert snapshot.search(query) == index.search(query)
+    assert snapshot.search('e', category='Nuts') == index.search('e', category='Nuts')
+    assert snapshot.get('CRÈME BRÛLÉE') == {'id': brulee_id, 'name': 'Crème Brûlée',
+                                           'calories_per_100g': 52.3, 'category': 'Desserts'}
+
+
+def test_snapshot_serves_lookups_without_sqlite(tmp_path, monkeypatch):
+    """Test search and lookups read only the mapped file once it is loaded"""
+    food_db = FoodDatabase(str(tmp_path / "foods.db"), search_engine='snapshot',
+                           index_refresh_interval=60)
+    food_db.initialize()
+    apple = food_db.get_food_by_name('apple')
+
+    def no_sqlite():
+        raise AssertionError("snapshot engine queried SQLite")
+    monkeypatch.setattr(food_db, 'connect', no_sqlite)
+    assert food_db.lookup_food(name='APPLE') == apple
+    assert food_db.lookup_food(food_id=apple['id']) == apple
+    assert food_db.lookup_food(name='Dragonfruit') is None
+    assert names(food_db.search_food('apple', limit=2)) == ['Apple', 'Apple Juice']
+
+
+def test_snapshot_hot_swaps_on_publish(tmp_path):
+    """Test a published snapshot replaces the mapped one while old readers keep working"""
+    food_db = FoodDatabase(str(tmp_path / "foods.db"), search_engine='snapshot',
+                           index_refresh_interval=0)
+    food_db.initialize()
+    old = food_db.search_engine.snapshot
+    old_version = food_db.search_version()
+    with food_db.connect() as conn:
+        conn.execute("INSERT INTO food_database (name, calories_per_100g, category) "
+                     "VALUES ('Dragon Fruit', 60, 'Fruits')")
+    # Unpublished edits are not visible
+    assert food_db.search_food('dragon') == []
+
+    food_db.search_engine.publish()
+    assert names(food_db.search_food('dragon')) == ['Dragon Fruit']
+    assert food_db.search_version() > old_version
+    assert old.search('dragon') == [] and names(old.search('apple', limit=1)) == ['Apple']
+    assert not list(tmp_path.glob('.*.tmp'))
+
+
+def test_snapshot_engine_falls_back_to_like(tmp_path):
+    """Test searches still work before any snapshot has been published"""
+    food_db = FoodDatabase(str(tmp_path / "foods.db"), search_engine='snapshot',
+                           index_refresh_interval=0)
+    food_db.init_food_database()
+    food_db.populate_food_data()
+    assert food_db.search_engine.snapshot is None
+    assert set(names(food_db.search_food('juice'))) == {'Apple Juice', 'Orange Juice'}
+    assert food_db.lookup_food(name='apple')['name'] == 'Apple'
+
+
+def test_lookup_food_uses_nocase_index_and_cache(tmp_path):
+    """Test lookups ignore case, seek the NOCASE index and are served from the cache"""
+    food_db = FoodDatabase(str(tmp_path / "foods.db"), search_engine='like',
+                           index_refresh_interval=60, food_cache=MemoryCache())
+    food_db.initialize()
+    with food_db.connect() as conn:
+        plan = conn.execute("EXPLAIN QUERY PLAN SELECT id FROM food_database "
+                            "WHERE name = ? COLLATE NOCASE", ("apple",)).fetchall()
+    assert 'idx_food_database_name_nocase' in str(plan)
+
+    apple = food_db.lookup_food(name='APPLE')
+    assert apple['name'] == 'Apple'
+    assert food_db.lookup_food(food_id=apple['id']) == apple
+    assert food_db.lookup_food(name='apple') == apple
+    assert food_db.lookup_food(name='Dragonfruit') is None
+    assert food_db.food_cache.stats.hits == 1
+    assert food_db.food_cache.stats.misses == 3
+
+
+def test_food_cache_invalidate_soon_after_boot(tmp_path, monkeypatch):
+    """Test invalidate() drops stale cached foods even while monotonic() is below the refresh interval"""
+    monkeypatch.setattr('time.monotonic', lambda: 1.0)
+    food_db = FoodDatabase(str(tmp_path / "foods.db"), search_engine='like',
+                           index_refresh_interval=60, food_cache=MemoryCache())
+    food_db.initialize()
+    assert food_db.lookup_food(name='Apple')['calories_per_100g'] == 52
+    with food_db.connect() as conn:
+        conn.execute("UPDATE food_database SET calories_per_100g = 55 WHERE name = 'Apple'")
+    food_db.invalidate()
+    assert food_db.lookup_food(name='Apple')['calories_per_100g'] == 55
+
+
+def test_food_cache_keys_fold_case_like_nocase(tmp_path):
+    """Test non-ASCII spellings NOCASE tells apart never share a cache entry"""
+    food_db = FoodDatabase(str(tmp_path / "foods.db"), search_engine='like',
+                           index_refresh_interval=60, food_cache=MemoryCache())
+    food_db.initialize()
+    with food_db.connect() as conn:
+        conn.execute("INSERT INTO food_database (name, calories_per_100g, category) "
+                     "VALUES ('Crème Brûlée', 300, 'Desserts')")
+    assert food_db.lookup_food(name='crème brûlée')['name'] == 'Crème Brûlée'
+    assert food_db.lookup_food(name='CRÈME BRÛLÉE') == food_db.get_food_by_name('CRÈME BRÛLÉE') is None
+    assert food_db.lookup_food(name='CRèME BRûLéE')['name'] == 'Crème Brûlée'
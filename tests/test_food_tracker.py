@@ -0,0 +1,102 @@
+"""
+Food Tracking Service Tests
+
+Uses a stub DatabaseManager so no PostgreSQL server is required.
+"""
+
+from datetime import date, datetime
+
+from app.database.memory import InMemoryDatabaseManager
+from app.models.food import FoodEntry, FoodEntryRow, FoodItem, MealType
+from app.services.cache import MemoryCache
+from app.services.food_tracker import FoodTrackingService
+
+
+class StubDatabaseManager:
+    """Returns canned rows for one day"""
+
+    def __init__(self, entries):
+        self.entries = entries
+        self.queries = 0
+
+    def save_food_entry(self, entry):
+        self.entries.append(entry)
+        return len(self.entries)
+
+    def get_daily_entries(self, date_str, user_id):
+        self.queries += 1
+        return [FoodEntryRow.from_entry(entry) for entry in self.entries]
+
+    def get_daily_summary(self, date_str, user_id):
+        self.queries += 1
+        totals = {}
+        for entry in self.entries:
+            calories, count = totals.get(entry.meal_type.value, (0.0, 0))
+            totals[entry.meal_type.value] = (calories + entry.calories, count + 1)
+        return totals
+
+
+def make_entries():
+    when = datetime(2024, 3, 1, 12)
+    return [
+        FoodEntry(MealType.BREAKFAST, FoodItem("Oats", 389, 50), when),
+        FoodEntry(MealType.LUNCH, FoodItem("Salmon", 208, 150), when),
+        FoodEntry(MealType.LUNCH, FoodItem("White Rice", 130, 200), when),
+    ]
+
+
+def test_summary_does_not_load_entries():
+    """Test the default path returns aggregates only"""
+    service = FoodTrackingService(StubDatabaseManager(make_entries()))
+    intake = service.get_daily_intake(date(2024, 3, 1))
+    assert 'entries' not in intake
+    assert intake['entry_count'] == 3
+    assert intake['total_calories'] == 766.5
+    assert intake['meal_breakdown'] == {'breakfast': 194.5, 'lunch': 572.0, 'dinner': 0, 'snack': 0}
+
+
+def test_entries_path_matches_summary():
+    """Test both paths agree and entries are returned only on request"""
+    service = FoodTrackingService(StubDatabaseManager(make_entries()))
+    summary = service.get_daily_intake('2024-03-01')
+    detailed = service.get_daily_intake('2024-03-01', include_entries=True)
+    entries = detailed.pop('entries')
+    assert [entry.calories for entry in entries] == [194.5, 312.0, 260.0]
+    assert entries[1].to_dict()['meal_type'] == 'lunch'
+    assert detailed == summary
+
+
+def test_cached_summary_is_invalidated_by_writes_to_that_day():
+    """Test repeat reads hit the cache until an entry for the same day is added"""
+    db = StubDatabaseManager(make_entries())
+    service = FoodTrackingService(db, cache=MemoryCache())
+    service.get_daily_intake(date(2024, 3, 1))
+    service.get_daily_intake(date(2024, 3, 2))
+    service.get_daily_intake(date(2024, 3, 1))
+    assert db.queries == 2
+
+    service.add_food_entry(FoodEntry(MealType.SNACK, FoodItem("Apple", 52, 100), datetime(2024, 3, 1, 16)))
+    assert service.get_daily_intake(date(2024, 3, 1))['entry_count'] == 4
+    service.get_daily_intake(date(2024, 3, 2))
+    assert db.queries == 3
+    assert service.cache.stats.invalidations == 1
+
+
+def test_range_intake_dense_days_and_rolling_average():
+    """Test empty days are zero-filled and the trailing average spans the window"""
+    db = InMemoryDatabaseManager()
+    db.save_food_entries([
+        FoodEntry(MealType.LUNCH, FoodItem('Rice', 100, 1000), datetime(2024, 3, 1, 12)),
+        FoodEntry(MealType.DINNER, FoodItem('Pasta', 100, 2000), datetime(2024, 3, 3, 19)),
+        FoodEntry(MealType.SNACK, FoodItem('Nuts', 600, 100), datetime(2024, 3, 3, 16)),
+    ])
+    service = FoodTrackingService(db)
+
+    intake = service.get_range_intake(date(2024, 3, 1), date(2024, 3, 4), tdee=1500, window=2)
+
+    assert [day['total_calories'] for day in intake['days']] == [1000.0, 0.0, 2600.0, 0.0]
+    assert [day['rolling_average'] for day in intake['days']] == [1000.0, 500.0, 1300.0, 1300.0]
+    assert intake['days'][2]['meal_breakdown']['snack'] == 600.0
+    assert intake['days'][0]['vs_tdee'] == -500.0
+    assert intake['days_logged'] == 2
+    assert intake['average_calories'] == 900.0
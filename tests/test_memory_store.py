@@ -0,0 +1,85 @@
+"""
+In-Memory Store Tests
+
+The memory:// stand-in must answer like DatabaseManager so benchmarks and
+tests exercise the real services.
+"""
+
+from datetime import datetime
+
+from app import create_app
+from app.extensions import get_registry
+from app.database.memory import InMemoryDatabaseManager, is_memory_url, SEED_START
+from app.models.food import DEFAULT_USER_ID, FoodEntry, FoodItem, MealType
+from config.settings import TestingConfig
+
+
+def test_is_memory_url():
+    """Test only the memory scheme selects the stand-in"""
+    assert is_memory_url('memory://')
+    assert is_memory_url('memory://?entries=10')
+    assert not is_memory_url('postgresql://localhost/calorie_tracker')
+
+
+def test_entries_ordered_and_summarized_per_day():
+    """Test daily reads return timestamp order and grouped meal totals"""
+    db = InMemoryDatabaseManager()
+    later = FoodEntry(MealType.DINNER, FoodItem('Rice', 130, 200), datetime(2024, 2, 1, 19))
+    earlier = FoodEntry(MealType.BREAKFAST, FoodItem('Oats', 380, 50), datetime(2024, 2, 1, 8))
+    other_day = FoodEntry(MealType.LUNCH, FoodItem('Soup', 40, 300), datetime(2024, 2, 2, 12))
+    ids = db.save_food_entries([later, earlier])
+    db.save_food_entry(other_day)
+
+    assert ids == [1, 2]
+    assert [e.food_name for e in db.get_daily_entries('2024-02-01')] == ['Oats', 'Rice']
+    assert db.get_daily_summary('2024-02-01') == {'dinner': (260.0, 1), 'breakfast': (190.0, 1)}
+
+
+def test_reads_are_scoped_to_one_user():
+    """Test entries, summaries, versions and exports never cross users"""
+    db = InMemoryDatabaseManager()
+    when = datetime(2024, 2, 1, 12)
+    db.save_food_entries([
+        FoodEntry(MealType.LUNCH, FoodItem('Rice', 130, 100), when, 'alice'),
+        FoodEntry(MealType.LUNCH, FoodItem('Soup', 40, 100), when, 'bob'),
+    ])
+
+    assert [e.food_name for e in db.get_daily_entries('2024-02-01', 'alice')] == ['Rice']
+    assert db.get_daily_summary('2024-02-01', 'bob') == {'lunch': (40.0, 1)}
+    assert db.get_daily_entries('2024-02-01') == []
+    assert [row[0] for row in db.iter_food_entries(user_id='bob')] == ['Soup']
+
+    version = db.get_day_version('2024-02-01', 'alice')
+    db.save_food_entry(FoodEntry(MealType.DINNER, FoodItem('Bread', 250, 50), when, 'bob'))
+    assert db.get_day_version('2024-02-01', 'alice') == version
+
+
+def test_seeded_from_url():
+    """Test URL parameters seed a deterministic log across days"""
+    db = InMemoryDatabaseManager('memory://?entries=100&days=4')
+    counts = [sum(c for _, c in db.get_daily_summary(SEED_START.replace(day=d)).values())
+              for d in range(1, 5)]
+    assert counts == [25, 25, 25, 25]
+
+
+def test_rollup_check_and_rebuild_commands(tmp_path):
+    """Test `flask rollup check` flags a drifted rollup and `rebuild` repairs it"""
+    class Config(TestingConfig):
+        DATABASE_URL = 'memory://?entries=40&days=4'
+        FOOD_DB_PATH = str(tmp_path / 'foods.db')
+    app = create_app(Config)
+    runner = app.test_cli_runner()
+    db = get_registry(app).get('db_manager')
+    assert runner.invoke(args=['rollup', 'check']).exit_code == 0
+
+    db._totals[(DEFAULT_USER_ID, SEED_START)]['lunch'] = (1.0, 1)
+    result = runner.invoke(args=['rollup', 'check', '--start', SEED_START.isoformat()])
+    assert result.exit_code == 1
+    assert 'lunch' in result.output
+
+    version = db.get_day_version(SEED_START)
+    result = runner.invoke(args=['rollup', 'rebuild', '--start', SEED_START.isoformat(),
+                                 '--end', SEED_START.isoformat()])
+    assert 'Rebuilt' in result.output
+    assert db.get_day_version(SEED_START) > version
+    assert runner.invoke(args=['rollup', 'check']).exit_code == 0
@@ -0,0 +1,83 @@
+"""
+Metrics Tests
+
+Histograms must render valid cumulative buckets, the middleware must time
+real routes and queries, and METRICS_ENABLED=false must switch it all off.
+"""
+
+import time
+
+import pytest
+from app import create_app
+from app.metrics import MetricsRegistry, REGISTRY
+from config.settings import TestingConfig
+
+# Per-span budget; a span is two perf_counter calls and a locked bucket update
+SPAN_BUDGET_SECONDS = 20e-6
+
+
+@pytest.fixture
+def make_app(tmp_path):
+    def make(enabled=True):
+        class Config(TestingConfig):
+            DATABASE_URL = 'memory://'
+            FOOD_DB_PATH = str(tmp_path / 'foods.db')
+            METRICS_ENABLED = enabled
+        app = create_app(Config)
+        app.test_cli_runner().invoke(args=['init-db'])
+        return app
+    REGISTRY.reset()
+    yield make
+    REGISTRY.enabled = True
+    REGISTRY.reset()
+
+
+def test_histogram_renders_cumulative_buckets():
+    """Test bucket counts are cumulative and end with +Inf, sum and count"""
+    registry = MetricsRegistry()
+    histogram = registry.histogram('op_seconds', 'Op latency', ('op',), buckets=(0.1, 1.0))
+    for seconds in (0.05, 0.5, 5.0):
+        histogram.observe(seconds, 'read')
+
+    lines = registry.render().splitlines()
+    assert 'op_seconds_bucket{op="read",le="0.1"} 1' in lines
+    assert 'op_seconds_bucket{op="read",le="1.0"} 2' in lines
+    assert 'op_seconds_bucket{op="read",le="+Inf"} 3' in lines
+    assert 'op_seconds_count{op="read"} 3' in lines
+
+
+def test_metrics_endpoint_reports_routes_queries_and_cache(make_app):
+    """Test requests, SQLite queries, JSON phases and cache counters are exposed"""
+    client = make_app().test_client()
+    client.get('/api/search-food?q=apple')
+    client.get('/api/food-entries?date=2024-01-01')
+    client.get('/api/food-entries?date=2024-01-01')
+
+    body = client.get('/metrics').get_data(as_text=True)
+    assert 'http_request_duration_seconds_count{method="GET",route="/api/search-food",status="200"} 1' in body
+    assert 'db_query_duration_seconds_count{store="sqlite",query="search_food"} 1' in body
+    assert 'request_phase_seconds_count{phase="json_serialize"}' in body
+    assert 'cache_hits_total{cache="intake"} 1' in body
+
+
+def test_metrics_disabled(make_app):
+    """Test the toggle removes /metrics and records nothing"""
+    client = make_app(enabled=False).test_client()
+    client.get('/api/search-food?q=apple')
+
+    assert client.get('/metrics').status_code == 404
+    assert 'http_request_duration_seconds_count' not in REGISTRY.render()
+
+
+def test_span_overhead(record_property):
+    """Measure the cost of one enabled span and keep it within budget"""
+    registry = MetricsRegistry()
+    histogram = registry.histogram('span_seconds', 'Span cost', ('phase',))
+    spans = 20000
+    start = time.perf_counter()
+    for _ in range(spans):
+        with histogram.time('noop'):
+            pass
+    per_span = (time.perf_counter() - start) / spans
+    record_property('span_seconds', round(per_span, 9))
+    assert per_span < SPAN_BUDGET_SECONDS
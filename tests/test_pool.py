@@ -0,0 +1,75 @@
+"""
+Connection Pool Tests
+
+Exercises ConnectionPool against sqlite3 connections as a stand-in for PostgreSQL.
+"""
+
+import os
+import sqlite3
+import threading
+
+import pytest
+from app.database.pool import ConnectionPool, PoolTimeoutError
+
+
+def sqlite_connect():
+    return sqlite3.connect(':memory:', check_same_thread=False)
+
+
+def test_connections_are_reused():
+    """Test returned connections are handed out again instead of reopened"""
+    pool = ConnectionPool(sqlite_connect, min_size=1, max_size=2)
+    with pool.connection() as first:
+        pass
+    with pool.connection() as second:
+        pass
+    assert first is second
+    assert pool.stats.connections_created == 1
+    assert pool.stats.checkouts == 2
+
+
+def test_checkout_times_out_when_exhausted():
+    """Test checkout waits at most ``timeout`` and counts the timeout"""
+    pool = ConnectionPool(sqlite_connect, min_size=0, max_size=1, timeout=0.05)
+    conn = pool.getconn()
+    with pytest.raises(PoolTimeoutError):
+        pool.getconn()
+    assert pool.stats.timeouts == 1
+    pool.putconn(conn)
+
+
+def test_waiting_checkout_is_counted():
+    """Test a checkout blocked on a busy pool records a wait"""
+    pool = ConnectionPool(sqlite_connect, min_size=0, max_size=1, timeout=2)
+    conn = pool.getconn()
+    timer = threading.Timer(0.05, pool.putconn, args=(conn,))
+    timer.start()
+    with pool.connection() as reused:
+        assert reused is conn
+    timer.join()
+    assert pool.stats.waits == 1
+    assert pool.stats.wait_time_max > 0
+
+
+def test_dead_connection_is_replaced():
+    """Test health checks discard connections that no longer work"""
+    pool = ConnectionPool(sqlite_connect, min_size=0, max_size=1, health_check_interval=0)
+    conn = pool.getconn()
+    pool.putconn(conn)
+    conn.close()
+    with pool.connection() as fresh:
+        assert fresh is not conn
+        fresh.execute("SELECT 1")
+    assert pool.stats.connections_discarded == 1
+    assert pool.size == 1
+
+
+def test_pool_resets_after_fork(monkeypatch):
+    """Test a child process never reuses connections opened by its parent"""
+    pool = ConnectionPool(sqlite_connect, min_size=1, max_size=1)
+    with pool.connection() as parent_conn:
+        pass
+    monkeypatch.setattr(os, 'getpid', lambda: -1)
+    with pool.connection() as child_conn:
+        assert child_conn is not parent_conn
+    assert pool.stats.connections_created == 1
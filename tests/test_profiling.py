@@ -0,0 +1,98 @@
+"""
+Slow Request Profiler Tests
+
+Slow matching requests must leave a bounded set of stack profiles that
+admins can list and download; nothing is exposed without a token.
+"""
+
+import time
+
+import pytest
+from app import create_app
+from app.profiling import ProfileStore
+from app.services.food_tracker import FoodTrackingService
+from config.settings import TestingConfig
+
+TOKEN = 'test-admin-token'
+AUTH = {'Authorization': f'Bearer {TOKEN}'}
+
+
+@pytest.fixture
+def make_client(tmp_path):
+    def make(admin_token=TOKEN, threshold_ms=20):
+        class Config(TestingConfig):
+            DATABASE_URL = 'memory://'
+            FOOD_DB_PATH = str(tmp_path / 'foods.db')
+            PROFILE_ENABLED = True
+            PROFILE_DIR = str(tmp_path / 'profiles')
+            PROFILE_SLOW_REQUEST_MS = threshold_ms
+            PROFILE_SAMPLE_INTERVAL_MS = 1
+            ADMIN_TOKEN = admin_token
+        return create_app(Config).test_client()
+    return make
+
+
+@pytest.fixture
+def slow_intake(monkeypatch):
+    original = FoodTrackingService.get_daily_intake
+
+    def slow_daily_intake(self, *args, **kwargs):
+        time.sleep(0.05)
+        return original(self, *args, **kwargs)
+    monkeypatch.setattr(FoodTrackingService, 'get_daily_intake', slow_daily_intake)
+
+
+def test_store_keeps_newest_profiles(tmp_path):
+    """Test the ring buffer evicts the oldest files beyond its bound"""
+    store = ProfileStore(str(tmp_path), max_profiles=3)
+    ids = []
+    for n in range(5):
+        ids.append(store.save({'n': n, 'stacks': {'a;b': 1}}))
+        time.sleep(0.002)
+
+    assert [p['id'] for p in store.list()] == ids[:1:-1]
+    assert store.load(ids[0]) is None
+    assert store.load('../../etc/passwd') is None
+
+
+def test_profiler_requires_absolute_dir(tmp_path):
+    """Test profiling is off by default and refuses a relative PROFILE_DIR"""
+    class Config(TestingConfig):
+        DATABASE_URL = 'memory://'
+        FOOD_DB_PATH = str(tmp_path / 'foods.db')
+    assert 'slow_request_profiler' not in create_app(Config).extensions
+
+    Config.PROFILE_ENABLED = True
+    Config.PROFILE_DIR = 'profiles'
+    with pytest.raises(ValueError):
+        create_app(Config)
+
+
+def test_slow_request_is_profiled(make_client, slow_intake):
+    """Test a slow food-entries request is sampled and downloadable"""
+    client = make_client()
+    client.get('/api/food-entries?date=2024-01-01')
+    client.get('/api/search-food?q=apple')  # not under the profiled prefix
+
+    profiles = client.get('/admin/profiles', headers=AUTH).get_json()
+    assert len(profiles) == 1
+    assert profiles[0]['path'] == '/api/food-entries'
+    assert profiles[0]['duration_ms'] >= 50
+
+    folded = client.get(f"/admin/profiles/{profiles[0]['id']}?format=folded", headers=AUTH)
+    assert 'slow_daily_intake' in folded.get_data(as_text=True)
+
+
+def test_fast_request_is_not_kept(make_client):
+    """Test requests under the threshold leave no profile"""
+    client = make_client(threshold_ms=10_000)
+    client.get('/api/food-entries?date=2024-01-01')
+    assert client.get('/admin/profiles', headers=AUTH).get_json() == []
+
+
+def test_admin_requires_token(make_client):
+    """Test admin routes are hidden without a token and reject bad ones"""
+    assert make_client(admin_token=None).get('/admin/profiles', headers=AUTH).status_code == 404
+    client = make_client()
+    assert client.get('/admin/profiles').status_code == 401
+    assert client.get('/admin/profiles', headers={'Authorization': 'Bearer nope'}).status_code == 401
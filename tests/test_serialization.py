@@ -0,0 +1,60 @@
+"""
+JSON Provider Tests
+
+The orjson provider and the stdlib fallback must accept the same objects
+(read-model dataclasses, datetimes) and produce the same documents.
+"""
+
+from datetime import date, datetime
+
+import pytest
+from app import create_app
+from app.metrics import TimedJSONProvider
+from app.models.food import FoodEntryRow
+from app.serialization import IsoJSONProvider, OrjsonProvider, orjson
+from config.settings import TestingConfig
+
+ROW = FoodEntryRow('Apple', 52.0, 150.0, 'snack', datetime(2024, 3, 1, 10, 30), 78.0)
+EXPECTED = {
+    'food_name': 'Apple', 'calories_per_100g': 52.0, 'quantity_grams': 150.0,
+    'meal_type': 'snack', 'timestamp': '2024-03-01T10:30:00', 'calories': 78.0
+}
+
+
+def make_app(tmp_path, provider):
+    class Config(TestingConfig):
+        DATABASE_URL = 'memory://'
+        FOOD_DB_PATH = str(tmp_path / 'foods.db')
+        JSON_PROVIDER = provider
+    return create_app(Config)
+
+
+@pytest.mark.parametrize('provider', ['stdlib', pytest.param('orjson', marks=pytest.mark.skipif(
+    orjson is None, reason="orjson not installed"))])
+def test_providers_serialize_rows_and_dates(tmp_path, provider):
+    """Test dataclass rows and dates become the same JSON under either provider"""
+    app = make_app(tmp_path, provider)
+    expected_class = OrjsonProvider if provider == 'orjson' else IsoJSONProvider
+    assert isinstance(app.json, TimedJSONProvider)
+    assert type(app.json.provider) is expected_class
+
+    with app.app_context():
+        body = app.json.response({'entries': [ROW], 'date': date(2024, 3, 1)}).get_data()
+    assert app.json.loads(body) == {'entries': [EXPECTED], 'date': '2024-03-01'}
+
+
+def test_unknown_provider_rejected(tmp_path):
+    """Test a misspelt JSON_PROVIDER fails at startup"""
+    with pytest.raises(ValueError):
+        make_app(tmp_path, 'ujson')
+
+
+def test_entries_endpoint_serializes_rows(tmp_path):
+    """Test GET /api/food-entries renders rows like FoodEntryRow.to_dict"""
+    client = make_app(tmp_path, 'auto').test_client()
+    client.post('/api/food-entries', json={
+        'food_name': 'Apple', 'calories_per_100g': 52, 'quantity': 150,
+        'meal_type': 'snack', 'timestamp': '2024-03-01T10:30:00'
+    })
+    entries = client.get('/api/food-entries?date=2024-03-01').get_json()['entries']
+    assert entries == [EXPECTED]
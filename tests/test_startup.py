@@ -0,0 +1,84 @@
+"""
+Startup Tests
+
+create_app must stay cheap: no database work happens until a request
+needs a service.
+"""
+
+import os
+import runpy
+import shutil
+import sqlite3
+import time
+
+import psycopg2
+import pytest
+from app import create_app
+from app.extensions import get_registry
+from config.settings import TestingConfig
+
+GUNICORN_CONF = os.path.join(os.path.dirname(__file__), '..', 'gunicorn.conf.py')
+
+# Generous budget; a regression to import-time DB work blows well past it
+CREATE_APP_BUDGET_SECONDS = 0.25
+
+
+@pytest.fixture
+def no_database(monkeypatch):
+    """Fail loudly if anything tries to open a database connection"""
+    def refuse(*args, **kwargs):
+        raise AssertionError("create_app opened a database connection")
+    monkeypatch.setattr(psycopg2, 'connect', refuse)
+    monkeypatch.setattr(sqlite3, 'connect', refuse)
+
+
+def test_create_app_does_not_touch_databases(no_database):
+    """Test the factory and blueprint import without any DB access"""
+    app = create_app(TestingConfig)
+    assert get_registry(app)._services == {}
+
+
+def test_create_app_startup_time(no_database, record_property):
+    """Measure create_app and keep it within the startup budget"""
+    create_app(TestingConfig)  # warm imports
+    samples = []
+    for _ in range(5):
+        start = time.perf_counter()
+        create_app(TestingConfig)
+        samples.append(time.perf_counter() - start)
+    best = min(samples)
+    record_property('create_app_seconds', round(best, 4))
+    assert best < CREATE_APP_BUDGET_SECONDS
+
+
+def load_gunicorn_conf(monkeypatch, conf_path=GUNICORN_CONF, **env):
+    # The conf writes os.environ (setdefault, load_dotenv); run it against a
+    # copy so nothing it sets leaks into later tests
+    environ = {name: value for name, value in os.environ.items()
+               if name not in ('GUNICORN_WORKER_CLASS', 'GUNICORN_THREADS', 'DB_POOL_MAX_SIZE')}
+    environ.update(env)
+    monkeypatch.setattr(os, 'environ', environ)
+    return runpy.run_path(conf_path)
+
+
+def test_gthread_mode_sizes_pool_per_thread(monkeypatch):
+    """Test the gthread worker gets one pooled connection per request thread"""
+    settings = load_gunicorn_conf(monkeypatch, GUNICORN_WORKER_CLASS='gthread', GUNICORN_THREADS='12')
+    assert settings['worker_class'] == 'gthread'
+    assert settings['threads'] == 12
+    assert os.environ['DB_POOL_MAX_SIZE'] == '12'
+
+
+def test_explicit_pool_size_wins(monkeypatch):
+    """Test DB_POOL_MAX_SIZE from the environment is never overridden"""
+    settings = load_gunicorn_conf(monkeypatch, DB_POOL_MAX_SIZE='3')
+    assert settings['worker_class'] == 'sync'
+    assert os.environ['DB_POOL_MAX_SIZE'] == '3'
+
+
+def test_dotenv_pool_size_is_read(monkeypatch, tmp_path):
+    """Test DB_POOL_MAX_SIZE from a .env beside the conf beats the per-thread default"""
+    conf_path = shutil.copy(GUNICORN_CONF, tmp_path / 'gunicorn.conf.py')
+    (tmp_path / '.env').write_text('DB_POOL_MAX_SIZE=7\n')
+    load_gunicorn_conf(monkeypatch, conf_path, GUNICORN_WORKER_CLASS='gthread')
+    assert os.environ['DB_POOL_MAX_SIZE'] == '7'
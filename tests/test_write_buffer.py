@@ -0,0 +1,164 @@
+"""
+Write-Behind Buffer Tests
+
+Concurrent single-entry writes must be group-committed, acknowledged only
+after their batch commits, refused when the queue stays full and drained
+on close.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import pytest
+from app import create_app
+from app.database.memory import InMemoryDatabaseManager
+from app.models.food import FoodEntry, FoodItem, MealType
+from app.services.write_buffer import GroupCommitWriter, WriteBufferFull
+from config.settings import TestingConfig
+
+
+def make_entry(n=0):
+    return FoodEntry(MealType.LUNCH, FoodItem(f'Food {n}', 100, 100), datetime(2024, 3, 1, 12))
+
+
+class BlockingStore:
+    """save_batch that holds every commit until released"""
+
+    def __init__(self):
+        self.db = InMemoryDatabaseManager()
+        self.release = threading.Event()
+        self.batches = []
+
+    def save_batch(self, entries):
+        self.release.wait(5)
+        self.batches.append(len(entries))
+        return self.db.save_food_entries(entries)
+
+
+def test_concurrent_writes_share_commits():
+    """Test entries queued while a commit runs go out together with their own ids"""
+    store = BlockingStore()
+    writer = GroupCommitWriter(store.save_batch, max_batch=50, max_delay=0.001)
+    with ThreadPoolExecutor(16) as pool:
+        results = [pool.submit(writer.write, make_entry(n)) for n in range(32)]
+        store.release.set()
+        ids = [result.result(5) for result in results]
+    writer.close()
+
+    assert sorted(ids) == list(range(1, 33))
+    assert sum(store.batches) == 32
+    assert len(store.batches) < 32
+    assert writer.stats.committed == 32
+
+
+def test_write_waits_for_slow_commit():
+    """Test a slow commit is still acknowledged with its id rather than timing out"""
+    store = BlockingStore()
+    writer = GroupCommitWriter(store.save_batch)
+    threading.Timer(0.3, store.release.set).start()
+    assert writer.write(make_entry()) == 1
+    writer.close()
+    assert store.batches == [1]
+
+
+def test_full_queue_applies_backpressure():
+    """Test submitters give up with WriteBufferFull once the queue stays full"""
+    store = BlockingStore()
+    writer = GroupCommitWriter(store.save_batch, max_batch=1, max_queue=1, submit_timeout=0.05)
+    writer.submit(make_entry(1))  # taken by the flusher, which blocks
+    while writer.depth:
+        time.sleep(0.001)
+    writer.submit(make_entry(2))  # fills the queue
+    with pytest.raises(WriteBufferFull):
+        writer.submit(make_entry(3))
+    assert writer.stats.rejected == 1
+
+    store.release.set()
+    writer.close()
+    assert len(store.db.get_daily_entries('2024-03-01')) == 2
+
+
+def test_close_commits_queued_entries():
+    """Test shutdown flushes every accepted entry before returning"""
+    store = BlockingStore()
+    writer = GroupCommitWriter(store.save_batch, max_batch=10, max_delay=60)
+    futures = [writer.submit(make_entry(n)) for n in range(5)]
+    store.release.set()
+    writer.close()
+
+    assert all(future.done() for future in futures)
+    assert len(store.db.get_daily_entries('2024-03-01')) == 5
+    with pytest.raises(RuntimeError):
+        writer.submit(make_entry())
+
+
+def test_close_resolves_entry_submitted_during_close(monkeypatch):
+    """Test an entry whose put is still in flight when close starts is committed, not stranded"""
+    store = BlockingStore()
+    store.release.set()
+    writer = GroupCommitWriter(store.save_batch)
+    put = writer._queue.put
+    def slow_put(item, *args, **kwargs):
+        if isinstance(item, tuple):
+            time.sleep(0.2)  # past the closed check, not yet queued
+        return put(item, *args, **kwargs)
+    monkeypatch.setattr(writer._queue, 'put', slow_put)
+
+    with ThreadPoolExecutor(1) as pool:
+        pending = pool.submit(writer.submit, make_entry())
+        time.sleep(0.05)
+        writer.close()
+        assert pending.result(5).result(2) == 1
+
+
+def test_failed_batch_fails_every_entry():
+    """Test a batch that can't commit reports the error to each of its writers"""
+    def broken(entries):
+        raise ConnectionError("database went away")
+    writer = GroupCommitWriter(broken, max_delay=0.01)
+    futures = [writer.submit(make_entry(n)) for n in range(3)]
+    for future in futures:
+        with pytest.raises(ConnectionError):
+            future.result(5)
+    writer.close()
+    assert writer.stats.failed == 3
+
+
+def test_bad_entry_fails_only_itself():
+    """Test a batch that can't commit is split so only the offending entry fails"""
+    store = BlockingStore()
+    attempts = []
+    def save_batch(entries):
+        attempts.append(len(entries))
+        if any(entry.food_item.name == 'Food 3' for entry in entries):
+            raise ValueError("numeric field overflow")
+        return store.save_batch(entries)
+    writer = GroupCommitWriter(save_batch, max_batch=8)
+    futures = [writer.submit(make_entry(n)) for n in range(8)]
+    store.release.set()
+    writer.close()
+
+    with pytest.raises(ValueError):
+        futures[3].result(5)
+    ids = [future.result(5) for n, future in enumerate(futures) if n != 3]
+    assert sorted(ids) == list(range(1, 8))
+    assert (writer.stats.committed, writer.stats.failed) == (7, 1)
+    assert max(attempts) > 1
+
+
+def test_api_writes_through_buffer(tmp_path):
+    """Test POST /api/food-entries acknowledges after the buffered commit"""
+    class Config(TestingConfig):
+        DATABASE_URL = 'memory://'
+        FOOD_DB_PATH = str(tmp_path / 'foods.db')
+        WRITE_BEHIND_ENABLED = True
+    client = create_app(Config).test_client()
+    response = client.post('/api/food-entries', json={
+        'food_name': 'Apple', 'calories_per_100g': 52, 'quantity': 100,
+        'meal_type': 'snack', 'timestamp': '2024-03-01T10:00:00'
+    })
+    assert response.get_json()['id'] == 1
+    assert client.get('/api/food-entries?date=2024-03-01').get_json()['entry_count'] == 1
+    assert client.get('/api/stats').get_json()['write_buffer']['committed'] == 1